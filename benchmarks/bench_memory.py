@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Measure the memory and the number of allocations needed per game object with tracemalloc
+
+Usage: python -m benchmarks.bench_memory [--count N]
+"""
+import gc
+import tracemalloc
+from argparse import ArgumentParser
+from random import Random
+from typing import Callable
+
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.environments.consumable_loot import AttackPotion
+from packages.environments.loot import Loot
+from packages.environments.loot_types import LootStack
+
+
+def measure(factory: Callable, count: int):
+    """
+    Create count objects and return the bytes and allocations still held per object
+
+    :param factory: Callable creating a single object
+    :param count: Number of objects to create
+    :return: (bytes per object, allocations per object)
+    """
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    objects = [factory() for _ in range(0, count)]
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+
+    stats = after.compare_to(before, "filename")
+    size = sum(stat.size_diff for stat in stats)
+    blocks = sum(stat.count_diff for stat in stats)
+    del objects
+    return size / count, blocks / count
+
+
+def _looted_monster(rng: Random) -> Monster:
+    """Monster whose loot was rolled, like every monster killed in a room"""
+    monster = Monster("Ogre", 2, 3, "roar", rng)
+    monster.loot
+    return monster
+
+
+def main():
+    parser = ArgumentParser(description="Memory used per game object")
+    parser.add_argument("--count", type=int, default=20_000, help="Number of objects created per case")
+    args = parser.parse_args()
+
+    rng = Random(0)
+    cases = {
+        "Monster": lambda: Monster("Ogre", 2, 3, "roar", rng),
+        "Monster (looted)": lambda: _looted_monster(rng),
+        "Hero": lambda: Hero("Samurai Jack", rng),
+        "Loot": lambda: Loot("Bones", "Brittle bones, eeek!", qty=3),
+        "AttackPotion": AttackPotion,
+        "LootStack": lambda: LootStack(rng.randrange(0, 6), rng.randint(2, 20)),
+    }
+
+    print(f"{'Object':<22} {'Bytes':>10} {'Allocations':>12}")
+    for name, factory in cases.items():
+        size, blocks = measure(factory, args.count)
+        print(f"{name:<22} {size:>10.1f} {blocks:>12.2f}")
+
+
+if __name__ == "__main__":
+    main()
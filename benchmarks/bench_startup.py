@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Measure the cold start of the game, from launching the interpreter to the menu of the first room
+
+The game is started in a fresh process, given a username, and timed until it asks for the first decision. The median
+of --runs starts is compared against a budget, the script fails when it is over:
+
+    python -m benchmarks.bench_startup --budget 80
+
+With PYTHONDONTWRITEBYTECODE set no bytecode cache is written, unless one already exists every start compiles the
+modules it imports and is noticeably slower. The report says which of the two is measured.
+"""
+import subprocess
+import sys
+from argparse import ArgumentParser
+from importlib.util import cache_from_source
+from pathlib import Path
+from statistics import median
+from time import perf_counter
+from typing import List, Optional
+
+ROOT = Path(__file__).resolve().parents[1]
+PROMPT = b"DungeonDudes > "
+DEFAULT_BUDGET_MS = 80.0
+
+
+def start_time() -> float:
+    """
+    Start the game once and wait for the start menu prompt, the second prompt after the username
+
+    :return: Seconds from launch to the prompt
+    :rtype: float
+    """
+    start = perf_counter()
+    process = subprocess.Popen([sys.executable, "dungeon_dudes.py"], cwd=ROOT, stdin=subprocess.PIPE,
+                               stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+    try:
+        process.stdin.write(b"Bench\n")
+        process.stdin.flush()
+
+        output = b""
+        while output.count(PROMPT) < 2:
+            chunk = process.stdout.read1(4096)
+            if not chunk:
+                raise RuntimeError("The game exited before the start menu")
+            output += chunk
+
+        return perf_counter() - start
+    finally:
+        process.kill()
+        process.wait()
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(description="Cold start of the game to the first menu")
+    parser.add_argument("--runs", type=int, default=10, help="Number of starts, the median is kept")
+    parser.add_argument("--budget", type=float, default=DEFAULT_BUDGET_MS, help="Budget of the median in ms")
+    args = parser.parse_args(args)
+
+    # the first start writes the data bundle and the bytecode caches, when allowed to, it is not timed
+    start_time()
+    times = sorted(start_time() * 1e3 for _ in range(0, args.runs))
+    result = median(times)
+    cached = Path(cache_from_source(str(ROOT / "packages/game_utils/game_controller.py"))).exists()
+    print(f"Cold start: median {result:.1f} ms, best {times[0]:.1f} ms, worst {times[-1]:.1f} ms "
+          f"(budget {args.budget:.0f} ms, bytecode {'cached' if cached else 'compiled on every start'})")
+
+    if result > args.budget:
+        print(f"[!] Cold start is over budget by {result - args.budget:.1f} ms")
+        return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,223 @@
+#!/usr/bin/env python3
+"""
+Measure the throughput of the hot paths of the game, from a single die roll to full headless games
+
+Every case is timed with timeit, best of --repeat runs, and reported in operations per second. Results can be saved as
+a JSON baseline and later runs compared against it. A case slower than the baseline by more than --tolerance fails the
+comparison, so the script can gate a change:
+
+    python -m benchmarks.bench_throughput --save benchmarks/baseline.json
+    python -m benchmarks.bench_throughput --compare benchmarks/baseline.json
+
+Baselines only make sense on the machine they were taken on, take a new one after changing hardware or Python.
+"""
+import json
+import platform
+from argparse import ArgumentParser
+from collections import namedtuple
+from random import Random
+from timeit import Timer
+from typing import Callable, Dict, Iterator, List, Optional
+
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.environments.environment import Environment
+from packages.environments.loot import Loot
+from packages.game_utils.combat_functions import duel
+from packages.game_utils.events import NULL_SINK
+from packages.game_utils.monster_controller import EnvironmentRecord, MonsterController
+from packages.game_utils.policies import GreedyPolicy
+from packages.game_utils.simulation import HeadlessDungeonDudes
+from packages.game_utils.utils import roll_dice
+
+BASELINE_VERSION = 1
+DEFAULT_TOLERANCE = .3
+LEVELS = (1, 10, 100)
+BAG_SIZES = (1_000, 100_000)
+Case = namedtuple("Case", "name, setup")
+Regression = namedtuple("Regression", "name, baseline, current")
+
+
+def _roll_dice(rng: Random) -> Callable:
+    return lambda: roll_dice(6, rng)
+
+
+def _combat_roll(rng: Random) -> Callable:
+    return Hero("Bench", rng).combat_roll
+
+
+def _duel(rng: Random) -> Callable:
+    """Hero and monster trade blows forever, nobody dies so only the duel itself is timed"""
+    hero = Hero("Bench", rng)
+    monster = Monster("Ogre", 2, 3, "roar", rng)
+    hero.health = monster.health = 10 ** 12
+    environment = Environment("Cave", "", None, 1, rng)
+
+    def run():
+        duel(hero, monster, environment, NULL_SINK)
+        duel(monster, hero, environment, NULL_SINK)
+
+    return run
+
+
+def _spawn(level: int) -> Callable:
+    def setup(rng: Random) -> Callable:
+        record = EnvironmentRecord(level, None)
+        return lambda: MonsterController(record, rng)
+
+    return setup
+
+
+def _clean_up(level: int) -> Callable:
+    """Half of the monsters are dead, the list is put back before every clean up"""
+    def setup(rng: Random) -> Callable:
+        controller = MonsterController(EnvironmentRecord(level, None), rng)
+        monsters = list(controller.monsters)
+        for monster in monsters[::2]:
+            monster.health = 0
+
+        def run():
+            controller.monsters[:] = monsters
+            controller._monster_count = len(monsters)
+            controller.clean_up()
+
+        return run
+
+    return setup
+
+
+def _set_loot(size: int) -> Callable:
+    """Stack loot onto a bag already holding size kinds of loot"""
+    def setup(rng: Random) -> Callable:
+        hero = Hero("Bench", rng)
+        hero.add_loot_many(Loot(f"Junk {index}", "Bench junk", qty=1) for index in range(0, size))
+        drops = [Loot(f"Junk {rng.randrange(0, size)}", "Bench junk", qty=1) for _ in range(0, 1024)]
+        state = {"next": 0}
+
+        def run():
+            hero.set_loot(drops[state["next"] & 1023])
+            state["next"] += 1
+
+        return run
+
+    return setup
+
+
+def _headless_game(rng: Random) -> Callable:
+    policy = GreedyPolicy()
+    return lambda: HeadlessDungeonDudes(policy, max_level=10, rng=rng).play()
+
+
+def cases() -> Iterator[Case]:
+    """
+    :return: Generator of every benchmark case
+    """
+    yield Case("roll_dice", _roll_dice)
+    yield Case("combat_roll", _combat_roll)
+    yield Case("duel", _duel)
+    for level in LEVELS:
+        yield Case(f"spawn[level={level}]", _spawn(level))
+    for level in LEVELS:
+        yield Case(f"clean_up[level={level}]", _clean_up(level))
+    for size in BAG_SIZES:
+        yield Case(f"set_loot[bag={size}]", _set_loot(size))
+    yield Case("headless_game", _headless_game)
+
+
+def measure(run: Callable, repeat: int) -> float:
+    """
+    Time a callable, enough calls per run for the run to last about 0.2 seconds
+
+    :param run: Operation to time
+    :param repeat: Number of runs, the fastest one is kept
+    :return: Operations per second
+    :rtype: float
+    """
+    timer = Timer(run)
+    number, _ = timer.autorange()
+    return number / min(timer.repeat(repeat, number))
+
+
+def run_cases(repeat: int = 5, pattern: Optional[str] = None, seed: int = 0) -> Dict[str, float]:
+    """
+    Run the benchmark cases
+
+    :param repeat: Number of runs per case
+    :param pattern: Only run the cases whose name contains it
+    :param seed: Seed of the generator used by every case
+    :return: Operations per second keyed by case name
+    """
+    results = {}
+    for case in cases():
+        if pattern is None or pattern in case.name:
+            results[case.name] = measure(case.setup(Random(seed)), repeat)
+
+    return results
+
+
+def compare(baseline: Dict[str, float], current: Dict[str, float],
+            tolerance: float = DEFAULT_TOLERANCE) -> List[Regression]:
+    """
+    Find the cases that got slower than the baseline. Cases missing from either side are ignored
+
+    :param baseline: Operations per second of the baseline
+    :param current: Operations per second of this run
+    :param tolerance: Share of the baseline throughput that may be lost before a case counts as a regression
+    :return: Cases that regressed
+    """
+    return [Regression(name, baseline[name], ops) for name, ops in current.items()
+            if name in baseline and ops < baseline[name] * (1 - tolerance)]
+
+
+def save(path: str, results: Dict[str, float]) -> None:
+    """Write the results as a JSON baseline"""
+    with open(path, "wt", encoding="UTF-8") as outfile:
+        json.dump({"version": BASELINE_VERSION, "python": platform.python_version(), "results": results}, outfile,
+                  indent=2, sort_keys=True)
+        outfile.write("\n")
+
+
+def load(path: str) -> Dict[str, float]:
+    """Read the results of a JSON baseline"""
+    with open(path, "rt", encoding="UTF-8") as infile:
+        data = json.load(infile)
+
+    if data.get("version") != BASELINE_VERSION:
+        raise ValueError(f"Unsupported baseline version {data.get('version')}")
+
+    return data["results"]
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(description="Throughput of the hot paths of the game")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case, the fastest is kept")
+    parser.add_argument("--filter", default=None, help="Only run the cases whose name contains this")
+    parser.add_argument("--save", metavar="FILE", default=None, help="Write the results as a JSON baseline")
+    parser.add_argument("--compare", metavar="FILE", default=None, help="Fail when slower than this baseline")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE,
+                        help="Share of the baseline throughput that may be lost")
+    args = parser.parse_args(args)
+
+    baseline = load(args.compare) if args.compare is not None else {}
+    results = run_cases(args.repeat, args.filter)
+
+    print(f"{'Case':<24} {'ops/s':>14} {'baseline':>14} {'change':>8}")
+    for name, ops in results.items():
+        if name in baseline:
+            print(f"{name:<24} {ops:>14,.0f} {baseline[name]:>14,.0f} {ops / baseline[name] - 1:>+8.1%}")
+        else:
+            print(f"{name:<24} {ops:>14,.0f}")
+
+    if args.save is not None:
+        save(args.save, results)
+
+    regressions = compare(baseline, results, args.tolerance)
+    for regression in regressions:
+        print(f"[!] {regression.name} regressed: {regression.current:,.0f} ops/s, "
+              f"baseline {regression.baseline:,.0f} ops/s")
+
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    exit(main())
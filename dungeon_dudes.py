@@ -1,7 +1,10 @@
 #!/usr/bin/env python3
-from sys import argv
-from pathlib import Path
+import sys
+from os.path import exists
+from types import SimpleNamespace
+from typing import List, Optional
 
+from packages.game_utils.data_bundle import BUNDLE
 from packages.game_utils.game_controller import DungeonDudes
 
 ASCII_PATH = "data/.dd_ascii"
@@ -13,25 +16,83 @@ def _get_username() -> str:
     return input("DungeonDudes > ")
 
 
-def main(dice: bool):
-    path = Path(ASCII_PATH)
-    if path.exists():
-        with path.open("rt", encoding="UTF-8") as infile:
-            print(infile.read())
+def main(dice: bool, seed: Optional[int] = None, record: Optional[str] = None, save: Optional[str] = None,
+         load_path: Optional[str] = None, profile: Optional[str] = None):
+    if profile is not None:
+        from packages.game_utils.profiling import Profiler
+
+        # the game ends by exiting the process in _quit, the profiler reports on the way out
+        with Profiler(profile):
+            _play(dice, seed, record, save, load_path)
+    else:
+        _play(dice, seed, record, save, load_path)
+
+
+def _play(dice: bool, seed: Optional[int], record: Optional[str], save: Optional[str], load_path: Optional[str]):
+    if exists(ASCII_PATH):
+        print(BUNDLE.load(ASCII_PATH, str))
+
+    if load_path is not None:
+        from packages.game_utils.snapshot import load, restore
+
+        # the hero comes from the save, the room it was in is over
+        game = DungeonDudes("", dice, start=False, save_path=save)
+        restore(load(load_path), game)
+        game.run_game()
+        return
 
     username = _get_username()
-    DungeonDudes(username, dice)
+    if record is None:
+        DungeonDudes(username, dice, seed=seed, save_path=save)
+        return
+
+    from packages.game_utils.replay import ReplayWriter
+
+    # the game is appended to the log when it ends
+    with open(record, "at", encoding="UTF-8") as outfile:
+        DungeonDudes(username, dice, seed=seed, recorder=ReplayWriter(outfile), save_path=save)
+
+
+def _parse_args(argv: List[str]) -> SimpleNamespace:
+    """Options of the command line. argparse and what it imports are a good share of the start, a plain start skips it"""
+    if not argv:
+        return SimpleNamespace(dice=False, seed=None, record=None, replay=None, save=None, load=None, profile=None,
+                               serve=None)
+
+    from argparse import ArgumentParser
+
+    parser = ArgumentParser(description="DungeonDudes")
+    parser.add_argument("--dice", action="store_true", help="Display the combat rolls of each duel")
+    parser.add_argument("--seed", type=int, default=None, help="Seed of the game")
+    parser.add_argument("--record", metavar="LOG", default=None, help="Append the game to a replay log")
+    parser.add_argument("--replay", metavar="LOG", default=None, help="Replay and verify every game of a log")
+    parser.add_argument("--save", metavar="FILE", default=None, help="Save the game after every room")
+    parser.add_argument("--load", metavar="FILE", default=None, help="Continue a saved game")
+    parser.add_argument("--profile", metavar="FILE", default=None,
+                        help="Dump cProfile stats to FILE and print the time spent per phase when the game ends")
+    parser.add_argument("--serve", metavar="PORT", type=int, default=None,
+                        help="Host games for remote players on PORT instead of playing")
+    args = parser.parse_args(argv)
+
+    if args.load is not None and (args.record is not None or args.seed is not None):
+        parser.error("a loaded game can't be seeded or recorded")
+
+    return SimpleNamespace(**vars(args))
 
 
 if __name__ == "__main__":
-    if len(argv) not in [1, 2]:
-        exit("Invalid options used. The only optional argument supported is '--dice'")
+    args = _parse_args(sys.argv[1:])
 
-    elif len(argv) == 2:
-        if argv[1] != "--dice":
-            exit("Invalid options used. The only optional argument supported is '--dice'")
+    # the tools behind the options are only imported when asked for, they would slow down every start
+    if args.replay is not None:
+        from packages.game_utils.replay import main as replay_main
 
-    if len(argv) == 1:
-        main(dice=False)
-    else:
-        main(dice=True)
+        exit(replay_main([args.replay]))
+
+    if args.serve is not None:
+        from packages.game_utils.server import main as server_main
+
+        server_main(["--port", str(args.serve)] + (["--dice"] if args.dice else []))
+        exit()
+
+    main(args.dice, args.seed, args.record, args.save, args.load, args.profile)
@@ -7,7 +7,7 @@ Classes
         Abstract class for game characters to enforce specific functions that all characters are required to have
 """
 from abc import ABC, abstractmethod
-from typing import List
+from typing import List, Sequence
 
 from packages.environments.loot import Loot
 
@@ -17,9 +17,12 @@ class Character(ABC):
     MAX_DICE = 1
     DEFAULT_DAMAGE = 1
 
+    # characters are created by the hundreds per room, slots keep them small and fast to access
+    __slots__ = ("_loot", "_combat_rolls", "_dice_count", "_name", "_dead", "_health", "_damage")
+
     def __init__(self):
         self._loot = []
-        self._combat_rolls = []
+        self._combat_rolls = ()
         self._dice_count = 0
         self._name = ""
         self._dead = False
@@ -131,7 +134,7 @@ class Character(ABC):
         pass
 
     @property
-    def combat_rolls(self) -> List[int]:
+    def combat_rolls(self) -> Sequence[int]:
         return self._combat_rolls
 
     @property
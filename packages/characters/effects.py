@@ -0,0 +1,54 @@
+"""
+Module holds the effects a hero can be under, either from a consumable or from a penalty.
+
+Effects never touch the base stats of the hero. They are stacked on top of them and the effective stats are computed
+in a single pass, only when an effect is added or expires.
+
+Classes
+-------
+    CombatStats:
+        Stats used by the hero in combat
+    Effect:
+        Immutable modifier of the combat stats. Dice and damage are added, die faces are multiplied
+"""
+from collections import namedtuple
+from typing import Iterable
+
+MIN_DICE_COUNT = 1
+
+CombatStats = namedtuple("CombatStats", "dice_count, die_faces, damage, pierce_shot")
+
+
+class Effect(namedtuple("Effect", "name, dice_count, die_faces, damage, pierce_shot",
+                        defaults=(0, 1, 0, False))):
+    __slots__ = ()
+
+    def apply(self, stats: CombatStats) -> CombatStats:
+        """
+        Modify combat stats with this effect alone
+
+        :param stats: Stats before the effect
+        :return: Stats after the effect
+        :rtype: CombatStats
+        """
+        return apply_effects(stats, (self,))
+
+
+def apply_effects(base: CombatStats, effects: Iterable[Effect]) -> CombatStats:
+    """
+    Stack effects on top of base stats. The order of the effects does not matter and the hero keeps at least one die
+    whatever the penalties
+
+    :param base: Stats without any effect
+    :param effects: Effects currently active
+    :return: Effective stats
+    :rtype: CombatStats
+    """
+    dice_count, die_faces, damage, pierce_shot = base
+    for effect in effects:
+        dice_count += effect.dice_count
+        die_faces *= effect.die_faces
+        damage += effect.damage
+        pierce_shot = pierce_shot or effect.pierce_shot
+
+    return CombatStats(max(MIN_DICE_COUNT, dice_count), die_faces, damage, pierce_shot)
@@ -7,10 +7,14 @@ Classes
         Hero inherits from the Character base class and defines unique methods for the character
 """
 from abc import ABC
+from random import Random
+from typing import Iterable, List, Optional, Tuple
 
 from packages.characters.character_abstract import Character
+from packages.characters.effects import CombatStats, Effect, apply_effects
+from packages.environments.inventory import Inventory
 from packages.environments.loot import Loot
-from packages.game_utils.utils import roll_dice
+from packages.game_utils.utils import get_rng, roll_dice
 
 
 class Hero(Character, ABC):
@@ -19,14 +23,19 @@ class Hero(Character, ABC):
     DEFAULT_DIE_SIDES = 6
     DEFAULT_PIERCE_SHOT = False
 
-    def __init__(self, username: str):
+    __slots__ = ("_rng", "_pierce_shot", "_die_faces", "_buffs", "_stats")
+
+    def __init__(self, username: str, rng: Optional[Random] = None):
         super().__init__()
+        self._rng = get_rng(rng)
+        self._loot = Inventory()
         self._pierce_shot = Hero.DEFAULT_PIERCE_SHOT
         self._name = username
         self._health = Hero.DEFAULT_HEALTH
         self._dice_count = Hero.DEFAULT_DIE_COUNT
         self._die_faces = Hero.DEFAULT_DIE_SIDES
         self._buffs = []
+        self._stats = None
 
     def combat_roll(self):
         """
@@ -34,22 +43,72 @@ class Hero(Character, ABC):
 
         :return: None
         """
-        rolls = []
+        dice_count, die_faces, _, pierce_shot = self.stats
 
         # check if pierce shot is activated, if it is, then rull all maxes
-        if self.pierce_shot:
-            for dice in range(0, self.dice_count):
-                rolls.append(self.die_faces)
+        if pierce_shot:
+            rolls = [die_faces] * dice_count
 
         else:
-            for dice in range(0, self.dice_count):
-                rolls.append(roll_dice(self.die_faces))
+            rolls = [roll_dice(die_faces, self._rng) for _ in range(0, dice_count)]
             # sort in descending order
             rolls.sort(reverse=True)
 
         # set the rolls
         self._combat_rolls = rolls
 
+    @property
+    def stats(self) -> CombatStats:
+        """
+        Combat stats of the hero with every active buff applied. Computed once and kept until the buffs or the base
+        stats change
+
+        :return: Effective combat stats
+        :rtype: CombatStats
+        """
+        if self._stats is None:
+            self._stats = apply_effects(self.base_stats, self._buffs)
+        return self._stats
+
+    @property
+    def base_stats(self) -> CombatStats:
+        """
+        Combat stats of the hero without any buff
+
+        :return: Base combat stats
+        :rtype: CombatStats
+        """
+        return CombatStats(self._dice_count, self._die_faces, self._damage, self._pierce_shot)
+
+    @property
+    def buffs(self) -> Tuple[Effect, ...]:
+        """
+        :return: Effects currently active on the hero
+        :rtype: Tuple[Effect, ...]
+        """
+        return tuple(self._buffs)
+
+    def add_buff(self, effect: Effect) -> None:
+        """
+        Put the hero under an effect until the buffs are cleared
+
+        :param effect: Effect to add
+        :return: None
+        """
+        self._buffs.append(effect)
+        self._stats = None
+
+    def remove_buff(self, effect: Effect) -> None:
+        """
+        End a single effect before the buffs are cleared
+
+        :param effect: Effect to remove
+        :return: None
+        :raises ValueError: If the hero is not under the effect
+        """
+        self._buffs.remove(effect)
+        self._stats = None
+
     @property
     def pierce_shot(self) -> bool:
         """
@@ -59,17 +118,18 @@ class Hero(Character, ABC):
         :return: Bool indicating if buff is enabled
         :rtype: bool
         """
-        return self._pierce_shot
+        return self.stats.pierce_shot
 
     @pierce_shot.setter
     def pierce_shot(self, value: bool) -> None:
         """
-        Set the Lucky Seven buff
+        Set the base Lucky Seven buff, active buffs still apply on top of it
 
         :param value: Bool indicating if buff is in affect
         :return: LuckySeven bool
         """
         self._pierce_shot = value
+        self._stats = None
 
     @property
     def damage(self) -> int:
@@ -78,17 +138,18 @@ class Hero(Character, ABC):
         :return: Damage value
         :rtype: int
         """
-        return self._damage
+        return self.stats.damage
 
     @damage.setter
     def damage(self, value: int) -> None:
         """
-        Sets the damage dealt by the hero
+        Sets the base damage dealt by the hero, active buffs still apply on top of it
         :param value: Damage value to set
         :type value: int
         :return: None
         """
         self._damage = value
+        self._stats = None
 
     @property
     def die_faces(self) -> int:
@@ -98,12 +159,12 @@ class Hero(Character, ABC):
         :return: Number of faces for the combat die
         :rtype: int
         """
-        return self._die_faces
+        return self.stats.die_faces
 
     @die_faces.setter
     def die_faces(self, value: int) -> None:
         """
-        Set the number of faces the combat size have
+        Set the base number of faces the combat size have, active buffs still apply on top of it
 
         :param value: Number of faces on the die
         :return: None
@@ -112,6 +173,7 @@ class Hero(Character, ABC):
             raise ValueError("There must be at least 4 faces to a die")
 
         self._die_faces = value
+        self._stats = None
 
     @property
     def dice_count(self) -> int:
@@ -120,12 +182,12 @@ class Hero(Character, ABC):
         :return: Dice count
         :rtype: int
         """
-        return self._dice_count
+        return self.stats.dice_count
 
     @dice_count.setter
     def dice_count(self, value: int) -> None:
         """
-        Set the number of combat dice the Hero has for combat.
+        Set the base number of combat dice the Hero has for combat, active buffs still apply on top of it
 
         :param value: Number of dice
         :return: None
@@ -135,51 +197,69 @@ class Hero(Character, ABC):
             raise ValueError("Dice count must at least be 1")
 
         self._dice_count = value
+        self._stats = None
+
+    @property
+    def loot(self) -> List[Loot]:
+        """
+        Loot in the bag of the hero, largest quantity first
+
+        :return: Loot list
+        :rtype: List[Loot]
+        """
+        return self._loot.items
+
+    @property
+    def junk(self) -> List[Loot]:
+        """
+        Loot in the bag that can't be consumed, largest quantity first
+
+        :return: Junk loot list
+        :rtype: List[Loot]
+        """
+        return self._loot.junk
+
+    @property
+    def consumables(self) -> List[Loot]:
+        """
+        Loot in the bag that can be consumed, largest quantity first
+
+        :return: Consumable loot list
+        :rtype: List[Loot]
+        """
+        return self._loot.consumable
 
     def cleanup_bag(self):
-        self._sort_loot()
-        for index, loot in reversed(list(enumerate(self.loot))):
-            if loot.quantity == 0:
-                self.loot.pop(index)
+        self._loot.compact()
 
     def consume_loot(self, loot):
         loot.consume(self)
-        self._buffs.append(loot)
         loot.decrement_qty()
 
-        # Pop the item if there is no more of it
-        if loot.quantity < 1:
-            self.loot.pop(self.loot.index(loot))
+        # The stack leaves the bag if there is no more of it
+        self._loot.touch(loot)
 
     def clear_buffs(self):
-        while len(self._buffs) > 0:
-            buff = self._buffs.pop()
-            buff.remove_affect(self)
+        if self._buffs:
+            self._buffs.clear()
+            self._stats = None
 
     def set_loot(self, value: Loot) -> None:
         """
-        Add loot to hero inventory
+        Add loot to hero inventory, stacking it with loot of the same name
 
         :param value: Loot to add
         :type value: Loot
         :return: None
         """
-        match = False
-        for loot in self.loot:
-            if loot == value:
-                loot.add_qty(value.quantity)
-                match = True
-                break
+        self._loot.add(value)
 
-        if not match:
-            self._loot.append(value)
-
-        self._sort_loot()
-
-    def _sort_loot(self):
-        """Sort loot putting the least amount at the end"""
-        def _key(item: Loot):
-            return item.quantity
+    def add_loot_many(self, values: Iterable[Loot]) -> None:
+        """
+        Add a whole drop to the hero inventory in a single pass
 
-        # order list before leaving
-        self._loot.sort(key=_key, reverse=True)
+        :param values: Loot to add
+        :type values: Iterable[Loot]
+        :return: None
+        """
+        self._loot.add_many(values)
@@ -7,23 +7,57 @@ Classes
         Monster inherits functionality from the Character class and adds its own unique functions
 """
 from abc import ABC
-from random import random, randint, choice
-from typing import List, Optional
+from random import Random
+from typing import List, Optional, Union
 
 from packages.characters.character_abstract import Character
-from packages.environments.consumable_loot import CONSUMABLE_LOOT
 from packages.environments.loot import Loot
-from packages.game_utils.utils import roll_dice, get_junk_loot
+from packages.environments.loot_types import CONSUMABLE_DROPS, JUNK_TYPE_IDS, LootStack
+from packages.game_utils.utils import get_rng, roll_dice
 
 
 class Monster(Character, ABC):
-    def __init__(self, name: str, health: int, dice_count: int, noise: str = None):
+    DEFAULT_DIE_SIDES = 6
+
+    LOOT_SEED_BITS = 64
+    MAX_LOOT_DROPS = 3
+    MIN_JUNK_QTY = 2
+    MAX_JUNK_QTY = 20
+
+    __slots__ = ("_rng", "_noise", "_loot_seed")
+
+    def __init__(self, name: str, health: int, dice_count: int, noise: str = None, rng: Optional[Random] = None):
         super().__init__()
+        self._rng = get_rng(rng)
+        # most monsters never carry loot, only allocate the bag when something is dropped
+        self._loot = ()
         self._name = name
         self._health = health
         self._dice_count = dice_count
         self._noise = noise
+        # loot is rolled from its own seed the first time it is read, most monsters are never looted
+        self._loot_seed = self._rng.getrandbits(Monster.LOOT_SEED_BITS)
+
+    @property
+    def loot(self) -> List[Union[Loot, LootStack]]:
+        """
+        Loot carried by the monster, generated on first access
+
+        :return: Loot dropped by the monster when it dies
+        :rtype: List[Union[Loot, LootStack]]
+        """
+        self._generate_loot()
+        return self._loot
+
+    @property
+    def loot_count(self) -> int:
+        self._generate_loot()
+        return len(self._loot)
+
+    @property
+    def has_loot(self) -> bool:
         self._generate_loot()
+        return len(self._loot) > 0
 
     @property
     def noise(self) -> Optional[str]:
@@ -34,6 +68,16 @@ class Monster(Character, ABC):
         """
         return self._noise
 
+    @property
+    def die_faces(self) -> int:
+        """
+        Number of faces on the combat dice of a monster. Monsters always roll standard dice
+
+        :return: Number of faces for the combat die
+        :rtype: int
+        """
+        return Monster.DEFAULT_DIE_SIDES
+
     @property
     def dice_count(self) -> int:
         """
@@ -68,7 +112,7 @@ class Monster(Character, ABC):
         """
         rolls = []
         for dice in range(0, self.dice_count):
-            rolls.append(roll_dice())
+            rolls.append(roll_dice(self.die_faces, self._rng))
 
         # sort in descending order
         rolls.sort(reverse=True)
@@ -76,35 +120,36 @@ class Monster(Character, ABC):
         # set the rolls
         self._combat_rolls = rolls
 
-    def set_loot(self, value: Loot) -> None:
+    def set_loot(self, value: Union[Loot, LootStack]) -> None:
         """Add loot to inventory regardless of duplication"""
-        self._loot.append(value)
+        self._generate_loot()
+        if self._loot:
+            self._loot.append(value)
+        else:
+            self._loot = [value]
 
     def _generate_loot(self):
-        # check if the chance is height enough to loot
-        modifier = (self.health + self.dice_count) * .1
-        modifier = 1
-
-        if not random() < modifier:
+        """Roll the loot of the monster from its loot seed, only the first call does any work"""
+        seed = self._loot_seed
+        if seed is None:
             return
+        self._loot_seed = None
 
-        junk_loot = get_junk_loot()
-        consumable_loot = CONSUMABLE_LOOT
-
-        count = randint(0, 3)
+        # every draw is the next digit of the seed in a mixed radix, so the same seed always rolls the same loot
+        # whenever it is first read, without seeding a generator per monster
+        loot = []
+        seed, count = divmod(seed, Monster.MAX_LOOT_DROPS + 1)
         for _ in range(0, count):
-            loot = choice(junk_loot)
-            self.set_loot(
-                Loot(
-                    name=loot.name,
-                    desc=loot.desc,
-                    qty=randint(2, 20)
-                )
-            )
+            seed, junk = divmod(seed, len(JUNK_TYPE_IDS))
+            seed, qty = divmod(seed, Monster.MAX_JUNK_QTY - Monster.MIN_JUNK_QTY + 1)
+            # drops are (type_id, qty) stacks, Loot objects are only created once picked up by the hero
+            loot.append(LootStack(JUNK_TYPE_IDS[junk], Monster.MIN_JUNK_QTY + qty))
 
         # chance it again to see if good loot is dropped
-        count = randint(0, 3)
+        seed, count = divmod(seed, Monster.MAX_LOOT_DROPS + 1)
         for _ in range(0, count):
-            self.set_loot(choice(consumable_loot)())
-
+            seed, consumable = divmod(seed, len(CONSUMABLE_DROPS))
+            loot.append(CONSUMABLE_DROPS[consumable])
 
+        if loot:
+            self._loot = loot
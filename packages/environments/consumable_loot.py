@@ -4,15 +4,33 @@ implement the unique features that each consumable may have.
 """
 from abc import ABC, abstractmethod
 from math import ceil
+from typing import Tuple
 
 from packages.environments.loot import Loot
+from packages.characters.effects import CombatStats, Effect
 from packages.characters.hero import Hero
 
 
 class ConsumableLoot(Loot, ABC):
+    CONSUMABLE = True
+    EFFECT = None
+
+    __slots__ = ()
+
     def __init__(self, name, desc):
         super().__init__(name, desc)
 
+    def preview(self, health: int, stats: CombatStats) -> Tuple[int, CombatStats]:
+        """
+        Health and combat stats a hero would have right after consuming, without consuming anything
+
+        :param health: Current health of the hero
+        :param stats: Current effective combat stats of the hero
+        :return: Health and combat stats after consuming
+        :rtype: Tuple[int, CombatStats]
+        """
+        return health, stats if self.EFFECT is None else self.EFFECT.apply(stats)
+
     @abstractmethod
     def consume(self, hero: Hero) -> None:
         """
@@ -37,6 +55,9 @@ class AttackPotion(ConsumableLoot, ABC):
 
     DESC = """Increase the number of attacked dice by 1"""
     NAME = "Attack Potion"
+    EFFECT = Effect(NAME, dice_count=1)
+
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(AttackPotion.NAME, AttackPotion.DESC)
@@ -48,7 +69,7 @@ class AttackPotion(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.dice_count += 1
+        hero.add_buff(AttackPotion.EFFECT)
 
     def remove_affect(self, hero: Hero) -> None:
         """
@@ -57,7 +78,7 @@ class AttackPotion(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.dice_count -= 1
+        hero.remove_buff(AttackPotion.EFFECT)
 
 
 class LuckySeven(ConsumableLoot, ABC):
@@ -65,6 +86,9 @@ class LuckySeven(ConsumableLoot, ABC):
 
     DESC = """Increase the number of faces of the combat die by a factor of 2"""
     NAME = "LuckySeven"
+    EFFECT = Effect(NAME, die_faces=2)
+
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(LuckySeven.NAME, LuckySeven.DESC)
@@ -76,7 +100,7 @@ class LuckySeven(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.die_faces *= 2
+        hero.add_buff(LuckySeven.EFFECT)
 
     def remove_affect(self, hero: Hero) -> None:
         """
@@ -85,7 +109,7 @@ class LuckySeven(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.die_faces /= 2
+        hero.remove_buff(LuckySeven.EFFECT)
 
 
 class HealthPotion(ConsumableLoot, ABC):
@@ -95,6 +119,8 @@ class HealthPotion(ConsumableLoot, ABC):
     DESC = """Increase health by 50% of missing health"""
     NAME = "HealthPotion"
 
+    __slots__ = ()
+
     def __init__(self):
         super().__init__(HealthPotion.NAME, HealthPotion.DESC)
 
@@ -104,21 +130,30 @@ class HealthPotion(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        max_health = hero.DEFAULT_HEALTH
-        difference = max_health - hero.health
-        increase_health = ceil(difference * .5)
-        hero.health += increase_health
+        hero.health = HealthPotion._healed(hero.health)
 
     def remove_affect(self, hero: Hero) -> None:
         """Abstract method not implemented by this consumable"""
         pass
 
+    def preview(self, health: int, stats: CombatStats) -> Tuple[int, CombatStats]:
+        return HealthPotion._healed(health), stats
+
+    @staticmethod
+    def _healed(health: int) -> int:
+        """Health after drinking the potion"""
+        difference = Hero.DEFAULT_HEALTH - health
+        return health + ceil(difference * .5)
+
 
 class HeavyHand(ConsumableLoot, ABC):
     """Increases the base damage by a factor of 1"""
 
     DESC = """Increase the amount of damage dealt by 1"""
     NAME = "HeavyHand"
+    EFFECT = Effect(NAME, damage=1)
+
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(HeavyHand.NAME, HeavyHand.DESC)
@@ -129,7 +164,7 @@ class HeavyHand(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return:None
         """
-        hero.damage += 1
+        hero.add_buff(HeavyHand.EFFECT)
 
     def remove_affect(self, hero: Hero) -> None:
         """
@@ -138,7 +173,7 @@ class HeavyHand(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.damage -= 1
+        hero.remove_buff(HeavyHand.EFFECT)
 
 
 class PierceShot(ConsumableLoot, ABC):
@@ -146,6 +181,9 @@ class PierceShot(ConsumableLoot, ABC):
 
     DESC = """Guarantee success in combat"""
     NAME = "PierceShot"
+    EFFECT = Effect(NAME, pierce_shot=True)
+
+    __slots__ = ()
 
     def __init__(self):
         super().__init__(PierceShot.NAME, PierceShot.DESC)
@@ -157,10 +195,10 @@ class PierceShot(ConsumableLoot, ABC):
         :param hero: Hero to affect
         :return: None
         """
-        hero.pierce_shot = True
+        hero.add_buff(PierceShot.EFFECT)
 
     def remove_affect(self, hero: Hero) -> None:
-        hero.pierce_shot = False
+        hero.remove_buff(PierceShot.EFFECT)
 
 
 if __name__ != '__main__':
@@ -2,11 +2,13 @@
 Module is responsible for the environment from spawning monsters to displaying the environment description
 """
 from enum import Enum
-from typing import List, Optional
+from random import Random
+from typing import List, Optional, Union
 
-from packages.game_utils.utils import roll_dice
+from packages.game_utils.utils import get_rng, roll_dice
 from packages.game_utils.monster_controller import MonsterController, EnvironmentRecord
 from packages.environments.loot import Loot
+from packages.environments.loot_types import LootStack
 
 
 class InitiativeEnum(Enum):
@@ -17,7 +19,8 @@ class InitiativeEnum(Enum):
 class Environment:
     INITIATIVE_DIE_SIDES = 20
 
-    def __init__(self, room_name: str, desc: str, habitable: List[str] = None, level: int = 1):
+    def __init__(self, room_name: str, desc: str, habitable: List[str] = None, level: int = 1,
+                 rng: Optional[Random] = None):
         """
         Create an environment and summon monsters based on level
 
@@ -27,18 +30,21 @@ class Environment:
         :type desc: str
         :param level: Level of the room to increase the amount of monsters
         :type level: int
+        :param rng: Generator used for the initiative and the monsters of the room
+        :type rng: Optional[Random]
         """
+        self._rng = get_rng(rng)
         self._loot_list = []
         self._initiative = self._initiative()
         self._room_name = room_name
         self._desc = desc
         self._level = level
         self._habitable = habitable
-        self._monsters = MonsterController(EnvironmentRecord(self.level, self.habitable))
+        self._monsters = MonsterController(EnvironmentRecord(self.level, self.habitable), self._rng)
         self.round = 1
 
     @property
-    def loot(self) -> List[Loot]:
+    def loot(self) -> List[Union[Loot, LootStack]]:
         """Returns the list of loot available"""
         return self._loot_list
 
@@ -46,21 +52,21 @@ class Environment:
     def has_loot(self) -> bool:
         return len(self.loot) > 0
 
-    def add_loot(self, loot: Loot) -> None:
+    def add_loot(self, loot: Union[Loot, LootStack]) -> None:
         """
         Adds loot to the environment
 
-        :param loot: Loot dropped by a monster
+        :param loot: Loot or LootStack dropped by a monster
         :return: None
         """
         self._loot_list.append(loot)
 
-    def loot_room(self) -> List[Loot]:
+    def loot_room(self) -> List[Union[Loot, LootStack]]:
         """
         Loots the environment by dumping the list of loot
 
         :return: Copy of the loot list
-        :rtype: List[Loot]
+        :rtype: List[Union[Loot, LootStack]]
         """
         temp = self._loot_list[:]
         self._loot_list = []
@@ -130,8 +136,8 @@ class Environment:
 
         # roll for initiative until we get different values
         while same_values:
-            hero_initiative = roll_dice(Environment.INITIATIVE_DIE_SIDES)
-            monster_initiative = roll_dice(Environment.INITIATIVE_DIE_SIDES)
+            hero_initiative = roll_dice(Environment.INITIATIVE_DIE_SIDES, self._rng)
+            monster_initiative = roll_dice(Environment.INITIATIVE_DIE_SIDES, self._rng)
             if hero_initiative != monster_initiative:
                 same_values = False
 
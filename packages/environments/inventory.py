@@ -0,0 +1,162 @@
+"""
+Module holds the bag of the hero. Loot is indexed by name so merging a pickup into an existing stack is a single dict
+look up. Junk and consumables are kept in separate partitions so the bag screen does not have to split the bag every
+time it is opened. Partitions are only put back in quantity order, and emptied stacks only dropped from them, when
+the bag is read instead of on every insert or consume
+"""
+from typing import Dict, Iterable, Iterator, List, Optional
+
+from packages.environments.loot import Loot
+
+
+class Inventory:
+    __slots__ = ("_items", "_junk", "_consumable", "_order", "_dirty", "_empty")
+
+    def __init__(self):
+        """Create an empty bag"""
+        self._items: Dict[str, Loot] = {}
+        self._junk: List[Loot] = []
+        self._consumable: List[Loot] = []
+        self._order: List[Loot] = []
+        self._dirty = False
+        self._empty = 0
+
+    def __len__(self):
+        return len(self._items)
+
+    def __iter__(self) -> Iterator[Loot]:
+        return iter(self.items)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._items
+
+    @property
+    def items(self) -> List[Loot]:
+        """
+        Every stack in the bag, largest quantity first
+
+        :return: Loot in quantity order
+        :rtype: List[Loot]
+        """
+        self._refresh()
+        return self._order
+
+    @property
+    def junk(self) -> List[Loot]:
+        """
+        Stacks that can't be consumed, largest quantity first
+
+        :return: Junk loot in quantity order
+        :rtype: List[Loot]
+        """
+        self._refresh()
+        return self._junk
+
+    @property
+    def consumable(self) -> List[Loot]:
+        """
+        Stacks that can be consumed, largest quantity first
+
+        :return: Consumable loot in quantity order
+        :rtype: List[Loot]
+        """
+        self._refresh()
+        return self._consumable
+
+    def get(self, name: str) -> Optional[Loot]:
+        """
+        Look up a stack of loot by name
+
+        :param name: Name of the loot
+        :return: The stack in the bag, None if the bag has none
+        :rtype: Optional[Loot]
+        """
+        return self._items.get(name)
+
+    def add(self, loot: Loot) -> None:
+        """
+        Add loot to the bag, merging it into the stack of the same name if there is one. A LootStack only becomes a
+        Loot object when the bag does not hold its kind yet
+
+        :param loot: Loot or LootStack to add
+        :return: None
+        """
+        stack = self._items.get(loot.name)
+        if stack is None:
+            # an empty stack would only take a slot until the next clean up
+            if loot.quantity < 1:
+                return
+            if not isinstance(loot, Loot):
+                loot = loot.materialize()
+            self._items[loot.name] = loot
+            if loot.CONSUMABLE:
+                self._consumable.append(loot)
+            else:
+                self._junk.append(loot)
+        else:
+            stack.add_qty(loot.quantity)
+        self._dirty = True
+
+    def add_many(self, loots: Iterable[Loot]) -> None:
+        """
+        Merge a whole drop into the bag in a single pass
+
+        :param loots: Loot to add
+        :return: None
+        """
+        for loot in loots:
+            self.add(loot)
+
+    def remove(self, loot: Loot) -> None:
+        """
+        Remove a stack from the bag. The slot it used in its partition is freed on the next read
+
+        :param loot: Stack to remove
+        :return: None
+        :raises KeyError: If the bag does not hold the stack
+        """
+        if self._items.get(loot.name) is not loot:
+            raise KeyError(loot.name)
+
+        del self._items[loot.name]
+        self._empty += 1
+
+    def touch(self, loot: Loot) -> None:
+        """
+        Flag that the quantity of a stack changed outside of the bag. Stacks that ran out are removed
+
+        :param loot: Stack that changed
+        :return: None
+        """
+        self._dirty = True
+        if loot.quantity < 1 and self._items.get(loot.name) is loot:
+            self.remove(loot)
+
+    def compact(self) -> None:
+        """
+        Free the slots of the stacks that ran out and put the bag back in quantity order. Both partitions are rebuilt
+        and sorted again, whichever one had a stack removed
+
+        :return: None
+        """
+        self._refresh()
+
+    def _refresh(self) -> None:
+        """Free the slots of removed stacks and restore the quantity order if anything changed"""
+        if self._empty:
+            if len(self._junk) + len(self._consumable) != len(self._items):
+                self._junk = [loot for loot in self._junk if self._items.get(loot.name) is loot]
+                self._consumable = [loot for loot in self._consumable if self._items.get(loot.name) is loot]
+            self._empty = 0
+            self._dirty = True
+
+        if self._dirty:
+            self._junk.sort(key=_quantity, reverse=True)
+            self._consumable.sort(key=_quantity, reverse=True)
+            # both partitions are sorted runs, merging them is a linear pass
+            self._order = sorted(self._junk + self._consumable, key=_quantity, reverse=True)
+            self._dirty = False
+
+
+def _quantity(loot: Loot) -> int:
+    return loot.quantity
@@ -4,6 +4,10 @@ Base class for creating loot. Loot that is not a consumable will instantiate thi
 
 
 class Loot:
+    CONSUMABLE = False
+
+    __slots__ = ("_desc", "_name", "_has_item", "_quantity")
+
     def __init__(self, name: str, desc: str, has_item: bool = False, qty: int = 1):
         """
         Creates a loot object capable of keeping track of how many of itself are stored in the inventory of the hero
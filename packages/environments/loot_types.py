@@ -0,0 +1,112 @@
+"""
+Module holds the flyweight registry of every kind of loot a monster may drop.
+
+Names and descriptions live once in an immutable LootType. Drops are LootStack tuples of (type_id, quantity) so a
+monster, or the floor of a room, only holds two small ints per drop. A Loot object is only created when a stack of a
+new kind enters the bag of the hero.
+
+Classes
+-------
+    LootType:
+        Immutable definition of a kind of loot
+    LootStack:
+        Quantity of a kind of loot that has not been picked up yet
+"""
+from collections import namedtuple
+from typing import Dict, Tuple
+
+from packages.environments.consumable_loot import CONSUMABLE_LOOT
+from packages.environments.loot import Loot
+from packages.game_utils.utils import get_junk_loot
+
+
+class LootType(namedtuple("LootType", "type_id, name, desc, factory")):
+    __slots__ = ()
+
+    @property
+    def consumable(self) -> bool:
+        """
+        :return: Bool indicating the loot can be consumed by the hero
+        :rtype: bool
+        """
+        return self.factory is not None
+
+    def create(self, qty: int = 1) -> Loot:
+        """
+        Create the Loot object holding qty of this kind of loot
+
+        :param qty: Quantity of the stack
+        :return: Loot or ConsumableLoot object
+        :rtype: Loot
+        """
+        if self.factory is None:
+            return Loot(self.name, self.desc, qty=qty)
+
+        loot = self.factory()
+        loot.add_qty(qty - loot.quantity)
+        return loot
+
+
+class LootStack(namedtuple("LootStack", "type_id, quantity")):
+    __slots__ = ()
+
+    @property
+    def loot_type(self) -> LootType:
+        """
+        :return: Definition of the loot in the stack
+        :rtype: LootType
+        """
+        return LOOT_TYPES[self.type_id]
+
+    @property
+    def name(self) -> str:
+        """
+        :return: Name of the loot in the stack
+        :rtype: str
+        """
+        return LOOT_TYPES[self.type_id].name
+
+    @property
+    def description(self) -> str:
+        """
+        :return: Description of the loot in the stack
+        :rtype: str
+        """
+        return LOOT_TYPES[self.type_id].desc
+
+    def materialize(self) -> Loot:
+        """
+        Create the Loot object the hero carries for this stack
+
+        :return: Loot holding the quantity of the stack
+        :rtype: Loot
+        """
+        return LOOT_TYPES[self.type_id].create(self.quantity)
+
+
+def _build_registry() -> Tuple[LootType, ...]:
+    """Register the junk loot first then the consumables, type ids are the position in the registry"""
+    types = [LootType(type_id, junk.name, junk.desc, None) for type_id, junk in enumerate(get_junk_loot())]
+    types += [LootType(len(types) + index, consumable.NAME, consumable.DESC, consumable)
+              for index, consumable in enumerate(CONSUMABLE_LOOT)]
+    return tuple(types)
+
+
+LOOT_TYPES = _build_registry()
+JUNK_TYPE_IDS = tuple(loot_type.type_id for loot_type in LOOT_TYPES if not loot_type.consumable)
+CONSUMABLE_TYPE_IDS = tuple(loot_type.type_id for loot_type in LOOT_TYPES if loot_type.consumable)
+# consumables always drop one at a time, the same stack object is shared by every drop
+CONSUMABLE_DROPS = tuple(LootStack(type_id, 1) for type_id in CONSUMABLE_TYPE_IDS)
+_TYPE_IDS: Dict[str, int] = {loot_type.name: loot_type.type_id for loot_type in LOOT_TYPES}
+
+
+def loot_type(name: str) -> LootType:
+    """
+    Look up the definition of a kind of loot by name
+
+    :param name: Name of the loot
+    :return: Registered definition
+    :rtype: LootType
+    :raises KeyError: If no loot of that name is registered
+    """
+    return LOOT_TYPES[_TYPE_IDS[name]]
@@ -1,70 +1,177 @@
 """
-Module is responsible for displaying text to the terminal
+Module is responsible for displaying text to the terminal. Every panel is composed as a list of lines and drawn as a
+single frame by the FrameRenderer
 """
 
+import sys
+from functools import lru_cache
 from math import log10
-from textwrap import dedent, wrap
-from typing import List
+from typing import TYPE_CHECKING, List, Optional, TextIO
 
 from packages.characters.hero import Hero
-from packages.characters.monster import Monster
-from packages.environments.environment import Environment
 from packages.environments.loot import Loot
 
+if TYPE_CHECKING:
+    # only the battle panels take rooms and monsters, they are not imported to draw the start menu
+    from packages.characters.monster import Monster
+    from packages.environments.environment import Environment
+
 BOARDER = "-" * 80
+ESC = "\x1b"
 
 
-def display_no_combat_init(hero: Hero):
-    panel = f"""
-    Below you will see some of your stats. When you are ready to begin, press 1...
-    {BOARDER}
-    Your stats:
-    Hero:        {hero.name}
-    Health:      {hero.health}
-    Bag Items:   {hero.loot_count}
-    
-    Actions:
-    --------
-    1) Walk into first environment 
-    2) Show Bag
-    q) Quit
-    
-    {BOARDER}
-    """
-    print(dedent(panel))
+class FrameRenderer:
+    def __init__(self, stream: Optional[TextIO] = None, diff: Optional[bool] = None):
+        """
+        Write whole screens to the terminal at once. Each frame is composed into a single buffer and flushed with one
+        write. When a frame of the same kind and size is drawn again and everything written since went through the
+        renderer, only the lines that changed are rewritten in place with ANSI cursor movements
+
+        :param stream: Where to write, defaults to the standard output at the time of the write
+        :type stream: Optional[TextIO]
+        :param diff: Allow in place updates, None only allows them on a terminal
+        :type diff: Optional[bool]
+        """
+        self._stream = stream
+        self._diff = diff
+        self._frame: Optional[List[str]] = None
+        self._key: Optional[str] = None
+        self._below = 0
+
+    @property
+    def stream(self) -> TextIO:
+        return sys.stdout if self._stream is None else self._stream
+
+    def draw(self, lines: List[str], key: Optional[str] = None) -> None:
+        """
+        Show a frame. Frames drawn with the same key are expected to only differ by a few lines
+
+        :param lines: Lines of the frame, without line endings
+        :param key: Kind of frame, None never updates in place
+        :return: None
+        """
+        if key is not None and key == self._key and self._can_diff(lines):
+            self._write(self._diff_frame(lines))
+        else:
+            self._write("\n".join(lines) + "\n")
+            self._below = 0
+        self._frame = lines
+        self._key = key
+
+    def write(self, text: str) -> None:
+        """
+        Write text below the last frame, keeping track of the lines used so the frame can still be updated in place
+
+        :param text: Text to write
+        :return: None
+        """
+        self._write(text)
+        self._below += text.count("\n")
+
+    def flush(self) -> None:
+        """Writes are flushed as they happen, kept so the renderer can be used as a stream"""
+        pass
+
+    def read(self, prompt: str = "") -> str:
+        """
+        Read a line typed by the player. The echoed line is counted like any other line written
+
+        :param prompt: Prompt shown before the input
+        :return: Line typed by the player
+        :rtype: str
+        """
+        self.stream.flush()
+        value = input(prompt)
+        self._below += 1
+        return value
+
+    def invalidate(self) -> None:
+        """Forget the last frame, called when something was written to the terminal without the renderer"""
+        self._frame = None
+        self._key = None
+
+    def _can_diff(self, lines: List[str]) -> bool:
+        """The last frame has the same shape and its first line is still on the screen"""
+        if self._frame is None or len(self._frame) != len(lines):
+            return False
+
+        diff = self.stream.isatty() if self._diff is None else self._diff
+        if not diff:
+            return False
+
+        # shutil is slow to import and only needed when drawing on a terminal
+        from shutil import get_terminal_size
+        columns, rows = get_terminal_size()
+        return len(lines) + self._below < rows and all(len(line) <= columns for line in lines)
+
+    def _diff_frame(self, lines: List[str]) -> str:
+        """Escape sequence rewriting the lines of the last frame that changed, the cursor is left where it was"""
+        parts = [f"{ESC}7{ESC}[{len(lines) + self._below}A"]
+        for previous, line in zip(self._frame, lines):
+            if line != previous:
+                parts.append(f"\r{ESC}[2K{line}")
+            parts.append(f"{ESC}[1B")
+        parts.append(f"{ESC}8")
+        return "".join(parts)
+
+    def _write(self, text: str) -> None:
+        stream = self.stream
+        stream.write(text)
+        stream.flush()
+
+
+SCREEN = FrameRenderer()
+
 
+def display_no_combat_init(hero: Hero, screen: FrameRenderer = SCREEN):
+    screen.draw([
+        "",
+        "Below you will see some of your stats. When you are ready to begin, press 1...",
+        BOARDER,
+        "Your stats:",
+        f"Hero:        {hero.name}",
+        f"Health:      {hero.health}",
+        f"Bag Items:   {hero.loot_count}",
+        "",
+        "Actions:",
+        "--------",
+        "1) Walk into first environment ",
+        "2) Show Bag",
+        "q) Quit",
+        "",
+        BOARDER,
+        "",
+    ])
 
-def display_no_combat_start(hero: Hero, env: Environment):
+
+def display_no_combat_start(hero: Hero, env: "Environment", screen: FrameRenderer = SCREEN):
     loot_nearby = None
     pickup_loot = None
     if env.has_loot:
         loot_nearby = f"Loot Nearby: {env.has_loot}"
         pickup_loot = "3) Pickup loot"
 
-    panel = f"""
-    {BOARDER}
-    Your stats:
-    Hero:         {hero.name}
-    Health:       {hero.health}
-    Damage:       {hero.damage}
-    Dice Count:   {hero.dice_count}
-    Pierce Shot:  {'Enabled' if hero.pierce_shot else 'Disabled'}
-    Bag Items:    {hero.loot_count}
-    {loot_nearby if loot_nearby else ""}
-
-    Actions:
-    --------
-    1) Enter the next environment 
-    2) Show Bag
-    {pickup_loot if pickup_loot else ""}
-    q) Quit
-
-    {BOARDER}
-    """
-    print(dedent(panel))
+    screen.draw([
+        "",
+        BOARDER,
+        "Your stats:",
+        *_hero_stats(hero, ""),
+        loot_nearby if loot_nearby else "",
+        "",
+        "Actions:",
+        "--------",
+        "1) Enter the next environment ",
+        "2) Show Bag",
+        pickup_loot if pickup_loot else "",
+        "q) Quit",
+        "",
+        BOARDER,
+        "",
+    ])
 
 
-def display_hero_bag(hero: Hero, junk: List[Loot], consumable: List[Loot], exiting: bool = False):
+def display_hero_bag(hero: Hero, junk: List[Loot], consumable: List[Loot], exiting: bool = False,
+                     screen: FrameRenderer = SCREEN):
     # calculate the largest space needed for the quantity field
     longest_qty_num = max((loot.quantity for loot in hero.loot))
     qty_space = (int(log10(longest_qty_num)) + 1) + 3
@@ -72,88 +179,138 @@ def display_hero_bag(hero: Hero, junk: List[Loot], consumable: List[Loot], exiti
     longest_name = max((len(loot.name) for loot in hero.loot))
     name_space = longest_name + 3
 
-    header = f"{'Index':<5} {'Qty':<{qty_space}} {'Name':<{name_space}} Description"
-    action_on = '\n'.join((f"{index:<1}) Consume {loot.name}" for index, loot in enumerate(consumable)))
-
-    _quit = "q) Go back"
+    lines = [
+        "",
+        f"{hero.name} inventory:",
+        BOARDER,
+        "",
+        f"{'Index':<5} {'Qty':<{qty_space}} {'Name':<{name_space}} Description",
+    ]
 
     # create list of junks
-    junk_items = '\n'.join(
-        (f"{'x':<5} {loot.quantity:<{qty_space}} {loot.name:<{name_space}} {loot.description}" for loot in junk))
+    lines.extend(
+        f"{'x':<5} {loot.quantity:<{qty_space}} {loot.name:<{name_space}} {loot.description}" for loot in junk)
+    if not junk:
+        lines.append("")
+    lines.append("")
 
     # create list of consumables
-    consumable_items = '\n'.join(
-        (
-            f"{index:<5} {loot.quantity:<{qty_space}} {loot.name:<{name_space}} {loot.description}"
-            for index, loot in enumerate(consumable)
-        )
+    lines.extend(
+        f"{index:<5} {loot.quantity:<{qty_space}} {loot.name:<{name_space}} {loot.description}"
+        for index, loot in enumerate(consumable)
     )
+    if not consumable:
+        lines.append("")
+    lines.append(BOARDER)
 
-    panel = f"""
-    {hero.name} inventory:
-    {BOARDER}
-    """
     if not exiting:
-        print(dedent(panel), header, junk_items, "", consumable_items, BOARDER, "Choose a potion to consume",
-              action_on, _quit, sep="\n")
-    else:
-        print(dedent(panel), header, junk_items, "", consumable_items, BOARDER, sep="\n")
+        lines.append("Choose a potion to consume")
+        lines.extend(f"{index:<1}) Consume {loot.name}" for index, loot in enumerate(consumable))
+        if not consumable:
+            lines.append("")
+        lines.append("q) Go back")
+
+    screen.draw(lines)
 
 
-def display_battle(hero: Hero, env: Environment, initiative: str) -> None:
+def display_battle(hero: Hero, env: "Environment", initiative: str, screen: FrameRenderer = SCREEN) -> None:
     monsters_string = "Monster" if env.monster_ctrl.monster_count == 1 else "Monsters"
 
-    monster_list = "\n".join(
-        (_monster_format(monster, index + 1) for index, monster in enumerate(env.monster_ctrl.monsters)))
-
-    panel = f"""
-    Battle in {env.room_name}
-    {initiative} the initiative!
-    {BOARDER}
-    Round {env.round}:
-    
-    {hero.name} stats:
-    ------------------
-        Hero:         {hero.name}
-        Health:       {hero.health}
-        Damage:       {hero.damage}
-        Dice Count:   {hero.dice_count}
-        Pierce Shot:  {'Enabled' if hero.pierce_shot else 'Disabled'}
-        Bag Items:    {hero.loot_count}
-    
-    vs.
-   
-    {monsters_string} stats:
-    ------------------------
-        {monster_list}
-        
-    Actions:
-    --------
-    1) Battle!
-    2) Show Bag
-    3) Run Away (Chance of success: %{(hero.health * .1) * 100:.0f})
-    """
-    print(dedent(panel))
+    lines = [
+        "",
+        f"Battle in {env.room_name}",
+        f"{initiative} the initiative!",
+        BOARDER,
+        f"Round {env.round}:",
+        "",
+        f"{hero.name} stats:",
+        "------------------",
+        *_hero_stats(hero, "    "),
+        "",
+        "vs.",
+        "",
+        f"{monsters_string} stats:",
+        "------------------------",
+    ]
+    for index, monster in enumerate(env.monster_ctrl.monsters):
+        lines.extend(_monster_format(hero, monster, index + 1))
 
+    lines.extend([
+        "",
+        "Actions:",
+        "--------",
+        "1) Battle!",
+        "2) Show Bag",
+        f"3) Run Away (Chance of success: %{(hero.health * .1) * 100:.0f})",
+        "",
+    ])
+    # rounds of the same room only change a few stat lines, they are updated in place
+    screen.draw(lines, "battle")
 
-def display_no_loot() -> None:
-    print("[!] You have no loot to display...\n")
-    input("Press enter to continue....")
 
+def display_message(message: str, screen: FrameRenderer = SCREEN) -> None:
+    screen.write(f"{message}\n")
 
-def display_boarder_attack() -> None:
-    print("Attack Log:\n", BOARDER)
 
+def display_description(env: "Environment", screen: FrameRenderer = SCREEN) -> None:
+    screen.draw(["", f" {format_description(env.description, env.monster_ctrl.monsters[0].noise)} ", ""])
 
-def display_boarder_attack_end() -> None:
-    print(BOARDER)
 
+@lru_cache(maxsize=None)
+def format_description(description: str, noise: Optional[str]) -> str:
+    """
+    Fill in the monster noise and wrap the description of an environment. Environments and noises come from a small
+    fixed catalogue, so every variant is only wrapped once
 
-def _monster_format(monster: Monster, count: int) -> str:
-    return f"""
-    Monster {count}
-    ----------------
-        Monster:    {monster.name}
-        Health:     {monster.health}
-        Dice Count: {monster.dice_count}
+    :param description: Description template of the environment
+    :param noise: Noise of the first monster of the room
+    :return: Wrapped description
+    :rtype: str
     """
+    # textwrap is only needed once the first room is described
+    from textwrap import wrap
+
+    description = description.format(noise=noise)
+    return "\n".join(wrap(description, width=80, fix_sentence_endings=True, initial_indent="  ",
+                          subsequent_indent="  ", break_long_words=False))
+
+
+def display_no_loot(screen: FrameRenderer = SCREEN) -> None:
+    screen.write("[!] You have no loot to display...\n\n")
+    screen.read("Press enter to continue....")
+
+
+def display_boarder_attack(screen: FrameRenderer = SCREEN) -> None:
+    screen.write(f"Attack Log:\n {BOARDER}\n")
+
+
+def display_boarder_attack_end(screen: FrameRenderer = SCREEN) -> None:
+    screen.write(f"{BOARDER}\n")
+
+
+def _hero_stats(hero: Hero, indent: str) -> List[str]:
+    return [
+        f"{indent}Hero:         {hero.name}",
+        f"{indent}Health:       {hero.health}",
+        f"{indent}Damage:       {hero.damage}",
+        f"{indent}Dice Count:   {hero.dice_count}",
+        f"{indent}Pierce Shot:  {'Enabled' if hero.pierce_shot else 'Disabled'}",
+        f"{indent}Bag Items:    {hero.loot_count}",
+    ]
+
+
+def _monster_format(hero: Hero, monster: "Monster", count: int) -> List[str]:
+    # the odds are only needed once the first battle is drawn, not to reach the start menu
+    from packages.game_utils.probability import hit_probability
+
+    return [
+        "",
+        f"Monster {count}",
+        "----------------",
+        f"    Monster:    {monster.name}",
+        f"    Health:     {monster.health}",
+        f"    Dice Count: {monster.dice_count}",
+        f"    Hit Chance: %{hit_probability(hero, monster) * 100:.0f}",
+        f"    Hit Taken:  %{hit_probability(monster, hero) * 100:.0f}",
+        "",
+    ]
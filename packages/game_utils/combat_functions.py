@@ -1,21 +1,21 @@
 """
 Module handles combat between Character generics
 """
-from typing import List
+from typing import Sequence
 
 from packages.characters.character_abstract import Character
 from packages.characters.monster import Monster
 from packages.environments.environment import Environment
+from packages.game_utils.events import NULL_SINK, Died, DuelEnded, DuelRolled, Hit, LootDropped, Miss
 
 
-def duel(attacker: Character, defender: Character, env: Environment, display_rolls: bool = False,
-         debug: bool = False) -> bool:
+def duel(attacker: Character, defender: Character, env: Environment, sink=NULL_SINK, debug: bool = False) -> bool:
     """
     Function handles the individual conflict between a single attacker and single defender. The function determines
     if the attacker is able to land a hit on the defender
 
-    :param env:
-    :param display_rolls:
+    :param env: Environment receiving the loot of a defender that dies
+    :param sink: Receives the events of the duel, see events. Nothing is emitted to a disabled sink
     :param debug: Debugger is only used for running unittests
     :param attacker: Character doing the attacking
     :type attacker: Character
@@ -25,35 +25,40 @@ def duel(attacker: Character, defender: Character, env: Environment, display_rol
     :rtype: bool
     """
     attack_success = False
+    emit = sink.emit if sink.enabled else None
 
     # roll for combat
     if not debug:
         attacker.combat_roll()
         defender.combat_roll()
 
-        if display_rolls:
-            print(f"{attacker.name} rolled: [{', '.join(map(str, attacker.combat_rolls))}]")
-            print(f"{defender.name} rolled: [{', '.join(map(str, defender.combat_rolls))}]")
+        if emit:
+            emit(DuelRolled(attacker.name, defender.name, tuple(attacker.combat_rolls),
+                            tuple(defender.combat_rolls)))
 
     if _is_attack_successful(attacker, defender):
         attack_success = True
-        print(f" [HIT] ({attacker.name}) -> hits -> ({defender.name}) for {attacker.damage}!")
+        if emit:
+            emit(Hit(attacker.name, defender.name, attacker.damage))
 
         defender.takes_hit(attacker.damage)
         if defender.is_dead:
-            print(f"[!] {defender.name} dies with that hit!")
+            if emit:
+                emit(Died(defender.name))
 
             # add loot to environment if defender is a monster
             if isinstance(defender, Monster):
                 if defender.has_loot:
-                    print(f"[*] {defender.name} dropped loot!")
+                    if emit:
+                        emit(LootDropped(defender.name, defender.loot_count))
                     for loot in defender.loot:
                         env.add_loot(loot)
 
-    else:
-        print(f"[MISS] ({attacker.name}) -> misses -> ({defender.name})!")
+    elif emit:
+        emit(Miss(attacker.name, defender.name))
 
-    print("\n")
+    if emit:
+        emit(DuelEnded(attacker.name, defender.name))
 
     return attack_success
 
@@ -70,20 +75,48 @@ def _is_attack_successful(attacker: Character, defender: Character) -> bool:
     :return: Return if attack was successful
     :rtype: bool
     """
+    return rolls_hit(attacker.combat_rolls, defender.combat_rolls)
+
+
+def rolls_hit(attacker_rolls: Sequence[int], defender_rolls: Sequence[int]) -> bool:
+    """
+    Compare the sorted rolls of both sides pairwise. The attacker hits on the first pair it wins
+
+    :param attacker_rolls: Rolls of the attacker in descending order
+    :param defender_rolls: Rolls of the defender in descending order
+    :return: Return if attack was successful
+    :rtype: bool
+    """
     attack_successful = False
 
     # get max count to iter
-    count = _min_die(attacker.combat_rolls, defender.combat_rolls)
+    count = _min_die(attacker_rolls, defender_rolls)
 
     # Iterate to check if attacker won rolls
     for _round in range(0, count):
-        if attacker.combat_rolls[_round] > defender.combat_rolls[_round]:
+        if attacker_rolls[_round] > defender_rolls[_round]:
             attack_successful = True
             break
 
     return attack_successful
 
 
-def _min_die(die_list: List[int], die_list2: List[int]) -> int:
+def batch_attack_successful(attacker_rolls, defender_rolls):
+    """
+    Vectorized version of _is_attack_successful. Each row of the matrices holds the sorted combat rolls of a single
+    duel, see dice.BatchDice
+
+    :param attacker_rolls: Matrix of attacker rolls with shape (duels, attacker dice)
+    :type attacker_rolls: numpy.ndarray
+    :param defender_rolls: Matrix of defender rolls with shape (duels, defender dice)
+    :type defender_rolls: numpy.ndarray
+    :return: Boolean array marking the duels where the attacker landed a hit
+    :rtype: numpy.ndarray
+    """
+    count = min(attacker_rolls.shape[1], defender_rolls.shape[1])
+    return (attacker_rolls[:, :count] > defender_rolls[:, :count]).any(axis=1)
+
+
+def _min_die(die_list: Sequence[int], die_list2: Sequence[int]) -> int:
     """Return the smallest number of dice of either character"""
     return min(len(die_list), len(die_list2))
@@ -0,0 +1,93 @@
+"""
+Module caches the parsed game data in a single precompiled bundle.
+
+The data files are small, parsing them is not what makes startup slow: importing json and csv is. The bundle keeps
+the parsed content of every data file as builtins, serialized with marshal, next to the data. Each entry is keyed by
+the hash of the file it was parsed from, so editing a data file is picked up on the next start and only that file is
+parsed again.
+
+The bundle is a cache. It is rebuilt when missing, unreadable or written by another version, and the game still
+starts when it can't be written. Paths are handled with os.path, pathlib and what it imports are a good share of the
+start of the game.
+
+Classes
+-------
+    DataBundle:
+        Parsed data files keyed by their hash
+"""
+import marshal
+from os import PathLike, fspath, replace
+from os.path import dirname, join, realpath
+from typing import Callable, Dict, Optional, Tuple, Union
+from zlib import crc32
+
+BUNDLE_VERSION = 1
+ROOT_DIR = dirname(dirname(dirname(realpath(__file__))))
+DATA_DIR = join(ROOT_DIR, "data")
+BUNDLE_FILE = join(DATA_DIR, ".dd_bundle")
+
+FilePath = Union[str, PathLike]
+
+
+class DataBundle:
+    def __init__(self, path: FilePath = BUNDLE_FILE):
+        """
+        Precompiled bundle of the data files. The bundle is read once per process, on the first load
+
+        :param path: File of the bundle
+        :type path: FilePath
+        """
+        self.path = path
+        self._entries: Optional[Dict[str, Tuple[Tuple[int, int], object]]] = None
+
+    def load(self, source: FilePath, parser: Callable[[str], object]) -> object:
+        """
+        Parsed content of a data file, from the bundle when the file did not change since it was bundled
+
+        :param source: Data file
+        :param parser: Parses the text of the file, must only return builtins marshal can serialize
+        :return: Result of the parser
+        :raises FileNotFoundError: If the data file does not exist
+        """
+        with open(source, "rb") as file:
+            raw = file.read()
+        key = (crc32(raw), len(raw))
+        entries = self._read()
+        name = fspath(source)
+
+        entry = entries.get(name)
+        if entry is not None and entry[0] == key:
+            return entry[1]
+
+        value = parser(raw.decode("utf-8"))
+        entries[name] = (key, value)
+        self._write()
+        return value
+
+    def _read(self) -> Dict[str, Tuple[Tuple[int, int], object]]:
+        """Entries of the bundle on disk, none when it is missing or stale"""
+        if self._entries is None:
+            self._entries = {}
+            try:
+                with open(self.path, "rb") as file:
+                    version, entries = marshal.loads(file.read())
+                if version == BUNDLE_VERSION:
+                    self._entries = entries
+            except (OSError, EOFError, ValueError, TypeError):
+                pass
+
+        return self._entries
+
+    def _write(self) -> None:
+        """Write the bundle, the previous one is only replaced once the new one is fully written"""
+        temp = fspath(self.path) + ".tmp"
+        try:
+            with open(temp, "wb") as file:
+                file.write(marshal.dumps((BUNDLE_VERSION, self._entries)))
+            replace(temp, self.path)
+        except (OSError, ValueError):
+            # a read only install still runs, it parses the data on every start
+            pass
+
+
+BUNDLE = DataBundle()
@@ -0,0 +1,202 @@
+"""
+Batched dice backend for Monte Carlo balance sweeps. Instead of rolling die by die for every duel, whole matrices of
+combat rolls are produced at once from a seeded NumPy generator.
+
+NumPy is optional for the game itself, it is only required by this module.
+
+Classes
+-------
+    BatchDice:
+        Seeded generator of sorted combat roll matrices with shape (duels, dice_count)
+    PCG64Random:
+        Drop in replacement for random.Random backed by the NumPy PCG64 bit generator, used as the generator of a game
+"""
+from typing import Any, Optional, Sequence
+
+try:
+    import numpy as np
+except ImportError:  # pragma: no cover - depends on the environment
+    np = None
+
+from packages.game_utils.combat_functions import batch_attack_successful
+
+DEFAULT_DIE_SIDES = 6
+DEFAULT_CHUNK_SIZE = 1_000_000
+DEFAULT_BUFFER_SIZE = 4096
+
+
+def _require_numpy() -> None:
+    """Fail early when the optional dependency is missing"""
+    if np is None:
+        raise ImportError("The dice module requires numpy to be installed")
+
+
+class BatchDice:
+    def __init__(self, seed: Optional[int] = None):
+        """
+        Create the batched dice roller
+
+        :param seed: Seed of the NumPy generator. The same seed always returns the same roll matrices
+        :type seed: Optional[int]
+        :raises ImportError: When NumPy is not installed
+        """
+        _require_numpy()
+        self._generator = np.random.default_rng(seed)
+
+    def roll(self, count: int, dice_count: int, sides: int = DEFAULT_DIE_SIDES, pierce_shot: bool = False):
+        """
+        Roll the combat dice for a batch of duels. Every row is sorted in descending order just like
+        Character.combat_rolls
+
+        :param count: Number of duels in the batch
+        :param dice_count: Number of dice rolled per duel
+        :param sides: Number of faces on each die
+        :param pierce_shot: Every die lands on its max value, see PierceShot
+        :return: Matrix of rolls with shape (count, dice_count)
+        :rtype: numpy.ndarray
+        :raises ValueError: When given a side less than 1
+        """
+        if sides < 1:
+            raise ValueError
+
+        if pierce_shot:
+            return np.full((count, dice_count), sides, dtype=np.int16)
+
+        rolls = self._generator.integers(1, sides + 1, size=(count, dice_count), dtype=np.int16)
+        rolls.sort(axis=1)
+        return rolls[:, ::-1]
+
+    def roll_for(self, character, count: int):
+        """
+        Roll a batch of combat dice using the dice count, die faces and buffs of a character
+
+        :param character: Character whose dice are rolled
+        :type character: Character
+        :param count: Number of duels in the batch
+        :return: Matrix of rolls with shape (count, character.dice_count)
+        :rtype: numpy.ndarray
+        """
+        return self.roll(count, character.dice_count, character.die_faces,
+                         getattr(character, "pierce_shot", False))
+
+    def resolve_duels(self, count: int, attacker_dice: int, defender_dice: int,
+                      attacker_sides: int = DEFAULT_DIE_SIDES, defender_sides: int = DEFAULT_DIE_SIDES,
+                      chunk_size: int = DEFAULT_CHUNK_SIZE) -> int:
+        """
+        Resolve a large number of duels between the same kind of attacker and defender. Duels are rolled in chunks so
+        memory stays flat no matter how many duels are requested
+
+        :param count: Number of duels to resolve
+        :param attacker_dice: Dice count of the attacker
+        :param defender_dice: Dice count of the defender
+        :param attacker_sides: Die faces of the attacker
+        :param defender_sides: Die faces of the defender
+        :param chunk_size: Maximum number of duels rolled at once
+        :return: Number of duels where the attacker landed a hit
+        :rtype: int
+        """
+        hits = 0
+        remaining = count
+        while remaining > 0:
+            size = min(remaining, chunk_size)
+            attacker_rolls = self.roll(size, attacker_dice, attacker_sides)
+            defender_rolls = self.roll(size, defender_dice, defender_sides)
+            hits += int(batch_attack_successful(attacker_rolls, defender_rolls).sum())
+            remaining -= size
+
+        return hits
+
+
+class PCG64Random:
+    # tells snapshots which generator to create when restoring a game
+    SNAPSHOT_KIND = "pcg64"
+
+    def __init__(self, seed: Optional[int] = None, buffer_size: int = DEFAULT_BUFFER_SIZE):
+        """
+        Game generator backed by the NumPy PCG64 bit generator. Uniform floats are drawn in blocks so every single draw
+        the game makes costs a list pop instead of a call into NumPy. Implements the part of the random.Random
+        interface used by the game
+
+        :param seed: Seed of the bit generator
+        :type seed: Optional[int]
+        :param buffer_size: Number of floats drawn at once
+        :type buffer_size: int
+        :raises ImportError: When NumPy is not installed
+        """
+        _require_numpy()
+        self._generator = np.random.Generator(np.random.PCG64(seed))
+        self._buffer_size = buffer_size
+        self._buffer = []
+        # state of the bit generator the buffer was drawn from, the buffer is drawn again from it on setstate
+        self._buffer_state: Optional[dict] = None
+
+    @property
+    def buffer_size(self) -> int:
+        """
+        :return: Number of floats drawn at once
+        :rtype: int
+        """
+        return self._buffer_size
+
+    def random(self) -> float:
+        """
+        :return: Float in the interval [0, 1)
+        :rtype: float
+        """
+        if not self._buffer:
+            self._buffer_state = self._generator.bit_generator.state
+            self._buffer = self._generator.random(self._buffer_size).tolist()
+        return self._buffer.pop()
+
+    def randint(self, a: int, b: int) -> int:
+        """
+        :return: Integer in the interval [a, b]
+        :rtype: int
+        """
+        return a + int(self.random() * (b - a + 1))
+
+    def choice(self, seq: Sequence) -> Any:
+        """
+        :return: Random element of a non empty sequence
+        """
+        return seq[int(self.random() * len(seq))]
+
+    def getrandbits(self, k: int) -> int:
+        """
+        :return: Integer with k random bits
+        :rtype: int
+        """
+        return int.from_bytes(self._generator.bytes((k + 7) // 8), "big") >> (-k % 8)
+
+    def getstate(self) -> tuple:
+        """
+        State of the generator. The unused buffered floats are not part of it, only the state of the bit generator
+        they were drawn from and how many are left, a few hundred bytes instead of the whole buffer
+
+        :return: (bit generator state, buffer bit generator state, floats left in the buffer)
+        :rtype: tuple
+        """
+        return self._generator.bit_generator.state, self._buffer_state, len(self._buffer)
+
+    def setstate(self, state: tuple) -> None:
+        """
+        Restore a state returned by getstate. The buffer must have been drawn with the same buffer size
+
+        :param state: State of the generator
+        :return: None
+        """
+        if len(state) == 2:
+            # states holding the buffered floats themselves
+            self._generator.bit_generator.state, buffer = state
+            self._buffer = list(buffer)
+            self._buffer_state = None
+            return
+
+        bit_state, buffer_state, left = state
+        self._buffer = []
+        self._buffer_state = buffer_state
+        if left:
+            self._generator.bit_generator.state = buffer_state
+            # floats are popped from the end, the ones left are the start of the block
+            self._buffer = self._generator.random(self._buffer_size).tolist()[:left]
+        self._generator.bit_generator.state = bit_state
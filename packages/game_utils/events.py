@@ -0,0 +1,162 @@
+"""
+Module holds the events emitted by the game and the sinks that consume them.
+
+Combat and room logic never print. They emit small immutable events to a sink, and the sink decides what rendering
+costs to pay. The events only carry names and numbers so any sink can keep or serialize them.
+
+Classes
+-------
+    NullSink:
+        Drops every event. Code emitting events checks enabled first so nothing is built for it
+    TerminalRenderer:
+        Formats events to lines and writes them to the terminal in a single write per flush
+    JsonlSink:
+        Writes one JSON object per event, used for combat logs
+    TeeSink:
+        Sends every event to several sinks
+"""
+import sys
+from collections import namedtuple
+from typing import Callable, Dict, List, Optional, TextIO
+
+DuelRolled = namedtuple("DuelRolled", "attacker, defender, attacker_rolls, defender_rolls")
+Hit = namedtuple("Hit", "attacker, defender, damage")
+Miss = namedtuple("Miss", "attacker, defender")
+Died = namedtuple("Died", "name")
+LootDropped = namedtuple("LootDropped", "name, count")
+DuelEnded = namedtuple("DuelEnded", "attacker, defender")
+RoomEntered = namedtuple("RoomEntered", "room_name, level, monster_count, initiative")
+
+
+class NullSink:
+    enabled = False
+
+    def emit(self, event: tuple) -> None:
+        """Drop the event"""
+        pass
+
+    def flush(self) -> None:
+        """Nothing is ever buffered"""
+        pass
+
+
+NULL_SINK = NullSink()
+
+
+class TerminalRenderer:
+    enabled = True
+
+    def __init__(self, show_rolls: bool = False, stream: Optional[TextIO] = None):
+        """
+        Render the combat log to the terminal. Lines are buffered and written at once when the game flushes, before
+        it draws a panel or asks for input
+
+        :param show_rolls: Display the combat rolls of each duel
+        :type show_rolls: bool
+        :param stream: Where to write, defaults to the standard output at the time of the flush
+        :type stream: Optional[TextIO]
+        """
+        self.show_rolls = show_rolls
+        self._stream = stream
+        self._lines: List[str] = []
+        self._formatters: Dict[type, Callable] = {
+            DuelRolled: self._duel_rolled,
+            Hit: lambda event: f" [HIT] ({event.attacker}) -> hits -> ({event.defender}) for {event.damage}!",
+            Miss: lambda event: f"[MISS] ({event.attacker}) -> misses -> ({event.defender})!",
+            Died: lambda event: f"[!] {event.name} dies with that hit!",
+            LootDropped: lambda event: f"[*] {event.name} dropped loot!",
+            DuelEnded: lambda event: "\n",
+        }
+
+    def emit(self, event: tuple) -> None:
+        """
+        Format the event and keep it until the next flush. Events without a formatter are not rendered
+
+        :param event: Event emitted by the game
+        :return: None
+        """
+        formatter = self._formatters.get(type(event))
+        if formatter is not None:
+            line = formatter(event)
+            if line is not None:
+                self._lines.append(line)
+
+    def flush(self) -> None:
+        """
+        Write the buffered lines
+
+        :return: None
+        """
+        if not self._lines:
+            return
+
+        stream = sys.stdout if self._stream is None else self._stream
+        stream.write("\n".join(self._lines) + "\n")
+        stream.flush()
+        self._lines.clear()
+
+    def _duel_rolled(self, event: DuelRolled) -> Optional[str]:
+        """Rolls of both sides, only when asked for"""
+        if not self.show_rolls:
+            return None
+
+        return f"{event.attacker} rolled: [{', '.join(map(str, event.attacker_rolls))}]\n" \
+               f"{event.defender} rolled: [{', '.join(map(str, event.defender_rolls))}]"
+
+
+class JsonlSink:
+    enabled = True
+
+    def __init__(self, stream: TextIO):
+        """
+        Log every event as a JSON object on its own line
+
+        :param stream: Open text file receiving the log
+        :type stream: TextIO
+        """
+        # json is only imported by games that log their events
+        from json import dumps
+
+        self._dumps = dumps
+        self._stream = stream
+        self._lines: List[str] = []
+
+    def emit(self, event: tuple) -> None:
+        """
+        Serialize the event and keep it until the next flush
+
+        :param event: Event emitted by the game
+        :return: None
+        """
+        record = {"event": type(event).__name__}
+        record.update(event._asdict())
+        self._lines.append(self._dumps(record))
+
+    def flush(self) -> None:
+        """
+        Write the buffered records
+
+        :return: None
+        """
+        if self._lines:
+            self._stream.write("\n".join(self._lines) + "\n")
+            self._lines.clear()
+
+
+class TeeSink:
+    def __init__(self, *sinks):
+        """
+        Send every event to each of the sinks that are enabled
+
+        :param sinks: Sinks receiving the events
+        """
+        self._sinks = tuple(sink for sink in sinks if sink.enabled)
+        self.enabled = bool(self._sinks)
+
+    def emit(self, event: tuple) -> None:
+        for sink in self._sinks:
+            sink.emit(event)
+
+    def flush(self) -> None:
+        for sink in self._sinks:
+            sink.flush()
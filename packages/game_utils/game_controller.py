@@ -2,33 +2,75 @@
 Module is responsible for the game logic. All in game interactions occur here
 """
 from collections import namedtuple
-from json import load
-from pathlib import Path
-from random import choice, random
-from textwrap import wrap
-from typing import List
+from functools import lru_cache
+from os.path import exists, join
+from random import Random, getrandbits
+from typing import TYPE_CHECKING, Callable, Generator, List, Optional, Tuple
 
+from packages.characters.effects import Effect
 from packages.characters.hero import Hero
-from packages.environments.consumable_loot import ConsumableLoot
-from packages.environments.environment import Environment
+from packages.environments.loot import Loot
 from packages.game_utils.cli_display import display_no_combat_init, display_hero_bag, display_no_loot, display_battle, \
-    display_boarder_attack, display_boarder_attack_end, display_no_combat_start
-from packages.game_utils.combat_functions import duel
-from packages.game_utils.utils import get_user_input
+    display_boarder_attack, display_boarder_attack_end, display_no_combat_start, display_description, \
+    display_message, FrameRenderer, SCREEN
+from packages.game_utils.data_bundle import BUNDLE, ROOT_DIR
+from packages.game_utils.events import RoomEntered, TerminalRenderer
+from packages.game_utils.policies import HumanPolicy, Policy, Prompt, PromptEnum
+
+if TYPE_CHECKING:
+    # rooms, monsters and combat are imported with the first room, the start menu does not need them
+    from packages.environments.environment import Environment
 
 ENV_FILE = "data/.dd_environments"
 EnvironmentRecord = namedtuple("EnvironmentRecord", "name, desc, habitable")
+# failing to run away costs two dice until the end of the round
+RUN_AWAY_PENALTY = Effect("Run Away Penalty", dice_count=-2)
+
+
+class GameOver(Exception):
+    """Raised in place of exiting the process by sessions that do not own it, headless games and server sessions"""
 
 
 class DungeonDudes:
-    def __init__(self, username: str, show_dice=True):
+    def __init__(self, username: str, show_dice=True, start: bool = True, seed: Optional[int] = None,
+                 rng: Optional[Random] = None, sink=None, recorder=None, save_path: Optional[str] = None,
+                 policy: Optional[Policy] = None, screen: Optional[FrameRenderer] = None):
+        """
+        Create the game session
+
+        :param username: Name of the hero
+        :param show_dice: Display the combat rolls of each duel
+        :param start: Start the game loop immediately. Subclasses that drive the game themselves pass False
+        :param seed: Seed of the game. The same seed and decisions always replay the same game
+        :param rng: Generator shared by every random event of the game, takes precedence over the seed. Any object
+            implementing random, randint, choice and getrandbits can be used, see dice.PCG64Random
+        :param sink: Receives the combat and room events, defaults to a TerminalRenderer. See events
+        :param recorder: Receives the seed and decisions of the game once it is over, see replay.ReplayWriter
+        :param save_path: File the game is saved to after every room, see snapshot
+        :param policy: Takes every decision of the game, defaults to the player at the keyboard. See policies
+        :param screen: Where the panels of the game are drawn, defaults to the terminal
+        """
+        if seed is None and rng is None:
+            # draw the seed ourselves so the game can be recorded and replayed
+            seed = getrandbits(64)
+
         self._level = 1
-        self.hero = Hero(username)
+        self.seed = seed
+        self.rng = Random(seed) if rng is None else rng
+        self.recorder = recorder
+        self.decisions: Optional[List[int]] = None if recorder is None else []
+        self.save_path = save_path
+        self.policy = HumanPolicy() if policy is None else policy
+        self.hero = Hero(username, self.rng)
         self.environment_template = _get_environments()
+        # room being played, exposed to the policy
+        self.environment: Optional["Environment"] = None
         self._initial = True
-        self._show_dice = show_dice
+        self.screen = SCREEN if screen is None else screen
+        self.sink = TerminalRenderer(show_dice, self.screen) if sink is None else sink
         self._buffs = []
-        self.run_game()
+        if start:
+            self.run_game()
 
     @property
     def level(self) -> int:
@@ -44,163 +86,265 @@ class DungeonDudes:
 
     def run_game(self) -> None:
         """
-        Run game handles the initial welcoming screen. Control is then handed off the the load_map method
+        Run game handles the initial welcoming screen. Control is then handed off the the load_map method. Every
+        decision of the game is asked to the policy
         :return: None
         """
+        steps = self.steps()
+        try:
+            prompt = next(steps)
+            while True:
+                try:
+                    decision = self._decide(prompt.kind, prompt.choices)
+                except KeyboardInterrupt as interrupt:
+                    # raised where the game is waiting, so the game handles it like any other interruption
+                    prompt = steps.throw(interrupt)
+                else:
+                    prompt = steps.send(decision)
+        except StopIteration:
+            pass
+
+    def steps(self) -> Generator[Prompt, int, None]:
+        """
+        The game as a generator. The game runs until it needs a decision, yields the prompt and resumes with the
+        decision sent back. run_game drives it with the policy, the server with a remote player
+
+        :return: Generator of prompts receiving the decisions
+        """
         decision = 0
         if self._initial:
             self._initial = False
             while decision != 1:
                 try:
-                    display_no_combat_init(self.hero)
-                    decision = get_user_input([1, 2, -1])
+                    self._display(display_no_combat_init, self.hero)
+                    decision = yield Prompt(PromptEnum.START, [1, 2, -1])
                     if decision == -1:
                         self._quit()
                     elif decision == 2:
-                        self._show_bag()
+                        yield from self._show_bag()
                     else:
                         break
                 except KeyboardInterrupt:
-                    print("[!] If you want to quit, use the provided user interface")
+                    self._display(display_message, "[!] If you want to quit, use the provided user interface")
 
-        while not self.hero.is_dead:
+        while self._playing():
             try:
-                self._load_map()
+                yield from self._load_map()
+                self._checkpoint()
             except KeyboardInterrupt:
-                print("[!] If you want to quit, use the provided user interface")
+                self._display(display_message, "[!] If you want to quit, use the provided user interface")
+
+    def _playing(self) -> bool:
+        """Keep loading rooms while this holds"""
+        return not self.hero.is_dead
+
+    def _decide(self, prompt: PromptEnum, choices: List[int]) -> int:
+        """
+        Single decision point of the game. Every choice the player makes is requested through here
+
+        :param prompt: Which screen is asking for the decision
+        :param choices: Valid choices for the screen
+        :return: The chosen option
+        """
+        self.sink.flush()
+        return self._record(self._choose(prompt, choices))
+
+    def _choose(self, prompt: PromptEnum, choices: List[int]) -> int:
+        """Ask the policy for a decision"""
+        return self.policy.decide(self, prompt, choices)
+
+    def _record(self, decision: int) -> int:
+        """Keep the decision for the replay log, when the game is recorded"""
+        if self.decisions is not None:
+            self.decisions.append(decision)
+        return decision
+
+    def _display(self, display: Callable, *args) -> None:
+        """Render a panel or message to the screen of the player, after the events emitted so far"""
+        self.sink.flush()
+        display(*args, screen=self.screen)
+
+    def _pause(self) -> None:
+        """Wait for the player to acknowledge the last message"""
+        self.sink.flush()
+        self.screen.read("Press any key to continue...")
 
     def _quit(self) -> None:
         """
         Called when the use quits or the user dies
         """
-        self._show_bag(True)
+        self._show_final_bag()
+        self._save_record()
         print("Thanks for playing!")
         exit()
 
-    def _load_map(self):
+    def _checkpoint(self) -> None:
+        """Save the game once a room is over, when asked to"""
+        if self.save_path is not None:
+            # only games that are saved pay for importing the snapshots
+            from packages.game_utils.snapshot import save
+            save(self, self.save_path)
+
+    def _save_record(self) -> None:
+        """Hand the game over to the recorder, only once"""
+        if self.recorder is not None:
+            self.recorder.write(self)
+            self.recorder = None
+
+    def _record_settings(self) -> dict:
+        """Arguments of HeadlessDungeonDudes needed to replay the game, an interactive game uses the defaults"""
+        return {}
+
+    def _load_map(self) -> Generator[Prompt, int, None]:
         """Responsible for loading the map for the player"""
-        map = choice(self.environment_template)
-        environment = Environment(map.name, map.desc, map.habitable, self.level)
+        from packages.environments.environment import Environment
+
+        map = self.rng.choice(self.environment_template)
+        environment = Environment(map.name, map.desc, map.habitable, self.level, self.rng)
+        self.environment = environment
+        if self.sink.enabled:
+            self.sink.emit(RoomEntered(map.name, self.level, environment.monster_ctrl.monster_count,
+                                       environment.initiative.name))
 
         # Display map description
-        description = environment.description.format(noise=environment.monster_ctrl.monsters[0].noise)
-        description = "\n".join(wrap(description, width=80, fix_sentence_endings=True, initial_indent="  ",
-                                subsequent_indent="  ", break_long_words=False))
-        print("\n", description, "\n")
-        input("Press any key to continue...")
+        self._display(display_description, environment)
+        self._pause()
 
         initiative_monster = "Monster has" if environment.monster_ctrl.monster_count == 1 else "Monsters have"
         first_attacker = "Hero has" if environment.initiative.value == 0 else initiative_monster
 
         while environment.monster_ctrl.monster_count > 0:
-            display_battle(self.hero, environment, first_attacker)
-            decision = get_user_input([1, 2, 3])
+            self._display(display_battle, self.hero, environment, first_attacker)
+            decision = yield Prompt(PromptEnum.BATTLE, [1, 2, 3])
             if decision == 1:
                 self._duels(environment)
 
             elif decision == 2:
-                self._show_bag()
+                yield from self._show_bag()
 
             else:
-                if random() < self.hero.health * .1:
-                    print("[+] Successfully ran away!")
-                    input("Press any key to continue...")
+                if self.rng.random() < self.hero.health * .1:
+                    self._display(display_message, "[+] Successfully ran away!")
+                    self._pause()
                     return
                 else:
-                    print("[!] Bummer, you failed to run away. You loss two dice rolls on your next attack.")
-                    input("Press any key to continue...")
-                    self.hero.dice_count -= 2
+                    self._display(display_message, "[!] Bummer, you failed to run away. You loss two dice rolls on "
+                                                   "your next attack.")
+                    self._pause()
+                    self.hero.add_buff(RUN_AWAY_PENALTY)
                     self._duels(environment)
 
         self.level += 1
-        display_no_combat_start(self.hero, environment)
+        self._display(display_no_combat_start, self.hero, environment)
 
         decision = 0
         # Keep iterating until user decides to move on
         while decision != 1:
             if environment.has_loot:
-                decision = get_user_input([1, 2, 3, -1])
+                decision = yield Prompt(PromptEnum.AFTER_ROOM, [1, 2, 3, -1])
             else:
-                decision = get_user_input([1, 2, -1])
+                decision = yield Prompt(PromptEnum.AFTER_ROOM, [1, 2, -1])
 
             if decision == -1:
                 self._quit()
             elif decision == 2:
-                self._show_bag()
-                display_no_combat_start(self.hero, environment)
+                yield from self._show_bag()
+                self._display(display_no_combat_start, self.hero, environment)
             elif decision == 3:
-                print("[+] Looted")
-                for loot in environment.loot_room():
-                    self.hero.set_loot(loot)
-                display_no_combat_start(self.hero, environment)
+                self._display(display_message, "[+] Looted")
+                self._pick_up_loot(environment)
+                self._display(display_no_combat_start, self.hero, environment)
             else:
                 return
 
-    def _duels(self, environment: Environment):
+    def _pick_up_loot(self, environment: "Environment") -> None:
+        """Move the loot dropped in the environment into the bag of the hero"""
+        self.hero.add_loot_many(environment.loot_room())
+
+    def _duels(self, environment: "Environment"):
         """Responsible for performing the actual duels between attacker and defender"""
-        display_boarder_attack()
+        # looked up on its module every round, so the profiler can time it
+        from packages.game_utils.combat_functions import duel
+
+        self._display(display_boarder_attack)
         for monster in environment.monster_ctrl.monsters:
             if environment.initiative.value == 0:
-                duel(self.hero, monster, environment, self._show_dice)
+                duel(self.hero, monster, environment, self.sink)
                 environment.monster_ctrl.clean_up()
                 if monster.is_dead:
                     continue
-                duel(monster, self.hero, environment, self._show_dice)
+                duel(monster, self.hero, environment, self.sink)
                 if self.hero.is_dead:
                     self._quit()
             else:
-                duel(monster, self.hero, environment, self._show_dice)
+                duel(monster, self.hero, environment, self.sink)
                 if self.hero.is_dead:
                     self._quit()
-                duel(self.hero, monster, environment, self._show_dice)
+                duel(self.hero, monster, environment, self.sink)
                 environment.monster_ctrl.clean_up()
 
-        display_boarder_attack_end()
+        self._display(display_boarder_attack_end)
         environment.round += 1
-        if self.hero.dice_count == 1:
-            self.hero.dice_count = 3
         self.hero.clear_buffs()
 
-    def _show_bag(self, exiting: bool = False):
-        """Display the users bag"""
-        self.hero.cleanup_bag()
-        if self.hero.has_loot:
-            junk = [loot for loot in self.hero.loot if not isinstance(loot, ConsumableLoot)]
-            consumable = [loot for loot in self.hero.loot if isinstance(loot, ConsumableLoot)]
+    def _show_bag(self) -> Generator[Prompt, int, None]:
+        """Display the users bag and let them consume a potion"""
+        consumable = self._display_bag(False)
+        if consumable is None:
+            return
 
-            display_hero_bag(self.hero, junk, consumable, exiting)
-            if exiting:
-                return
+        options = [index for index in range(0, len(consumable))]
+        options.append(-1)
+        decision = yield Prompt(PromptEnum.BAG, options)
+        if decision != -1:
+            self.hero.consume_loot(consumable[decision])
 
-            options = [index for index in range(0, len(consumable))]
-            options.append(-1)
-            decision = get_user_input(options)
-            if decision == -1:
-                return
-            else:
-                self.hero.consume_loot(consumable[decision])
+    def _show_final_bag(self) -> None:
+        """Display the users bag when the game is over"""
+        self._display_bag(True)
 
-        else:
-            display_no_loot()
+    def _display_bag(self, exiting: bool) -> Optional[List[Loot]]:
+        """Display the users bag, returns the consumables or None when the bag is empty"""
+        self.hero.cleanup_bag()
+        if not self.hero.has_loot:
+            self._display(display_no_loot)
+            return None
 
+        consumable = self.hero.consumables
+        self._display(display_hero_bag, self.hero, self.hero.junk, consumable, exiting)
+        return consumable
 
-def _get_environments() -> List[EnvironmentRecord]:
-    """Load the environments from disk to a namedtuple for easy access"""
-    env_path = Path(__file__).parent.resolve().parents[1] / Path(ENV_FILE)
 
-    if not env_path.exists():
+@lru_cache(maxsize=None)
+def _get_environments() -> Tuple[EnvironmentRecord, ...]:
+    """
+    Load the environments from the data bundle to a namedtuple for easy access. The catalogue is only read once per
+    process
+    """
+    env_path = join(ROOT_DIR, ENV_FILE)
+
+    if not exists(env_path):
         raise FileNotFoundError(f"Program requires the environments file to function. Expect "
-                                f"file in\n{env_path.as_posix()}")
+                                f"file in\n{env_path}")
+
+    # records are shared by every session, keep them immutable
+    return tuple(EnvironmentRecord(*record) for record in BUNDLE.load(env_path, _parse_environments))
+
+
+def _parse_environments(text: str) -> Tuple[Tuple, ...]:
+    """Environments of the file as plain tuples, so they can be bundled"""
+    # json is only needed when the bundle is stale
+    from json import loads
 
     environments = []
     try:
-        with env_path.open("rt", encoding="utf-8") as infile:
-            json = load(infile)
-            for environment in json["environments"]:
-                environments.append(EnvironmentRecord(**environment))
+        for environment in loads(text)["environments"]:
+            habitable = environment.get("habitable")
+            environments.append((environment["name"], environment["desc"],
+                                 None if habitable is None else tuple(habitable)))
     except KeyError as error:
         print(f"Key \"{error}\" not found. Invalid file format")
         exit(-1)
 
-    return environments
+    return tuple(environments)
 
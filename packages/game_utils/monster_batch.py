@@ -0,0 +1,242 @@
+"""
+Module holds an array backed alternative to the list of Monster objects kept by MonsterController.
+
+MonsterBatch stores the monsters of a room as a struct of arrays: health, dice count and kind in contiguous arrays
+and the dead monsters in a byte mask. Hits are applied by index or by mask and dead monsters are only compacted out
+once per round, in a single pass, instead of sorting the list after every kill. Large high level rooms can be resolved
+without allocating a Monster, its loot and its combat rolls per spawn.
+"""
+from array import array
+from itertools import compress
+from math import ceil
+from random import Random
+from typing import Iterator, Optional, Sequence, Tuple
+
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.environments.environment import InitiativeEnum
+from packages.game_utils.combat_functions import rolls_hit
+from packages.game_utils.monster_controller import EnvironmentRecord, MonsterController, MonsterRecords, \
+    _habitable_monsters
+from packages.game_utils.utils import get_rng
+
+
+class MonsterBatch:
+    def __init__(self, kinds: Sequence[MonsterRecords], spawns: Sequence[int], rng: Optional[Random] = None):
+        """
+        Create the batch from the kinds of monster in the room and the kind of every spawned monster
+
+        :param kinds: Records of the monsters that may appear in the batch
+        :type kinds: Sequence[MonsterRecords]
+        :param spawns: Index into kinds of every monster, in fighting order
+        :type spawns: Sequence[int]
+        :param rng: Generator used for the combat rolls of the monsters
+        :type rng: Optional[Random]
+        """
+        self._rng = get_rng(rng)
+        self._kinds = tuple(kinds)
+        self._kind = array("H", spawns)
+        self._health = array("i", (self._kinds[kind].health for kind in spawns))
+        self._dice_count = array("B", (self._kinds[kind].dice_count for kind in spawns))
+        self._dead = bytearray(len(self._kind))
+        self._monster_count = len(self._kind)
+
+    @classmethod
+    def spawn(cls, environment: EnvironmentRecord, rng: Optional[Random] = None) -> "MonsterBatch":
+        """
+        Spawn the monsters of a room following the rules of MonsterController: ceil(level / 2) monsters picked from the
+        habitat, strongest first
+
+        :param environment: Level and habitat of the room
+        :param rng: Generator used for the spawns and the combat rolls
+        :return: Batch of the spawned monsters
+        :rtype: MonsterBatch
+        """
+        rng = get_rng(rng)
+        kinds = _habitable_monsters(environment)
+        spawns = [rng.choice(range(0, len(kinds))) for _ in range(0, ceil(environment.level / 2))]
+
+        def _key(kind: int):
+            val = kinds[kind].health + kinds[kind].dice_count
+            if kinds[kind].noise:
+                val *= 3
+            return val
+
+        spawns.sort(key=_key, reverse=True)
+        return cls(kinds, spawns, rng)
+
+    @classmethod
+    def from_controller(cls, controller: MonsterController, rng: Optional[Random] = None) -> "MonsterBatch":
+        """
+        Pack the monsters that are alive in a MonsterController
+
+        :param controller: Controller of the room
+        :param rng: Generator used for the combat rolls of the monsters
+        :return: Batch holding the same monsters in the same order
+        :rtype: MonsterBatch
+        """
+        kinds = {}
+        spawns = []
+        for monster in controller.monsters:
+            if monster.is_dead:
+                continue
+            record = MonsterRecords(monster.name, monster.health, monster.dice_count, monster.noise)
+            spawns.append(kinds.setdefault(record, len(kinds)))
+
+        return cls(tuple(kinds), spawns, rng)
+
+    def __len__(self):
+        return len(self._kind)
+
+    @property
+    def monster_count(self) -> int:
+        """
+        Get the amount of monsters alive in the batch. When set to zero, all monsters are dead
+
+        :return: Number of monsters
+        :rtype: int
+        """
+        return self._monster_count
+
+    @property
+    def health(self) -> array:
+        """
+        :return: Health of every monster, dead monsters included until the next clean up
+        :rtype: array
+        """
+        return self._health
+
+    @property
+    def dice_count(self) -> array:
+        """
+        :return: Dice count of every monster, dead monsters included until the next clean up
+        :rtype: array
+        """
+        return self._dice_count
+
+    @property
+    def dead(self) -> bytearray:
+        """
+        :return: Mask of the dead monsters, 1 for dead
+        :rtype: bytearray
+        """
+        return self._dead
+
+    def record(self, index: int) -> MonsterRecords:
+        """
+        Current stats of a monster
+
+        :param index: Position of the monster in the batch
+        :return: Record with the current health of the monster
+        :rtype: MonsterRecords
+        """
+        return self._kinds[self._kind[index]]._replace(health=self._health[index])
+
+    def alive(self) -> Iterator[int]:
+        """
+        :return: Positions of the monsters that are alive
+        :rtype: Iterator[int]
+        """
+        return compress(range(0, len(self._kind)), (not dead for dead in self._dead))
+
+    def hit(self, index: int, damage: int = 1) -> bool:
+        """
+        Deal damage to a single monster and mark it dead if its health drops below 1
+
+        :param index: Position of the monster in the batch
+        :param damage: Damage dealt
+        :return: Bool indicating the monster died from the hit
+        :rtype: bool
+        :raises ValueError: If the monster is already dead
+        """
+        if self._dead[index]:
+            raise ValueError("Character is already dead")
+
+        self._health[index] -= damage
+        if self._health[index] < 1:
+            self._dead[index] = 1
+            self._monster_count -= 1
+            return True
+        return False
+
+    def apply_hits(self, mask: Sequence[bool], damage: int = 1) -> int:
+        """
+        Deal damage to every living monster selected by the mask
+
+        :param mask: One entry per monster in the batch, truthy entries are hit
+        :param damage: Damage dealt to each selected monster
+        :return: Number of monsters killed
+        :rtype: int
+        """
+        killed = 0
+        for index in compress(range(0, len(self._kind)), mask):
+            if not self._dead[index]:
+                killed += self.hit(index, damage)
+        return killed
+
+    def clean_up(self) -> None:
+        """
+        Remove the dead monsters from the arrays in a single pass, keeping the fighting order
+
+        :return: None
+        """
+        if self._monster_count == len(self._kind):
+            return
+
+        alive = [not dead for dead in self._dead]
+        self._kind = array("H", compress(self._kind, alive))
+        self._health = array("i", compress(self._health, alive))
+        self._dice_count = array("B", compress(self._dice_count, alive))
+        self._dead = bytearray(len(self._kind))
+
+    def resolve_round(self, hero: Hero, initiative: InitiativeEnum) -> int:
+        """
+        Fight a round of duels the same way DungeonDudes._duels does, including skipping the monster that follows
+        a monster killed by the hero and clearing the buffs of the hero once the round is over. Monsters drop no loot
+        in a batch
+
+        :param hero: Hero fighting the room
+        :param initiative: Side attacking first
+        :return: Number of monsters killed during the round
+        :rtype: int
+        """
+        self.clean_up()
+        killed = 0
+        skip = False
+        for index in range(0, len(self._kind)):
+            if skip or self._dead[index]:
+                skip = False
+                continue
+
+            if initiative == InitiativeEnum.MONSTER:
+                self._attack_hero(hero, index)
+                if hero.is_dead:
+                    break
+
+            hero.combat_roll()
+            if rolls_hit(hero.combat_rolls, self._roll(index)):
+                skip = self.hit(index, hero.damage)
+                killed += skip
+                if skip:
+                    continue
+
+            if initiative == InitiativeEnum.HERO:
+                self._attack_hero(hero, index)
+                if hero.is_dead:
+                    break
+
+        self.clean_up()
+        hero.clear_buffs()
+        return killed
+
+    def _attack_hero(self, hero: Hero, index: int) -> None:
+        """Duel where the monster at index attacks the hero"""
+        hero.combat_roll()
+        if rolls_hit(self._roll(index), hero.combat_rolls):
+            hero.takes_hit(Monster.DEFAULT_DAMAGE)
+
+    def _roll(self, index: int) -> Tuple[int, ...]:
+        """Combat rolls of the monster at index, in descending order"""
+        randint = self._rng.randint
+        return tuple(sorted((randint(1, Monster.DEFAULT_DIE_SIDES) for _ in range(0, self._dice_count[index])),
+                            reverse=True))
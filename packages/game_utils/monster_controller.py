@@ -2,13 +2,15 @@
 Module controls spawning the correct creatures for the environment
 """
 from collections import namedtuple
-import csv
 from math import ceil
 from pathlib import Path
-from random import choice
-from typing import List
+from random import Random
+from time import monotonic
+from typing import Dict, FrozenSet, List, Optional, Tuple
 
 from packages.characters.monster import Monster
+from packages.game_utils.data_bundle import BUNDLE, DataBundle
+from packages.game_utils.utils import get_rng
 
 MONSTER_FILE = "data/.dd_monsters"
 MonsterRecords = namedtuple("MonsterRecord", "name, health, dice_count, noise")
@@ -16,15 +18,18 @@ EnvironmentRecord = namedtuple("EnvironmentRecord", "level, habitable")
 
 
 class MonsterController:
-    def __init__(self, environment: EnvironmentRecord):
+    def __init__(self, environment: EnvironmentRecord, rng: Optional[Random] = None):
         """
         MonsterController spawns the monsters for the environment. Environments have dedicated monsters that spawn
         in them. MC will spawn at random, times a level modifier, the monsters that inhabit the environment
 
         :param environment: namedtuple containing information from the Environment
         :type environment: EnvironmentRecord(namedtuple)
+        :param rng: Generator used to pick the monsters, shared with the spawned monsters
+        :type rng: Optional[Random]
         """
         self.env = environment
+        self._rng = get_rng(rng)
         self._monster_count = None
         self._monsters: List[Monster] = []
         self._habitable_monsters = _habitable_monsters(self.env)
@@ -56,28 +61,19 @@ class MonsterController:
 
         :return: None
         """
-        def _key(item: Monster):
-            if item.is_dead:
-                return 1
-            return 0
-
-        # put the dead monsters at the end of the list
-        self._monsters.sort(key=_key)
-
-        # Pop the dead
-        for index, creature in reversed(list(enumerate(self._monsters))):
-            if creature.is_dead:
-                monster = self._monsters.pop(index)
-                self._monster_count -= 1
+        # Filter the dead in a single pass. The list is updated in place since _duels iterates over it while cleaning up
+        alive = [creature for creature in self._monsters if not creature.is_dead]
+        self._monster_count -= len(self._monsters) - len(alive)
+        self._monsters[:] = alive
 
     def _spawn_monsters(self):
         """Generate monsters based on environment level and habitat"""
         self._monsters = []
         self._monster_count = ceil(self.env.level / 2)
         for spawn in range(0, self.monster_count):
-            monster = choice(self._habitable_monsters)
+            monster = self._rng.choice(self._habitable_monsters)
             self._monsters.append(
-                Monster(monster.name, int(monster.health), int(monster.dice_count), monster.noise)
+                Monster(monster.name, monster.health, monster.dice_count, monster.noise, self._rng)
             )
 
         def _key(item: Monster):
@@ -89,46 +85,134 @@ class MonsterController:
         self._monsters.sort(key=_key, reverse=True)
 
 
-def _habitable_monsters(environment: EnvironmentRecord) -> List[MonsterRecords]:
+class MonsterRegistry:
+    CHECK_INTERVAL = 1.0
+
+    def __init__(self, path: Path, bundle: Optional[DataBundle] = None):
+        """
+        Monster records loaded once from disk. Records are indexed by lowercased name and the habitable list of every
+        environment is resolved only once. The file is loaded again only when its modification time changes, which is
+        checked at most every CHECK_INTERVAL seconds so spawning a room does no file I/O
+
+        :param path: Path of the monster file
+        :type path: Path
+        :param bundle: Precompiled bundle the parsed file is cached in, None parses the file on every load
+        :type bundle: Optional[DataBundle]
+        """
+        self.path = path
+        self.bundle = bundle
+        self._mtime = None
+        self._checked = None
+        self._monsters: Tuple[MonsterRecords, ...] = ()
+        self._by_name: Dict[str, List[MonsterRecords]] = {}
+        self._by_habitat: Dict[FrozenSet[str], Tuple[MonsterRecords, ...]] = {}
+
+    @property
+    def monsters(self) -> Tuple[MonsterRecords, ...]:
+        """
+        Every monster record in the order of the file
+
+        :return: Monster records
+        :rtype: Tuple[MonsterRecords, ...]
+        """
+        self._refresh()
+        return self._monsters
+
+    def get(self, name: str) -> List[MonsterRecords]:
+        """
+        Look up the records of a monster by name, regardless of case
+
+        :param name: Name of the monster
+        :return: Records with that name, empty if none exist
+        :rtype: List[MonsterRecords]
+        """
+        self._refresh()
+        return self._by_name.get(name.lower(), [])
+
+    def habitable(self, habitable: Optional[List[str]]) -> Tuple[MonsterRecords, ...]:
+        """
+        Returns the monsters that inhabit an environment. If none are found, return every monster
+
+        :param habitable: Names of the monsters living in the environment, None for any monster
+        :return: Monster records
+        :rtype: Tuple[MonsterRecords, ...]
+        """
+        self._refresh()
+        if habitable is None:
+            return self._monsters
+
+        key = frozenset(creature.lower() for creature in habitable)
+        monsters = self._by_habitat.get(key)
+        if monsters is None:
+            monsters = tuple(monster for monster in self._monsters if monster.name.lower() in key)
+
+            # If no matches are found, return the whole repo
+            if not monsters:
+                monsters = self._monsters
+            self._by_habitat[key] = monsters
+
+        return monsters
+
+    def _refresh(self) -> None:
+        """Reload the file if it changed since the last load"""
+        now = monotonic()
+        if self._checked is not None and now - self._checked < MonsterRegistry.CHECK_INTERVAL:
+            return
+        self._checked = now
+
+        mtime = self.path.stat().st_mtime_ns if self.path.exists() else None
+        if mtime != self._mtime or not self._monsters:
+            self._mtime = mtime
+            self._load()
+
+    def _load(self) -> None:
+        """Parse the monster file and rebuild the indexes"""
+        if self.path.exists():
+            if self.bundle is None:
+                records = _parse_monsters(self.path.read_text(encoding="utf-8"), self.path.name)
+            else:
+                records = self.bundle.load(self.path, lambda text: _parse_monsters(text, self.path.name))
+            monster_repo = [MonsterRecords(*record) for record in records]
+
+        else:
+            monster_repo = (
+                MonsterRecords("Imp", 1, 1, None),
+                MonsterRecords("BigImp", 2, 1, "roarrrr"),
+                MonsterRecords("Mad Cow", 3, 1, "Mooooo"),
+                MonsterRecords("Mad Cow", 3, 3, None),
+            )
+
+        self._monsters = tuple(monster_repo)
+        self._by_name = {}
+        for monster in self._monsters:
+            self._by_name.setdefault(monster.name.lower(), []).append(monster)
+        self._by_habitat = {}
+
+
+MONSTER_REGISTRY = MonsterRegistry(Path(__file__).parent.resolve().parents[1] / Path(MONSTER_FILE), BUNDLE)
+
+
+def _habitable_monsters(environment: EnvironmentRecord) -> Tuple[MonsterRecords, ...]:
     """Returns the list of monsters that inhabit an environment. If none are found, return monsters at random"""
-    monster_path = Path(__file__).parent.resolve().parents[1] / Path(MONSTER_FILE)
-    monster_repo = []
-
-    if monster_path.exists():
-        with monster_path.open("rt", encoding="utf-8") as infile:
-
-            # check if the header is included, if it is, the seek will be set to the next line
-            line = infile.readline()
-            if not line.startswith("Name,StartHealth,DiceCount,MonsterNoise"):
-                infile.seek(0)
-
-            reader = csv.reader(infile)
-            try:
-                for creature in map(MonsterRecords._make, reader):
-                    monster_repo.append(creature)
-            except TypeError:
-                print(f"Invalid read line detected in {monster_path.name}. Skipping line...")
-
-    else:
-        monster_repo = (
-            MonsterRecords("Imp", 1, 1, None),
-            MonsterRecords("BigImp", 2, 1, "roarrrr"),
-            MonsterRecords("Mad Cow", 3, 1, "Mooooo"),
-            MonsterRecords("Mad Cow", 3, 3, None),
-        )
-
-    habitable_monsters = []
-
-    # If environment does not specify a list of creatures, then return the whole list
-    if environment.habitable is None:
-        habitable_monsters = monster_repo[:]
-    else:
-        for monster in monster_repo:
-            if monster.name.lower() in (creature.lower() for creature in environment.habitable):
-                habitable_monsters.append(monster)
-
-    # If no matches are found, return the whole repo
-    if not habitable_monsters:
-        habitable_monsters = monster_repo[:]
-
-    return habitable_monsters
+    return MONSTER_REGISTRY.habitable(environment.habitable)
+
+
+def _parse_monsters(text: str, name: str) -> Tuple[Tuple, ...]:
+    """Monster records of the file as plain tuples, so they can be bundled"""
+    # csv is only needed when the bundle is stale
+    import csv
+
+    lines = text.splitlines()
+    # skip the header when it is included
+    if lines and lines[0].startswith("Name,StartHealth,DiceCount,MonsterNoise"):
+        lines = lines[1:]
+
+    records = []
+    for row in csv.reader(lines):
+        try:
+            monster, health, dice_count, noise = row
+            records.append((monster, int(health), int(dice_count), noise))
+        except (TypeError, ValueError):
+            print(f"Invalid read line detected in {name}. Skipping line...")
+
+    return tuple(records)
@@ -0,0 +1,178 @@
+"""
+Module defines the decision makers that can play the game in place of a human at the keyboard
+
+Classes
+-------
+    PromptEnum:
+        Identifies which screen of the game is asking for a decision
+    Policy:
+        Abstract class that all automated players inherit from
+    GreedyPolicy:
+        Always fights, always loots and never touches the bag
+    HumanPolicy:
+        Asks the player at the keyboard
+    RandomPolicy:
+        Picks any of the choices, never quits
+    ThresholdPolicy:
+        Greedy, but runs away once the health of the hero drops to a threshold
+    ExpectedValuePolicy:
+        Uses the exact survival odds of the room to decide between fighting, drinking a consumable and running away
+"""
+from abc import ABC, abstractmethod
+from collections import namedtuple
+from enum import Enum
+from functools import partial
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from packages.characters.hero import Hero
+from packages.game_utils.cli_display import display_message
+from packages.game_utils.utils import get_user_input
+
+if TYPE_CHECKING:
+    from packages.environments.environment import Environment
+
+
+class PromptEnum(Enum):
+    START = 0
+    BATTLE = 1
+    BAG = 2
+    AFTER_ROOM = 3
+
+
+# decision the game is waiting for, see DungeonDudes.steps
+Prompt = namedtuple("Prompt", "kind, choices")
+
+
+class Policy(ABC):
+    @abstractmethod
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        """
+        Choose one of the options the game is offering
+
+        :param game: The DungeonDudes session asking for the decision
+        :param prompt: Which screen is asking for the decision
+        :type prompt: PromptEnum
+        :param choices: Valid choices for the screen
+        :type choices: List[int]
+        :return: One of the choices
+        :rtype: int
+        """
+        pass
+
+
+class GreedyPolicy(Policy):
+    """Always fight, pick up every piece of loot and move on to the next environment"""
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        if prompt == PromptEnum.BAG:
+            return -1
+
+        if prompt == PromptEnum.AFTER_ROOM and 3 in choices:
+            return 3
+
+        return 1
+
+
+class HumanPolicy(Policy):
+    """The player at the keyboard, used by the interactive game"""
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        return get_user_input(choices, game.screen.read, partial(display_message, screen=game.screen))
+
+
+class RandomPolicy(Policy):
+    """Pick any of the choices with the generator of the game, so the game stays reproducible from its seed"""
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        return game.rng.choice([choice for choice in choices if choice != -1] or choices)
+
+
+class ThresholdPolicy(GreedyPolicy):
+    def __init__(self, health: int = 3):
+        """
+        Fight like GreedyPolicy until the hero is hurt, then try to run away from the room
+
+        :param health: The hero runs away once its health is at or below this value
+        :type health: int
+        :raises ValueError: If the threshold is not below the health of a new hero, the hero would never fight
+        """
+        if health >= Hero.DEFAULT_HEALTH:
+            raise ValueError(f"Health threshold must be below {Hero.DEFAULT_HEALTH}, got {health}")
+
+        self.health = health
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        if prompt == PromptEnum.BATTLE and game.hero.health <= self.health:
+            return 3
+
+        return super().decide(game, prompt, choices)
+
+
+class ExpectedValuePolicy(GreedyPolicy):
+    def __init__(self, risk: float = .9, margin: float = .02):
+        """
+        Compare the exact odds of surviving the room for each action. Consumables are only drunk while the odds are
+        below risk, one at a time, as long as the best of them raises the odds by more than margin. The hero runs away
+        when a fresh room of the same level, or failing to escape and fighting with the penalty, is safer by more
+        than margin than fighting on. Buffs only last a round but are counted for the whole room, which makes the
+        policy a little optimistic about consumables
+
+        :param risk: Survival odds below which consumables are used
+        :type risk: float
+        :param margin: Smallest gain in survival odds worth a consumable or running away
+        :type margin: float
+        """
+        self.risk = risk
+        self.margin = margin
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        environment = game.environment
+        if environment is None:
+            return super().decide(game, prompt, choices)
+
+        if prompt == PromptEnum.BATTLE:
+            return self._battle(game)
+
+        if prompt == PromptEnum.BAG:
+            index, _ = self._best_consumable(game.hero, environment)
+            return index if index in choices else -1
+
+        return super().decide(game, prompt, choices)
+
+    def _battle(self, game) -> int:
+        """Drink, fight or run away"""
+        # the solver is only imported by games played with this policy, it is not part of the start of the game
+        from packages.game_utils.survival import environment_survival_probability, hero_stats, \
+            room_survival_probability
+
+        hero, environment = game.hero, game.environment
+        stats = hero_stats(hero)
+        survival = environment_survival_probability(environment, stats)
+        if survival < self.risk:
+            index, odds = self._best_consumable(hero, environment)
+            if index is not None and odds > survival + self.margin:
+                return 2
+
+        # running away does not clear the level, it trades this room for a fresh one of the same level. Failing to
+        # run away costs two dice for the next round, the penalty is counted for the whole room
+        escape = min(1.0, hero.health * .1)
+        fresh = sum(room_survival_probability(game.level, env.habitable, stats)
+                    for env in game.environment_template) / len(game.environment_template)
+        penalized = stats._replace(dice_count=max(1, stats.dice_count - 2))
+        run_away = escape * fresh + (1 - escape) * environment_survival_probability(environment, penalized)
+        return 3 if run_away > survival + self.margin else 1
+
+    @staticmethod
+    def _best_consumable(hero, environment: "Environment") -> Tuple[Optional[int], float]:
+        """Index of the consumable giving the best odds of surviving the room, and those odds"""
+        from packages.game_utils.survival import HeroStats, environment_survival_probability
+
+        best, best_odds = None, -1.0
+        for index, loot in enumerate(hero.consumables):
+            health, stats = loot.preview(hero.health, hero.stats)
+            stats = HeroStats(health, stats.dice_count, stats.die_faces, stats.damage, stats.pierce_shot)
+            odds = environment_survival_probability(environment, stats)
+            if odds > best_odds:
+                best, best_odds = index, odds
+
+        return best, best_odds
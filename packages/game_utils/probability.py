@@ -0,0 +1,134 @@
+"""
+Module computes the exact odds of a duel instead of rolling for it.
+
+A duel sorts the rolls of both sides in descending order and compares them pairwise over the smaller dice count. The
+attacker hits on the first pair it wins, see combat_functions._is_attack_successful. Only the top rolls of each side
+take part, so the odds are computed from the exact distribution of the top rolls of each side. Every result is cached,
+making repeated look ups from simulations and the battle screen free.
+"""
+from functools import lru_cache
+from itertools import combinations_with_replacement
+from math import comb, factorial
+from typing import Dict, Iterable, Tuple
+
+from packages.characters.character_abstract import Character
+
+DEFAULT_DIE_SIDES = 6
+TableKey = Tuple[int, int, int, int]
+
+
+@lru_cache(maxsize=None)
+def duel_probability(attacker_dice: int, attacker_faces: int, defender_dice: int,
+                     defender_faces: int = DEFAULT_DIE_SIDES, attacker_pierce: bool = False,
+                     defender_pierce: bool = False) -> float:
+    """
+    Exact probability that the attacker lands a hit on the defender
+
+    :param attacker_dice: Number of dice the attacker rolls
+    :param attacker_faces: Number of faces on the attacker dice, doubled by LuckySeven
+    :param defender_dice: Number of dice the defender rolls
+    :param defender_faces: Number of faces on the defender dice
+    :param attacker_pierce: The attacker has PierceShot active, all of its dice land on the max value
+    :param defender_pierce: The defender has PierceShot active, all of its dice land on the max value
+    :return: Probability of a hit between 0 and 1
+    :rtype: float
+    :raises ValueError: When given less than 1 die or less than 1 face
+    """
+    if min(attacker_dice, attacker_faces, defender_dice, defender_faces) < 1:
+        raise ValueError("Duels require at least one die with at least one face on each side")
+
+    count = min(attacker_dice, defender_dice)
+    attacker = _top_rolls(attacker_dice, attacker_faces, count, attacker_pierce)
+    defender = _top_rolls(defender_dice, defender_faces, count, defender_pierce)
+
+    hits = 0
+    for attacker_rolls, attacker_ways in attacker:
+        for defender_rolls, defender_ways in defender:
+            if any(attack > defend for attack, defend in zip(attacker_rolls, defender_rolls)):
+                hits += attacker_ways * defender_ways
+
+    total = _outcomes(attacker_dice, attacker_faces, attacker_pierce) * \
+        _outcomes(defender_dice, defender_faces, defender_pierce)
+    # true division of ints is correctly rounded, same float as going through Fraction
+    return hits / total
+
+
+def hit_probability(attacker: Character, defender: Character) -> float:
+    """
+    Probability that the attacker lands a hit using the current dice, die faces and buffs of both characters
+
+    :param attacker: Character doing the attacking
+    :type attacker: Character
+    :param defender: Character doing the defending
+    :type defender: Character
+    :return: Probability of a hit between 0 and 1
+    :rtype: float
+    """
+    return duel_probability(attacker.dice_count, attacker.die_faces, defender.dice_count,
+                            defender.die_faces, getattr(attacker, "pierce_shot", False),
+                            getattr(defender, "pierce_shot", False))
+
+
+def probability_table(max_dice: int = 6, faces: Iterable[int] = (6, 12),
+                      max_defender_dice: int = 3) -> Dict[TableKey, float]:
+    """
+    Precompute the hit probabilities for every matchup of the game. The hero rolls up to max_dice dice with any of the
+    given faces, monsters roll up to max_defender_dice standard dice. Both directions of the duel are included
+
+    :param max_dice: Largest dice count of the hero
+    :param faces: Die faces the hero may have
+    :param max_defender_dice: Largest dice count of a monster
+    :return: Table keyed by (attacker dice, attacker faces, defender dice, defender faces)
+    :rtype: Dict[TableKey, float]
+    """
+    table = {}
+    for hero_faces in faces:
+        for hero_dice in range(1, max_dice + 1):
+            for monster_dice in range(1, max_defender_dice + 1):
+                table[(hero_dice, hero_faces, monster_dice, DEFAULT_DIE_SIDES)] = duel_probability(
+                    hero_dice, hero_faces, monster_dice, DEFAULT_DIE_SIDES)
+                table[(monster_dice, DEFAULT_DIE_SIDES, hero_dice, hero_faces)] = duel_probability(
+                    monster_dice, DEFAULT_DIE_SIDES, hero_dice, hero_faces)
+
+    return table
+
+
+def _outcomes(dice: int, faces: int, pierce: bool) -> int:
+    """Number of equally likely outcomes of a roll"""
+    return 1 if pierce else faces ** dice
+
+
+@lru_cache(maxsize=None)
+def _top_rolls(dice: int, faces: int, count: int, pierce: bool = False) -> Tuple[Tuple[Tuple[int, ...], int], ...]:
+    """
+    Distribution of the highest `count` rolls, in descending order, when rolling `dice` dice with `faces` faces
+
+    :return: Pairs of (top rolls, number of outcomes producing them)
+    """
+    if pierce:
+        return ((faces,) * count, 1),
+
+    distribution = []
+    for rolls in combinations_with_replacement(range(faces, 0, -1), count):
+        distribution.append((rolls, _ways(dice, rolls)))
+
+    return tuple(distribution)
+
+
+def _ways(dice: int, rolls: Tuple[int, ...]) -> int:
+    """Number of ordered outcomes of `dice` dice whose sorted top rolls are exactly `rolls`"""
+    lowest = rolls[-1]
+    lowest_count = rolls.count(lowest)
+    higher = rolls[:len(rolls) - lowest_count]
+
+    # place the dice above the lowest top roll, these values are fixed
+    ways = factorial(dice) // factorial(dice - len(higher))
+    for value in set(higher):
+        ways //= factorial(higher.count(value))
+
+    # the remaining dice roll at most the lowest top roll, with at least lowest_count of them equal to it
+    remaining = dice - len(higher)
+    ways *= sum(comb(remaining, equal) * (lowest - 1) ** (remaining - equal)
+                for equal in range(lowest_count, remaining + 1))
+
+    return ways
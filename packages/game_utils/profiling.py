@@ -0,0 +1,185 @@
+"""
+Module holds the opt-in instrumentation of the hot paths of the game.
+
+Nothing in the game calls into this module. When a Profiler starts, it replaces the functions of every phase with a
+timing wrapper and puts the originals back when it stops, so a game that is not profiled runs the exact same code as
+before and pays nothing.
+
+Times are inclusive: picking up loot also counts as bag operations, spawning monsters is part of building the
+environment.
+
+Classes
+-------
+    PhaseTimers:
+        Call counts and time spent per phase
+    Profiler:
+        Installs the phase timers and a cProfile profiler, then dumps both
+"""
+import cProfile
+import sys
+from collections import namedtuple
+from functools import wraps
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, TextIO, Tuple
+
+PhaseStats = namedtuple("PhaseStats", "calls, seconds")
+
+
+def _targets() -> List[Tuple[str, object, str]]:
+    """
+    Functions timed per phase, as (phase, owner, attribute). Imported here so this module can be loaded by anything
+    without pulling in the game
+    """
+    from packages.characters.hero import Hero
+    from packages.environments.environment import Environment
+    from packages.game_utils import combat_functions
+    from packages.game_utils.game_controller import DungeonDudes
+    from packages.game_utils.monster_controller import MonsterController, MonsterRegistry
+
+    return [
+        ("environment", Environment, "__init__"),
+        ("spawn", MonsterController, "__init__"),
+        ("monster_load", MonsterRegistry, "_load"),
+        # the game controller looks duel up on its module every round
+        ("duel", combat_functions, "duel"),
+        ("loot_transfer", DungeonDudes, "_pick_up_loot"),
+        ("bag", Hero, "set_loot"),
+        ("bag", Hero, "add_loot_many"),
+        ("bag", Hero, "consume_loot"),
+        ("bag", Hero, "cleanup_bag"),
+        ("render", DungeonDudes, "_display"),
+    ]
+
+
+class PhaseTimers:
+    def __init__(self):
+        """Call counts and time spent per phase, filled by the wrappers of wrap"""
+        self._calls: Dict[str, int] = {}
+        self._seconds: Dict[str, float] = {}
+
+    def wrap(self, phase: str, func: Callable) -> Callable:
+        """
+        Time every call of a function under a phase
+
+        :param phase: Name of the phase
+        :param func: Function to time
+        :return: Wrapper of the function
+        :rtype: Callable
+        """
+        calls = self._calls
+        seconds = self._seconds
+        calls.setdefault(phase, 0)
+        seconds.setdefault(phase, 0.0)
+
+        @wraps(func)
+        def timed(*args, **kwargs):
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                seconds[phase] += perf_counter() - start
+                calls[phase] += 1
+
+        return timed
+
+    @property
+    def stats(self) -> Dict[str, PhaseStats]:
+        """
+        :return: Counters of every phase
+        :rtype: Dict[str, PhaseStats]
+        """
+        return {phase: PhaseStats(self._calls[phase], self._seconds[phase]) for phase in self._calls}
+
+    def summary(self) -> str:
+        """
+        Format the counters as a table, slowest phase first
+
+        :return: Table of the phases
+        :rtype: str
+        """
+        lines = [f"{'Phase':<16} {'Calls':>10} {'Total ms':>12} {'Per call us':>12}"]
+        for phase, stats in sorted(self.stats.items(), key=lambda item: item[1].seconds, reverse=True):
+            per_call = stats.seconds / stats.calls * 1e6 if stats.calls else 0.0
+            lines.append(f"{phase:<16} {stats.calls:>10} {stats.seconds * 1e3:>12.2f} {per_call:>12.2f}")
+        return "\n".join(lines)
+
+
+class Profiler:
+    def __init__(self, path: Optional[str] = None, stream: Optional[TextIO] = None, cprofile: bool = True):
+        """
+        Profile everything run between start and stop. Use as a context manager to profile a whole game, the
+        results are written even when the game ends by exiting the process
+
+        :param path: File the cProfile stats are dumped to, readable with pstats. None skips the dump
+        :type path: Optional[str]
+        :param stream: Where the summary table is written, defaults to the standard output at the time of the stop
+        :type stream: Optional[TextIO]
+        :param cprofile: Run cProfile along the phase timers
+        :type cprofile: bool
+        """
+        self.path = path
+        self.timers = PhaseTimers()
+        self._stream = stream
+        self._profile = cProfile.Profile() if cprofile else None
+        self._originals: List[Tuple[object, str, Callable]] = []
+
+    @property
+    def running(self) -> bool:
+        """
+        :return: Bool indicating the wrappers are installed
+        :rtype: bool
+        """
+        return bool(self._originals)
+
+    def start(self) -> None:
+        """
+        Install the phase timers and start cProfile
+
+        :return: None
+        :raises RuntimeError: If the profiler is already running
+        """
+        if self.running:
+            raise RuntimeError("Profiler is already running")
+
+        for phase, owner, attribute in _targets():
+            original = getattr(owner, attribute)
+            self._originals.append((owner, attribute, original))
+            setattr(owner, attribute, self.timers.wrap(phase, original))
+
+        if self._profile is not None:
+            self._profile.enable()
+
+    def stop(self) -> None:
+        """
+        Stop cProfile and put the original functions back
+
+        :return: None
+        """
+        if self._profile is not None:
+            self._profile.disable()
+
+        # restore in reverse so a function wrapped twice gets its original back
+        for owner, attribute, original in reversed(self._originals):
+            setattr(owner, attribute, original)
+        self._originals.clear()
+
+    def report(self) -> None:
+        """
+        Dump the cProfile stats to the path and write the summary table
+
+        :return: None
+        """
+        stream = sys.stdout if self._stream is None else self._stream
+        if self._profile is not None and self.path is not None:
+            self._profile.dump_stats(self.path)
+            stream.write(f"Profile written to {self.path}\n")
+        stream.write(self.timers.summary() + "\n")
+        stream.flush()
+
+    def __enter__(self) -> "Profiler":
+        self.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.stop()
+        self.report()
@@ -0,0 +1,190 @@
+"""
+Module records games and replays them without a terminal.
+
+A game is fully determined by its seed and the decisions taken at every prompt, so a log only holds those and the
+state the game ended in. Logs are JSONL, one game per line:
+
+    {"version": 1, "seed": 42, "username": "Jack", "settings": {}, "decisions": [1, 1, 3, 1, -1],
+     "final": {"level": 3, "health": 4, "loot_count": 2}}
+
+Replaying runs the game headlessly with the recorded decisions and checks it ends in the recorded state. Logs are read
+one line at a time, so corpora of any size can be replayed in constant memory.
+
+Games interrupted with Ctrl+C restart the room they were in, which is not recorded and can't be replayed.
+"""
+from argparse import ArgumentParser
+from collections import namedtuple
+from json import dumps, loads
+from typing import Iterable, Iterator, List, Optional, TextIO
+
+from packages.game_utils.policies import Policy, PromptEnum
+from packages.game_utils.simulation import HeadlessDungeonDudes
+
+REPLAY_VERSION = 1
+FinalState = namedtuple("FinalState", "level, health, loot_count")
+GameRecord = namedtuple("GameRecord", "seed, username, settings, decisions, final")
+ReplayResult = namedtuple("ReplayResult", "line, record, final, error")
+
+
+class ReplayError(Exception):
+    """Raised when a replayed game does not follow its log"""
+
+
+class ReplayWriter:
+    def __init__(self, stream: TextIO):
+        """
+        Append finished games to a log
+
+        :param stream: Open text file receiving the log
+        :type stream: TextIO
+        """
+        self._stream = stream
+
+    def write(self, game) -> None:
+        """
+        Log a finished game
+
+        :param game: DungeonDudes session created with this recorder
+        :type game: DungeonDudes
+        :return: None
+        :raises ValueError: If the game was not created from a seed
+        """
+        if game.seed is None:
+            raise ValueError("Only games created from a seed can be recorded")
+
+        record = GameRecord(game.seed, game.hero.name, game._record_settings(), game.decisions, final_state(game))
+        self._stream.write(dumps(encode(record)) + "\n")
+        self._stream.flush()
+
+
+class ScriptedPolicy(Policy):
+    def __init__(self, decisions: Iterable[int]):
+        """
+        Play the decisions of a log in order
+
+        :param decisions: Recorded decisions
+        """
+        self._decisions = list(decisions)
+        self._next = 0
+
+    @property
+    def remaining(self) -> int:
+        """
+        :return: Number of decisions not played yet
+        :rtype: int
+        """
+        return len(self._decisions) - self._next
+
+    def decide(self, game, prompt: PromptEnum, choices: List[int]) -> int:
+        if not self.remaining:
+            raise ReplayError(f"Ran out of decisions at the {prompt.name} prompt")
+
+        decision = self._decisions[self._next]
+        self._next += 1
+        if decision not in choices:
+            raise ReplayError(f"Decision {decision} is not one of {choices} at the {prompt.name} prompt")
+
+        return decision
+
+
+def final_state(game) -> FinalState:
+    """
+    :param game: DungeonDudes session
+    :return: State compared at the end of a replay
+    :rtype: FinalState
+    """
+    return FinalState(game.level, game.hero.health, game.hero.loot_count)
+
+
+def encode(record: GameRecord) -> dict:
+    """Turn a record into the JSON object written to the log"""
+    return {"version": REPLAY_VERSION, "seed": record.seed, "username": record.username,
+            "settings": record.settings, "decisions": list(record.decisions), "final": record.final._asdict()}
+
+
+def decode(line: str) -> GameRecord:
+    """
+    Parse a line of a log
+
+    :param line: JSON object of a single game
+    :return: Record of the game
+    :rtype: GameRecord
+    :raises ValueError: If the line was written by another version of the log format
+    """
+    data = loads(line)
+    if data.get("version") != REPLAY_VERSION:
+        raise ValueError(f"Unsupported replay version {data.get('version')}")
+
+    return GameRecord(data["seed"], data["username"], data["settings"], data["decisions"],
+                      FinalState(**data["final"]))
+
+
+def read_records(stream: TextIO) -> Iterator[GameRecord]:
+    """
+    Stream the records of a log, blank lines are skipped
+
+    :param stream: Open log
+    :return: Generator of records
+    """
+    for line in stream:
+        if line.strip():
+            yield decode(line)
+
+
+def replay(record: GameRecord) -> FinalState:
+    """
+    Play a recorded game again
+
+    :param record: Record of the game
+    :return: State the replayed game ended in
+    :rtype: FinalState
+    :raises ReplayError: If the replay needs a decision the log does not hold or left decisions unused
+    """
+    policy = ScriptedPolicy(record.decisions)
+    game = HeadlessDungeonDudes(policy, record.username, seed=record.seed, **record.settings)
+    game.play()
+
+    if policy.remaining:
+        raise ReplayError("The game ended before every decision was played")
+
+    return final_state(game)
+
+
+def verify(stream: TextIO) -> Iterator[ReplayResult]:
+    """
+    Replay every game of a log and compare the final states
+
+    :param stream: Open log
+    :return: Generator with one result per game, error is None when the game replayed to its recorded state
+    """
+    for line, record in enumerate(read_records(stream), 1):
+        try:
+            final = replay(record)
+        except ReplayError as error:
+            yield ReplayResult(line, record, None, str(error))
+            continue
+
+        error = None if final == record.final else f"Ended in {tuple(final)} instead of {tuple(record.final)}"
+        yield ReplayResult(line, record, final, error)
+
+
+def main(args: Optional[List[str]] = None) -> int:
+    parser = ArgumentParser(description="Replay recorded DungeonDudes games and verify their final state")
+    parser.add_argument("log", help="JSONL log written with --record")
+    args = parser.parse_args(args)
+
+    games = 0
+    failures = 0
+    with open(args.log, "rt", encoding="UTF-8") as infile:
+        for result in verify(infile):
+            games += 1
+            if result.error is not None:
+                failures += 1
+                print(f"[!] Game on line {result.line} (seed {result.record.seed}): {result.error}")
+
+    print(f"Replayed {games} games, {failures} failed")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    exit(main())
@@ -0,0 +1,469 @@
+"""
+Module hosts many DungeonDudes players in a single process with asyncio.
+
+Every connection is a player speaking a line protocol, telnet or netcat are enough to play. The game itself is not
+asynchronous: DungeonDudes.steps runs the game until it needs a decision and yields the prompt. A Session holds that
+generator and only advances it when the player sends a line, so a player thinking about the next move is a suspended
+generator and a coroutine waiting on its socket, nothing runs for it.
+
+Panels and combat logs are drawn to a buffer per session and sent once the game waits for the next line. Messages
+asking the player to press a key do not wait, the next prompt follows them.
+
+A live game keeps the hero, the room and its monsters alive, tens of KB per player. Sessions idle for more than
+idle_after seconds are compacted: the game is dropped and only what rebuilds it is kept, the seed and the decisions
+played, in a SessionStore. The next line typed replays them to the same prompt before being played. Replays are kept
+short by taking a snapshot of the game once a room is over and more than REPLAY_LIMIT decisions were played, the
+decisions since are replayed on top of it.
+
+Classes
+-------
+    ServerScreen:
+        FrameRenderer writing to a buffer, never reads from the terminal
+    SessionGame:
+        DungeonDudes session that ends without exiting the process and keeps what rebuilds it
+    Session:
+        A game advanced one line of input at a time, compacted while idle
+    SessionStore:
+        Compacted sessions kept in memory
+    SqliteSessionStore:
+        Compacted sessions kept in a SQLite database
+    GameServer:
+        Accepts the connections and runs a Session per player
+"""
+import asyncio
+import marshal
+from argparse import ArgumentParser
+from array import array
+from io import StringIO
+from pathlib import Path
+from random import Random
+from typing import Dict, Generator, List, Optional, Tuple
+
+from packages.game_utils.cli_display import FrameRenderer, display_message
+from packages.game_utils.data_bundle import BUNDLE
+from packages.game_utils.events import TerminalRenderer
+from packages.game_utils.game_controller import DungeonDudes, GameOver
+from packages.game_utils.policies import Prompt
+from packages.game_utils.snapshot import restore, snapshot
+from packages.game_utils.utils import INVALID_INPUT, PROMPT, parse_choice
+
+ASCII_FILE = Path(__file__).parent.resolve().parents[1] / Path("data/.dd_ascii")
+USERNAME_PROMPT = "Enter your desired username for the game:\n" + PROMPT
+MAX_USERNAME = 32
+MAX_LINE = 1024
+# decisions replayed at most to rehydrate a session, past it the next room boundary takes a snapshot
+REPLAY_LIMIT = 256
+IDLE_AFTER = 60.0
+
+
+class ServerScreen(FrameRenderer):
+    def __init__(self):
+        """Screen of a remote player, everything drawn is kept until taken by the server"""
+        super().__init__(StringIO(), diff=False)
+
+    def read(self, prompt: str = "") -> str:
+        """The player is never waited for outside of a prompt, the message is shown and the game goes on"""
+        self.write(f"{prompt}\n")
+        return ""
+
+    def take(self) -> str:
+        """
+        Everything drawn since the last take
+
+        :return: Text to send to the player
+        :rtype: str
+        """
+        stream = self.stream
+        text = stream.getvalue()
+        stream.seek(0)
+        stream.truncate()
+        return text
+
+
+class SessionGame(DungeonDudes):
+    def __init__(self, username: str, screen: ServerScreen, show_dice: bool = False, seed: Optional[int] = None,
+                 rng: Optional[Random] = None):
+        """
+        DungeonDudes session played over the network. The decisions come from the Session driving steps, the game
+        never asks the policy
+
+        :param username: Name of the hero
+        :param screen: Screen of the player
+        :param show_dice: Display the combat rolls of each duel
+        :param seed: Seed of the game
+        :param rng: Generator of the game, takes precedence over the seed
+        """
+        super().__init__(username, show_dice, start=False, seed=seed, rng=rng,
+                         sink=TerminalRenderer(show_dice, screen), screen=screen)
+        self.show_dice = show_dice
+        # the game is the seed, or the snapshot once taken, replayed with the decisions since
+        self.base: Optional[bytes] = None
+        self.log = array("b")
+
+    def pack(self) -> bytes:
+        """
+        What rebuilds the game at its current prompt
+
+        :return: Packed game, see unpack
+        :rtype: bytes
+        """
+        return marshal.dumps((self.hero.name, self.show_dice, self.seed, self.base, self.log.tobytes()))
+
+    @classmethod
+    def unpack(cls, data: bytes) -> Tuple["SessionGame", Generator[Prompt, int, None], Prompt]:
+        """
+        Rebuild a packed game by replaying its decisions, nothing is drawn
+
+        :param data: Packed game
+        :return: The game, its steps and the prompt it is waiting on
+        :rtype: Tuple[SessionGame, Generator[Prompt, int, None], Prompt]
+        """
+        username, show_dice, seed, base, log = marshal.loads(data)
+        game = cls(username, ServerScreen(), show_dice, seed=seed)
+        if base is not None:
+            restore(base, game)
+            game.base = base
+            game._initial = False
+
+        steps = game.steps()
+        prompt = next(steps)
+        for decision in array("b", log):
+            prompt = steps.send(game._record(decision))
+
+        game.sink.flush()
+        game.screen.take()
+        return game, steps, prompt
+
+    def _record(self, decision: int) -> int:
+        self.log.append(decision)
+        return super()._record(decision)
+
+    def _checkpoint(self) -> None:
+        super()._checkpoint()
+        if len(self.log) > REPLAY_LIMIT:
+            self.base = snapshot(self)
+            del self.log[:]
+
+    def _quit(self) -> None:
+        self._show_final_bag()
+        self._save_record()
+        self._display(display_message, "Thanks for playing!")
+        raise GameOver
+
+
+class SessionStore:
+    def __init__(self):
+        """Compacted sessions kept in memory, by session id"""
+        self._sessions: Dict[int, bytes] = {}
+
+    def put(self, key: int, data: bytes) -> None:
+        """
+        Keep a compacted session
+
+        :param key: Id of the session
+        :param data: Packed game
+        :return: None
+        """
+        self._sessions[key] = data
+
+    def pop(self, key: int) -> Optional[bytes]:
+        """
+        Take a compacted session out of the store
+
+        :param key: Id of the session
+        :return: Packed game, None if the session is not in the store
+        :rtype: Optional[bytes]
+        """
+        return self._sessions.pop(key, None)
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+
+class SqliteSessionStore(SessionStore):
+    def __init__(self, path: str = ":memory:"):
+        """
+        Compacted sessions kept in a SQLite database, out of the heap of the server. The database is a cache of the
+        running server, it is emptied when opened
+
+        :param path: File of the database
+        :type path: str
+        """
+        # only servers asking for it pay for importing sqlite
+        import sqlite3
+
+        super().__init__()
+        self._db = sqlite3.connect(path)
+        self._db.execute("DROP TABLE IF EXISTS sessions")
+        self._db.execute("CREATE TABLE sessions (id INTEGER PRIMARY KEY, data BLOB NOT NULL)")
+
+    def put(self, key: int, data: bytes) -> None:
+        with self._db:
+            self._db.execute("INSERT OR REPLACE INTO sessions VALUES (?, ?)", (key, data))
+
+    def pop(self, key: int) -> Optional[bytes]:
+        with self._db:
+            row = self._db.execute("SELECT data FROM sessions WHERE id = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            self._db.execute("DELETE FROM sessions WHERE id = ?", (key,))
+        return row[0]
+
+    def __len__(self) -> int:
+        return self._db.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def close(self) -> None:
+        self._db.close()
+
+
+class Session:
+    __slots__ = ("game", "over", "store", "key", "_steps", "_prompt")
+
+    def __init__(self, game: SessionGame, store: Optional[SessionStore] = None, key: int = 0):
+        """
+        Advance a game one line of input at a time
+
+        :param game: Game to drive
+        :type game: SessionGame
+        :param store: Where the game is kept while compacted, defaults to a store of its own
+        :type store: Optional[SessionStore]
+        :param key: Id of the session in the store
+        :type key: int
+        """
+        self.game: Optional[SessionGame] = game
+        self.over = False
+        self.store = SessionStore() if store is None else store
+        self.key = key
+        self._steps: Optional[Generator[Prompt, int, None]] = game.steps()
+        self._prompt: Optional[Prompt] = None
+
+    @property
+    def prompt(self) -> Optional[Prompt]:
+        """
+        :return: Decision the game is waiting for, None before the start, while compacted and once the game is over
+        :rtype: Optional[Prompt]
+        """
+        return self._prompt
+
+    @property
+    def compacted(self) -> bool:
+        """
+        :return: True while the game only lives in the store
+        :rtype: bool
+        """
+        return self.game is None
+
+    def start(self) -> str:
+        """
+        Run the game up to its first prompt
+
+        :return: Text to send to the player
+        :rtype: str
+        """
+        return self._advance(None)
+
+    def answer(self, line: str) -> str:
+        """
+        Play a line typed by the player, a compacted game is rebuilt first
+
+        :param line: Line without its line ending
+        :return: Text to send to the player
+        :rtype: str
+        """
+        if self.over:
+            return ""
+
+        if self.compacted:
+            self.game, self._steps, self._prompt = SessionGame.unpack(self.store.pop(self.key))
+
+        choice = parse_choice(line.strip(), self._prompt.choices)
+        if choice is None:
+            return f"{INVALID_INPUT}\n{PROMPT}"
+
+        return self._advance(self.game._record(choice))
+
+    def compact(self) -> None:
+        """
+        Drop the game, only keeping what rebuilds it in the store. Done when the player is idle, only sessions
+        waiting on a prompt are compacted
+
+        :return: None
+        """
+        if self.over or self.compacted or self._prompt is None:
+            return
+
+        self.store.put(self.key, self.game.pack())
+        self._steps.close()
+        self.game = self._steps = self._prompt = None
+
+    def _advance(self, decision: Optional[int]) -> str:
+        """Resume the game until the next prompt or its end"""
+        try:
+            self._prompt = next(self._steps) if decision is None else self._steps.send(decision)
+        except (GameOver, StopIteration):
+            self._prompt = None
+            self.over = True
+
+        self.game.sink.flush()
+        text = self.game.screen.take()
+        return text if self.over else text + PROMPT
+
+    def close(self) -> None:
+        """Stop the game, used when the player leaves before it is over"""
+        if self.compacted:
+            self.store.pop(self.key)
+        else:
+            self._steps.close()
+        self._prompt = None
+        self.over = True
+
+
+class GameServer:
+    def __init__(self, show_dice: bool = False, seed: Optional[int] = None, idle_after: Optional[float] = IDLE_AFTER,
+                 store: Optional[SessionStore] = None):
+        """
+        Host a game per connection. Games are seeded from a generator of the server, a seeded server hands out the
+        same games in the order players connect
+
+        :param show_dice: Display the combat rolls of each duel
+        :type show_dice: bool
+        :param seed: Seed of the server, None for random games
+        :type seed: Optional[int]
+        :param idle_after: Seconds without input before a session is compacted, None keeps every game alive
+        :type idle_after: Optional[float]
+        :param store: Where compacted sessions are kept, defaults to memory
+        :type store: Optional[SessionStore]
+        """
+        self.show_dice = show_dice
+        self.idle_after = idle_after
+        self.store = SessionStore() if store is None else store
+        self._seeds = Random(seed)
+        self._sessions: Dict[int, Session] = {}
+        self._next_id = 0
+        self._title = BUNDLE.load(ASCII_FILE, str) + "\n" if ASCII_FILE.exists() else ""
+
+    @property
+    def sessions(self) -> int:
+        """
+        :return: Number of players connected
+        :rtype: int
+        """
+        return len(self._sessions)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> asyncio.AbstractServer:
+        """
+        Listen for players
+
+        :param host: Address to listen on
+        :param port: Port to listen on, 0 picks a free one
+        :return: The listening server, see its sockets for the port
+        """
+        return await asyncio.start_server(self._handle, host, port, limit=MAX_LINE)
+
+    def new_session(self, username: str, key: int = 0) -> Session:
+        """
+        Create the game of a new player
+
+        :param username: Name of the hero
+        :param key: Id of the session
+        :return: Session of the player, not started
+        :rtype: Session
+        """
+        game = SessionGame(username, ServerScreen(), self.show_dice, seed=self._seeds.getrandbits(64))
+        return Session(game, self.store, key)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Play a whole game with a connected player"""
+        session_id = self._next_id
+        self._next_id += 1
+        try:
+            await self._send(writer, self._title + USERNAME_PROMPT)
+            username = await self._read_line(reader)
+            if username is None:
+                return
+
+            session = self.new_session(username.strip()[:MAX_USERNAME] or "Hero", session_id)
+            self._sessions[session_id] = session
+            await self._send(writer, session.start())
+            while not session.over:
+                line = await self._wait_line(reader, session)
+                if line is None:
+                    break
+                await self._send(writer, session.answer(line))
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            session = self._sessions.pop(session_id, None)
+            if session is not None and not session.over:
+                session.close()
+            writer.close()
+
+    async def _wait_line(self, reader: asyncio.StreamReader, session: Session) -> Optional[str]:
+        """Next line of the player, the session is compacted while the player is idle"""
+        if self.idle_after is None:
+            return await self._read_line(reader)
+
+        try:
+            # a cancelled readline keeps what it buffered, the next one picks it up
+            return await asyncio.wait_for(self._read_line(reader), self.idle_after)
+        except asyncio.TimeoutError:
+            session.compact()
+            return await self._read_line(reader)
+
+    @staticmethod
+    async def _read_line(reader: asyncio.StreamReader) -> Optional[str]:
+        """Next line of the player, None once the connection is closed or the line is too long"""
+        try:
+            line = await reader.readline()
+        except (asyncio.LimitOverrunError, ValueError):
+            return None
+
+        if not line:
+            return None
+        return line.decode("utf-8", errors="replace").rstrip("\r\n")
+
+    @staticmethod
+    async def _send(writer: asyncio.StreamWriter, text: str) -> None:
+        """Send text with telnet line endings"""
+        if text:
+            writer.write(text.replace("\n", "\r\n").encode("utf-8"))
+            await writer.drain()
+
+
+async def serve(host: str = "127.0.0.1", port: int = 4000, show_dice: bool = False,
+                idle_after: Optional[float] = IDLE_AFTER, store: Optional[SessionStore] = None) -> None:
+    """
+    Run a server until the process is stopped
+
+    :param host: Address to listen on
+    :param port: Port to listen on
+    :param show_dice: Display the combat rolls of each duel
+    :param idle_after: Seconds without input before a session is compacted, None keeps every game alive
+    :param store: Where compacted sessions are kept, defaults to memory
+    :return: None
+    """
+    server = await GameServer(show_dice, idle_after=idle_after, store=store).start(host, port)
+    async with server:
+        await server.serve_forever()
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = ArgumentParser(description="Host DungeonDudes players over TCP")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on")
+    parser.add_argument("--port", type=int, default=4000, help="Port to listen on")
+    parser.add_argument("--dice", action="store_true", help="Display the combat rolls of each duel")
+    parser.add_argument("--idle", type=float, default=IDLE_AFTER,
+                        help="Seconds without input before a session is compacted, 0 keeps every game alive")
+    parser.add_argument("--store", metavar="DB", default=None,
+                        help="Keep compacted sessions in a SQLite database instead of memory")
+    args = parser.parse_args(args)
+
+    store = None if args.store is None else SqliteSessionStore(args.store)
+    try:
+        asyncio.run(serve(args.host, args.port, args.dice, args.idle or None, store))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,352 @@
+"""
+Module runs DungeonDudes without a terminal. The same room and duel logic used by the interactive game is driven by a
+Policy instead of the keyboard and nothing is rendered, which allows running large batches of games for balance testing.
+
+Batches are sharded across a process pool by simulate(). Every shard plays with its own seeded generator and only
+sends back aggregated SimulationStats, so results are reproducible and memory stays flat however many games are played.
+"""
+from argparse import ArgumentParser
+from collections import Counter, namedtuple
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from os import cpu_count
+from random import Random
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+from packages.game_utils.events import NULL_SINK
+from packages.game_utils.game_controller import DungeonDudes, GameOver, _get_environments
+from packages.game_utils.policies import ExpectedValuePolicy, GreedyPolicy, Policy, RandomPolicy, \
+    ThresholdPolicy
+from packages.game_utils.snapshot import load_state, new_rng, restore
+
+DEFAULT_SHARD_SIZE = 500
+GameResult = namedtuple("GameResult", "won, level, health, loot_count, loot_gained")
+GameSettings = namedtuple("GameSettings", "policy, max_level, start_level, environments")
+POLICIES: Dict[str, Callable[[], Policy]] = {
+    "greedy": GreedyPolicy,
+    "random": RandomPolicy,
+    "threshold": ThresholdPolicy,
+    "expected": ExpectedValuePolicy,
+}
+
+
+class HeadlessDungeonDudes(DungeonDudes):
+    def __init__(self, policy: Policy, username: str = "Headless", max_level: Optional[int] = None,
+                 level: int = 1, environments: Optional[Iterable[str]] = None, seed: Optional[int] = None,
+                 rng: Optional[Random] = None, sink=NULL_SINK, recorder=None):
+        """
+        DungeonDudes session that asks the policy for every decision and skips all rendering
+
+        :param policy: Decision maker used in place of the player
+        :type policy: Policy
+        :param username: Name of the hero
+        :type username: str
+        :param max_level: The game is won once the room of this level is cleared. None plays until the hero dies
+        :type max_level: Optional[int]
+        :param level: Level of the first room
+        :type level: int
+        :param environments: Names of the environments to play in, None for all of them
+        :type environments: Optional[Iterable[str]]
+        :param seed: Seed of the game
+        :type seed: Optional[int]
+        :param rng: Generator of the game, takes precedence over the seed
+        :type rng: Optional[Random]
+        :param sink: Receives the combat and room events, nothing is emitted by default
+        :param recorder: Receives the seed and decisions of the game once it is over, see replay.ReplayWriter
+        """
+        super().__init__(username, show_dice=False, start=False, seed=seed, rng=rng, sink=sink, recorder=recorder,
+                         policy=policy)
+        self.max_level = max_level
+        self.level = level
+        self.start_level = level
+        self.loot_gained = 0
+        self.environments = None
+
+        if environments is not None:
+            environments = set(environments)
+            self.environments = tuple(sorted(environments))
+            self.environment_template = [env for env in self.environment_template if env.name in environments]
+            if not self.environment_template:
+                raise ValueError(f"None of the environments {sorted(environments)} exist")
+
+    @classmethod
+    def from_snapshot(cls, data: bytes, policy: Policy, **kwargs) -> "HeadlessDungeonDudes":
+        """
+        Fork a session from a snapshot. The settings saved with the snapshot are used unless given again
+
+        :param data: Snapshot taken with snapshot.snapshot
+        :param policy: Decision maker used in place of the player
+        :param kwargs: Other arguments of HeadlessDungeonDudes, the seed is ignored. The generator defaults to one of
+            the kind the snapshot was taken with
+        :return: Session in the state of the snapshot
+        :rtype: HeadlessDungeonDudes
+        """
+        _, settings, _, _ = load_state(data)
+        settings = {**(settings or {}), **kwargs}
+        settings.pop("seed", None)
+        settings.pop("level", None)
+        rng = settings.pop("rng", None)
+
+        game = cls(policy, rng=new_rng(data) if rng is None else rng, **settings)
+        restore(data, game)
+        game.start_level = game.level
+        return game
+
+    @property
+    def won(self) -> bool:
+        """
+        Determine if the hero cleared every level the session was asked to play
+
+        :return: Bool indicating a win
+        :rtype: bool
+        """
+        return self.max_level is not None and self.level > self.max_level
+
+    @property
+    def result(self) -> GameResult:
+        """
+        Summary of the session once it is over
+
+        :return: Outcome of the game
+        :rtype: GameResult
+        """
+        return GameResult(self.won, self.level, self.hero.health, self.hero.loot_count, self.loot_gained)
+
+    def play(self) -> GameResult:
+        """
+        Play the game until the hero dies, the policy quits or the last level is cleared
+
+        :return: Outcome of the game
+        :rtype: GameResult
+        """
+        try:
+            self.run_game()
+        except GameOver:
+            pass
+        finally:
+            self.sink.flush()
+            self._save_record()
+
+        return self.result
+
+    def _playing(self) -> bool:
+        return not self.hero.is_dead and not self.won
+
+    def _display(self, display: Callable, *args) -> None:
+        pass
+
+    def _pause(self) -> None:
+        pass
+
+    def _pick_up_loot(self, environment) -> None:
+        self.loot_gained += sum(loot.quantity for loot in environment.loot)
+        super()._pick_up_loot(environment)
+
+    def _quit(self) -> None:
+        raise GameOver
+
+    def _record_settings(self) -> dict:
+        return {"max_level": self.max_level, "level": self.start_level, "environments": self.environments}
+
+
+class SimulationStats:
+    def __init__(self):
+        """Counters aggregated over a batch of games"""
+        self.games = 0
+        self.wins = 0
+        self.quits = 0
+        self.loot_gained = 0
+        self.deaths_by_level = Counter()
+
+    def __repr__(self):
+        return f"{self.__class__.__name__}(games={self.games}, wins={self.wins}, deaths={self.deaths}, " \
+               f"quits={self.quits}, loot_gained={self.loot_gained})"
+
+    @property
+    def deaths(self) -> int:
+        """
+        :return: Number of games where the hero died
+        :rtype: int
+        """
+        return sum(self.deaths_by_level.values())
+
+    @property
+    def win_rate(self) -> float:
+        """
+        :return: Share of the games that were won
+        :rtype: float
+        """
+        return self.wins / self.games if self.games else 0.0
+
+    def add_result(self, result: GameResult) -> None:
+        """
+        Count the outcome of a single game
+
+        :param result: Outcome of the game
+        :return: None
+        """
+        self.games += 1
+        self.loot_gained += result.loot_gained
+        if result.won:
+            self.wins += 1
+        elif result.health < 1:
+            self.deaths_by_level[result.level] += 1
+        else:
+            self.quits += 1
+
+    def merge(self, other: "SimulationStats") -> None:
+        """
+        Add the counters of another batch to this one
+
+        :param other: Counters of the other batch
+        :return: None
+        """
+        self.games += other.games
+        self.wins += other.wins
+        self.quits += other.quits
+        self.loot_gained += other.loot_gained
+        self.deaths_by_level.update(other.deaths_by_level)
+
+
+def run_games(count: int, policy: Policy = None, max_level: Optional[int] = None, level: int = 1,
+              environments: Optional[Iterable[str]] = None, rng: Optional[Random] = None) -> Iterator[GameResult]:
+    """
+    Play a batch of headless games. Given a generator, the games play one after the other from its stream
+
+    :param count: Number of games to play
+    :param policy: Decision maker shared by every game, defaults to GreedyPolicy
+    :param max_level: Level that has to be cleared to win a game
+    :param level: Level of the first room
+    :param environments: Names of the environments to play in, None for all of them
+    :param rng: Generator shared by the games, each game seeds its own when not given
+    :return: Generator of the game results
+    """
+    policy = GreedyPolicy() if policy is None else policy
+    for _ in range(0, count):
+        yield HeadlessDungeonDudes(policy, max_level=max_level, level=level, environments=environments,
+                                   rng=rng).play()
+
+
+def simulate(games: int, workers: Optional[int] = None, seed: int = 0, policy: Policy = None,
+             max_level: Optional[int] = None, start_level: int = 1, environments: Optional[Iterable[str]] = None,
+             shard_size: int = DEFAULT_SHARD_SIZE) -> SimulationStats:
+    """
+    Play games in parallel over a pool of processes. Games are split in shards of shard_size, each played with its
+    own generator seeded from the seed and the shard number, so the same arguments always give the same stats no
+    matter how many workers are used
+
+    :param games: Number of games to play
+    :param workers: Number of processes, defaults to the number of CPUs
+    :param seed: Base seed of the run
+    :param policy: Decision maker used by every game, defaults to GreedyPolicy. Must be picklable
+    :param max_level: Level that has to be cleared to win a game
+    :param start_level: Level of the first room
+    :param environments: Names of the environments to play in, None for all of them
+    :param shard_size: Number of games played per task
+    :return: Aggregated counters of every game
+    :rtype: SimulationStats
+    """
+    settings = GameSettings(GreedyPolicy() if policy is None else policy, max_level, start_level,
+                            None if environments is None else tuple(environments))
+    workers = workers or cpu_count() or 1
+    shards = _shards(games, shard_size)
+    stats = SimulationStats()
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        # keep a bounded amount of shards in flight so memory does not grow with the number of games
+        pending = set()
+        for shard, count in shards:
+            pending.add(executor.submit(_play_shard, settings, count, _shard_seed(seed, shard)))
+            if len(pending) >= workers * 2:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    stats.merge(future.result())
+
+        for future in wait(pending).done:
+            stats.merge(future.result())
+
+    return stats
+
+
+def sweep(levels: Iterable[int], games: int, environments: Optional[Iterable[str]] = None,
+          **kwargs) -> Dict[Tuple[str, int], SimulationStats]:
+    """
+    Simulate a single room of every environment at every level
+
+    :param levels: Levels of the rooms to play
+    :param games: Number of games per environment and level
+    :param environments: Names of the environments to play, None for every environment on disk
+    :param kwargs: Extra arguments passed to simulate
+    :return: Stats keyed by (environment name, level)
+    """
+    if environments is None:
+        environments = [env.name for env in _get_environments()]
+
+    results = {}
+    for name in environments:
+        for level in levels:
+            results[(name, level)] = simulate(games, start_level=level, max_level=level, environments=[name],
+                                              **kwargs)
+
+    return results
+
+
+def compare_policies(policies: Dict[str, Policy], games: int, **kwargs) -> Dict[str, SimulationStats]:
+    """
+    Benchmark policies against each other. Every policy plays the same seeded shards, so the games only differ by the
+    decisions taken
+
+    :param policies: Policies keyed by the name to report them under
+    :param games: Number of games per policy
+    :param kwargs: Extra arguments passed to simulate
+    :return: Stats keyed by policy name
+    """
+    return {name: simulate(games, policy=policy, **kwargs) for name, policy in policies.items()}
+
+
+def _play_shard(settings: GameSettings, count: int, seed: str) -> SimulationStats:
+    """Worker task, plays a shard of games and returns only the counters"""
+    stats = SimulationStats()
+    for result in run_games(count, settings.policy, settings.max_level, settings.start_level,
+                            settings.environments, Random(seed)):
+        stats.add_result(result)
+
+    return stats
+
+
+def _shards(games: int, shard_size: int) -> Iterator[Tuple[int, int]]:
+    """Split the games into numbered shards"""
+    shard = 0
+    while games > 0:
+        yield shard, min(games, shard_size)
+        games -= shard_size
+        shard += 1
+
+
+def _shard_seed(seed: int, shard: int) -> str:
+    """Seed of the generator of a shard. String seeds are hashed the same way in every process"""
+    return f"{seed}:{shard}"
+
+
+def main():
+    parser = ArgumentParser(description="Run headless DungeonDudes games in parallel")
+    parser.add_argument("--games", type=int, default=10_000, help="Number of games to play")
+    parser.add_argument("--workers", type=int, default=None, help="Number of worker processes")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the run")
+    parser.add_argument("--max-level", type=int, default=None, help="Level that has to be cleared to win")
+    parser.add_argument("--start-level", type=int, default=1, help="Level of the first room")
+    parser.add_argument("--environment", action="append", default=None, help="Environment to play in")
+    parser.add_argument("--policy", action="append", default=None, choices=sorted(POLICIES),
+                        help="Policy to play with, repeat to compare policies")
+    args = parser.parse_args()
+
+    policies = {name: POLICIES[name]() for name in args.policy or ["greedy"]}
+    results = compare_policies(policies, args.games, workers=args.workers, seed=args.seed, max_level=args.max_level,
+                               start_level=args.start_level, environments=args.environment)
+    for name, stats in results.items():
+        print(f"{name}: {stats} win rate {stats.win_rate:.2%}")
+        for level, deaths in sorted(stats.deaths_by_level.items()):
+            print(f"Level {level:<4} deaths: {deaths}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+"""
+Module saves and restores the state of a game between rooms.
+
+A snapshot holds the level, the hero with its bag and buffs, and the state of the generator, so a restored game plays
+out exactly like the original would have. Rooms are not part of a snapshot, they are taken once a room is over.
+
+Snapshots are small binary blobs: a magic number and a version followed by the pickle of a tuple of builtins. The
+Mersenne Twister state of random.Random, which is most of a snapshot, is packed as raw 32 bit words instead of 625
+pickled ints. The kind of generator is kept with its state, so a game can be restored without knowing which generator
+it was played with, see new_rng. Only builtins are accepted when loading, a snapshot can't make the unpickler import
+or call anything.
+"""
+import pickle
+from array import array
+from io import BytesIO
+from os import replace
+from pathlib import Path
+from random import Random
+from typing import Tuple, Union
+
+from packages.characters.effects import Effect
+from packages.characters.hero import Hero
+from packages.environments.loot import Loot
+from packages.environments.loot_types import loot_type
+
+MAGIC = b"DDSV"
+SNAPSHOT_VERSION = 1
+MT_STATE_SIZE = 625
+PCG64_KIND = "pcg64"
+
+
+class SnapshotError(ValueError):
+    """Raised when a snapshot can't be read"""
+
+
+class _BuiltinsUnpickler(pickle.Unpickler):
+    def find_class(self, module: str, name: str):
+        raise SnapshotError(f"Snapshots may only hold builtins, found {module}.{name}")
+
+
+def snapshot(game) -> bytes:
+    """
+    Take a snapshot of a game between two rooms
+
+    :param game: DungeonDudes session
+    :type game: DungeonDudes
+    :return: Versioned snapshot
+    :rtype: bytes
+    """
+    hero = game.hero
+    state = (
+        game.level,
+        game._record_settings(),
+        _pack_rng_state(game.rng),
+        (
+            hero.name,
+            hero.health,
+            tuple(hero.base_stats),
+            tuple(tuple(effect) for effect in hero.buffs),
+            tuple((loot.name, loot.description, loot.quantity) for loot in hero.loot),
+        ),
+    )
+    return MAGIC + bytes((SNAPSHOT_VERSION,)) + pickle.dumps(state, pickle.HIGHEST_PROTOCOL)
+
+
+def restore(data: bytes, game) -> None:
+    """
+    Put a game back in the state of a snapshot. The game must use the same kind of generator as the one the snapshot
+    was taken from, see new_rng. A restored game has no seed, it can't be recorded for replay
+
+    :param data: Snapshot taken with snapshot
+    :param game: DungeonDudes session to restore into, usually created with start=False
+    :type game: DungeonDudes
+    :return: None
+    :raises SnapshotError: If the data is not a snapshot of a supported version
+    """
+    level, _, rng_state, hero_state = load_state(data)
+    name, health, base_stats, buffs, bag = hero_state
+
+    game.rng.setstate(_unpack_rng_state(rng_state))
+    game.level = level
+    game.seed = None
+
+    hero = Hero(name, game.rng)
+    hero.dice_count, hero.die_faces, hero.damage, hero.pierce_shot = base_stats
+    hero.health = health
+    for effect in buffs:
+        hero.add_buff(Effect(*effect))
+    hero.add_loot_many(_loot(name, desc, qty) for name, desc, qty in bag)
+    game.hero = hero
+
+
+def new_rng(data: bytes):
+    """
+    Create a generator of the kind a snapshot was taken with, to restore the snapshot into
+
+    :param data: Snapshot taken with snapshot
+    :return: Unseeded generator, its state is set by restore
+    :raises SnapshotError: If the data is not a snapshot, or the snapshot was taken with a generator of unknown kind
+    """
+    packed = load_state(data)[2]
+    if packed[0] == "mt":
+        return Random()
+    if packed[0] == PCG64_KIND:
+        # only games played with it pay for importing NumPy
+        from packages.game_utils.dice import PCG64Random
+        return PCG64Random(buffer_size=packed[1])
+
+    raise SnapshotError("The snapshot was taken with a generator of unknown kind, restore it into a game using the "
+                        "same generator")
+
+
+def load_state(data: bytes) -> Tuple:
+    """
+    Check the header of a snapshot and decode its state
+
+    :param data: Snapshot taken with snapshot
+    :return: (level, settings, generator state, hero state)
+    :rtype: Tuple
+    :raises SnapshotError: If the data is not a snapshot of a supported version
+    """
+    if data[:len(MAGIC)] != MAGIC:
+        raise SnapshotError("Not a DungeonDudes snapshot")
+
+    version = data[len(MAGIC)]
+    if version != SNAPSHOT_VERSION:
+        raise SnapshotError(f"Unsupported snapshot version {version}")
+
+    try:
+        return _BuiltinsUnpickler(BytesIO(data[len(MAGIC) + 1:])).load()
+    except (pickle.UnpicklingError, EOFError, ValueError) as error:
+        raise SnapshotError(f"Corrupted snapshot: {error}") from error
+
+
+def save(game, path: Union[str, Path]) -> None:
+    """
+    Write a snapshot to disk. The previous snapshot is only replaced once the new one is fully written
+
+    :param game: DungeonDudes session
+    :param path: File of the snapshot
+    :return: None
+    """
+    path = Path(path)
+    temp = path.with_name(path.name + ".tmp")
+    temp.write_bytes(snapshot(game))
+    replace(temp, path)
+
+
+def load(path: Union[str, Path]) -> bytes:
+    """
+    Read a snapshot from disk
+
+    :param path: File of the snapshot
+    :return: Snapshot to pass to restore
+    :rtype: bytes
+    """
+    return Path(path).read_bytes()
+
+
+def _pack_rng_state(rng) -> Tuple:
+    """Pack the state of random.Random as bytes, tag the state of PCG64Random, other generators are kept as they are"""
+    state = rng.getstate()
+    if len(state) == 3 and isinstance(state[1], tuple) and len(state[1]) == MT_STATE_SIZE:
+        version, words, gauss_next = state
+        return "mt", version, array("I", words).tobytes(), gauss_next
+    if getattr(rng, "SNAPSHOT_KIND", None) == PCG64_KIND:
+        return PCG64_KIND, rng.buffer_size, state
+    return "raw", state
+
+
+def _unpack_rng_state(packed: Tuple) -> Tuple:
+    """Inverse of _pack_rng_state"""
+    if packed[0] == "mt":
+        _, version, words, gauss_next = packed
+        return version, tuple(array("I", words)), gauss_next
+    return packed[-1]
+
+
+def _loot(name: str, desc: str, qty: int) -> Loot:
+    """Loot of the registry when the name is known, plain loot otherwise"""
+    try:
+        return loot_type(name).create(qty)
+    except KeyError:
+        return Loot(name, desc, qty=qty)
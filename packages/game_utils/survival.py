@@ -0,0 +1,152 @@
+"""
+Module computes the exact odds of a hero surviving a room, without sampling.
+
+A room is a Markov chain whose state is the health of the hero, the health of every monster and the initiative. While
+the hero fights every round with the same dice, each duel between the hero and one monster only depends on those two,
+so the order in which _duels visits the monsters, and the monsters MonsterController.clean_up removes, does not change
+how many hits the hero takes in total. The chain therefore factorizes per monster:
+
+    * The hero needs ceil(health / damage) hits to kill a monster
+    * Before each of those hits, the monster lands a geometric number of hits while the hero misses
+    * The monster attacks once more per kill step it survives, depending on who has the initiative
+
+The number of hits taken from a monster is memoized per (monster, hero, initiative) and the room is the convolution of
+its monsters. The hero survives when the total stays below its health.
+"""
+from collections import namedtuple
+from functools import lru_cache
+from math import ceil
+from typing import List, Optional, Sequence, Tuple
+
+from packages.characters.character_abstract import Character
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.environments.environment import Environment, InitiativeEnum
+from packages.game_utils.monster_controller import EnvironmentRecord, _habitable_monsters
+from packages.game_utils.probability import duel_probability
+
+HeroStats = namedtuple("HeroStats", "health, dice_count, die_faces, damage, pierce_shot")
+DEFAULT_HERO = HeroStats(Hero.DEFAULT_HEALTH, Hero.DEFAULT_DIE_COUNT, Hero.DEFAULT_DIE_SIDES,
+                         Character.DEFAULT_DAMAGE, Hero.DEFAULT_PIERCE_SHOT)
+Distribution = Tuple[float, ...]
+
+
+def hero_stats(hero: Hero) -> HeroStats:
+    """
+    Take the current stats of a hero, buffs included
+
+    :param hero: Hero to read
+    :return: Snapshot of the stats used by the solver
+    :rtype: HeroStats
+    """
+    return HeroStats(hero.health, hero.dice_count, hero.die_faces, hero.damage, hero.pierce_shot)
+
+
+def room_survival_probability(level: int, habitable: Optional[List[str]] = None, hero: HeroStats = DEFAULT_HERO,
+                              initiative: Optional[InitiativeEnum] = None) -> float:
+    """
+    Exact probability that the hero clears a room that has not been spawned yet. The spawn of MonsterController is
+    part of the calculation, every monster of the habitat is equally likely to appear
+
+    :param level: Level of the room
+    :param habitable: Monsters that inhabit the environment, None for any monster
+    :param hero: Stats of the hero entering the room
+    :param initiative: Side attacking first, None averages over the initiative roll
+    :return: Probability of survival between 0 and 1
+    :rtype: float
+    """
+    if initiative is None:
+        return sum(room_survival_probability(level, habitable, hero, side) for side in InitiativeEnum) / 2
+
+    monsters = _habitable_monsters(EnvironmentRecord(level, habitable))
+    spawns = [_monster_hits(monster.dice_count, monster.health, hero, initiative.value)
+              for monster in monsters]
+
+    # a single spawn is any of the habitable monsters
+    spawn = tuple(sum(hits) / len(spawns) for hits in zip(*spawns))
+    total = _no_hits(hero.health)
+    for _ in range(0, ceil(level / 2)):
+        total = _convolve(total, spawn, hero.health)
+
+    return _survival(total, hero.health)
+
+
+def environment_survival_probability(environment: Environment, hero: HeroStats = DEFAULT_HERO) -> float:
+    """
+    Exact probability that the hero clears an environment with the monsters and initiative it currently has
+
+    :param environment: Room being fought
+    :param hero: Stats of the hero fighting
+    :return: Probability of survival between 0 and 1
+    :rtype: float
+    """
+    initiative = environment.initiative.value
+    total = _no_hits(hero.health)
+    for monster in environment.monster_ctrl.monsters:
+        if not monster.is_dead:
+            total = _convolve(total, _monster_hits(monster.dice_count, monster.health, hero, initiative), hero.health)
+
+    return _survival(total, hero.health)
+
+
+@lru_cache(maxsize=None)
+def _monster_hits(monster_dice: int, monster_health: int, hero: HeroStats, initiative: int) -> Distribution:
+    """
+    Distribution of the hits a monster lands on the hero before dying. The last entry holds every outcome that
+    reaches the health of the hero
+
+    :param monster_dice: Dice count of the monster
+    :param monster_health: Health of the monster
+    :param hero: Stats of the hero
+    :param initiative: Value of the InitiativeEnum of the room
+    :return: Probability of taking each number of hits
+    """
+    cap = hero.health
+    hit = duel_probability(hero.dice_count, hero.die_faces, monster_dice, Monster.DEFAULT_DIE_SIDES,
+                           attacker_pierce=hero.pierce_shot)
+    hit_taken = duel_probability(monster_dice, Monster.DEFAULT_DIE_SIDES, hero.dice_count, hero.die_faces,
+                                 defender_pierce=hero.pierce_shot)
+
+    # a monster that can't be hurt lands hits until the hero dies
+    if hit == 0:
+        return _no_hits(cap, at=cap)
+
+    # hits landed while the hero misses, before the hero lands its next hit
+    stop = hit / (hit + (1 - hit) * hit_taken)
+    misses = tuple(stop * (1 - stop) ** taken for taken in range(0, cap)) + ((1 - stop) ** cap,)
+    attack = (1 - hit_taken, hit_taken)
+
+    # the hero kills the monster on its last hit, the monster attacks after every other one. With the monster
+    # attacking first, it also gets its attack in on the killing round
+    steps = ceil(monster_health / hero.damage)
+    attacks = steps if initiative == InitiativeEnum.MONSTER.value else steps - 1
+
+    hits = _no_hits(cap)
+    for _ in range(0, steps):
+        hits = _convolve(hits, misses, cap)
+    for _ in range(0, attacks):
+        hits = _convolve(hits, attack, cap)
+
+    return hits
+
+
+def _convolve(first: Sequence[float], second: Sequence[float], cap: int) -> Distribution:
+    """Add two independent hit counts, folding everything at or above cap into the last entry"""
+    total = [0.0] * (cap + 1)
+    for taken, chance in enumerate(first):
+        if chance == 0:
+            continue
+        for more, other in enumerate(second):
+            total[min(taken + more, cap)] += chance * other
+
+    return tuple(total)
+
+
+def _no_hits(cap: int, at: int = 0) -> Distribution:
+    """Distribution with every outcome on a single hit count"""
+    return tuple(1.0 if taken == at else 0.0 for taken in range(0, cap + 1))
+
+
+def _survival(hits: Distribution, health: int) -> float:
+    """Probability of taking less hits than the health of the hero"""
+    return min(1.0, sum(hits[:health]))
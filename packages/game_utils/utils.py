@@ -1,8 +1,9 @@
 """Helper functions that do not fit anywhere better than here"""
 
+import random
 from collections import namedtuple
-from random import randint
-from typing import List
+from random import Random
+from typing import Callable, List, Optional
 
 JunkLoot = namedtuple("JunkLoot", "name, desc")
 
@@ -19,35 +20,71 @@ def get_junk_loot():
     )
 
 
-def roll_dice(sides: int = 6) -> int:
+def get_rng(rng: Optional[Random] = None) -> Random:
+    """
+    Resolve the random generator used by a game object. Objects created without a generator share the generator of the
+    random module
+
+    :param rng: Generator given to the game object. Any object implementing random, randint, choice and getrandbits
+    :return: Generator to use
+    :rtype: Random
+    """
+    return random if rng is None else rng
+
+
+def roll_dice(sides: int = 6, rng: Optional[Random] = None) -> int:
     """
     Return a dice roll using the randint function
 
     :param int sides: Number of sides the die contains
+    :param rng: Generator to roll with, defaults to the random module
     :return: Random roll
     :rtype: int
     """
     if sides < 1:
         raise ValueError
 
-    return randint(1, sides)
+    return get_rng(rng).randint(1, sides)
+
+
+PROMPT = "DungeonDudes > "
+INVALID_INPUT = "\n[!] Invalid input, try again...\n"
+
 
+def parse_choice(value: str, choices: List[int]) -> Optional[int]:
+    """
+    Turn a line typed by the player into one of the choices
+
+    :param value: Line typed by the player
+    :param choices: Valid choices, -1 allows quitting with q
+    :return: The chosen option, None when the line is not a valid choice
+    :rtype: Optional[int]
+    """
+    if -1 in choices and value.lower() == "q":
+        return -1
+
+    if value.isdigit() and int(value) in choices:
+        return int(value)
 
-def get_user_input(choices: List[int]) -> int:
-    """Validate user input until the correct choice is made"""
-    valid_input = False
-    check_for_q = True if -1 in choices else False
+    return None
 
-    while not valid_input:
-        result = input("DungeonDudes > ")
-        if check_for_q:
-            if result.lower() in ["Q", "q"]:
-                return -1
 
-        if result.isdigit():
-            if int(result) in choices:
-                return int(result)
+def get_user_input(choices: List[int], read: Callable[[str], str] = input,
+                   write: Callable[[str], None] = print) -> int:
+    """
+    Validate user input until the correct choice is made
+
+    :param choices: Valid choices, -1 allows quitting with q
+    :param read: Reads a line from the player given a prompt
+    :param write: Writes a message to the player
+    :return: The chosen option
+    :rtype: int
+    """
+    while True:
+        choice = parse_choice(read(PROMPT), choices)
+        if choice is not None:
+            return choice
 
-        print(f"\n[!] Invalid input, try again...\n")
+        write(INVALID_INPUT)
 
 
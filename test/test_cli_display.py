@@ -0,0 +1,70 @@
+import unittest
+from io import StringIO
+
+from packages.game_utils.cli_display import FrameRenderer, format_description
+from packages.game_utils.game_controller import _get_environments
+
+
+class TestCliDisplay(unittest.TestCase):
+    def test_format_description(self):
+        """Test that descriptions are filled in, wrapped and only computed once per variant"""
+        cave = _get_environments()[0]
+        noise = "a loud thud..."
+        description = format_description(cave.desc, noise)
+
+        self.assertTrue(description.replace("\n  ", " ").endswith(noise))
+        self.assertTrue(all(len(line) <= 80 and line.startswith("  ") for line in description.split("\n")))
+
+        hits = format_description.cache_info().hits
+        self.assertIs(format_description(cave.desc, noise), description)
+        self.assertEqual(format_description.cache_info().hits, hits + 1)
+
+    def test_environment_catalogue(self):
+        """Test that the catalogue is read once and can't be modified"""
+        self.assertIs(_get_environments(), _get_environments())
+        self.assertIsInstance(_get_environments()[0].habitable, tuple)
+
+
+
+class TestFrameRenderer(unittest.TestCase):
+    def setUp(self) -> None:
+        self.stream = StringIO()
+        self.screen = FrameRenderer(self.stream, diff=True)
+
+    def test_single_write(self):
+        """Test that a frame is written whole"""
+        self.screen.draw(["Round 1:", "Health: 10"])
+        self.assertEqual(self.stream.getvalue(), "Round 1:\nHealth: 10\n")
+
+    def test_diff_update(self):
+        """Test that only the changed lines of a frame of the same kind are rewritten"""
+        self.screen.draw(["Round 1:", "Health: 10", "Actions"], "battle")
+        self.screen.write("log\n")
+        self.stream.seek(0)
+        self.stream.truncate()
+
+        self.screen.draw(["Round 2:", "Health: 10", "Actions"], "battle")
+        update = self.stream.getvalue()
+        self.assertTrue(update.startswith("\x1b7\x1b[4A"))
+        self.assertIn("\x1b[2KRound 2:", update)
+        self.assertNotIn("Health", update)
+        self.assertNotIn("Actions", update)
+        self.assertTrue(update.endswith("\x1b8"))
+
+    def test_full_redraw(self):
+        """Test that frames of another kind or size are redrawn whole"""
+        self.screen.draw(["Round 1:", "Health: 10"], "battle")
+        self.screen.draw(["Round 2:"], "battle")
+        self.screen.draw(["Round 2:"])
+        self.assertEqual(self.stream.getvalue(), "Round 1:\nHealth: 10\nRound 2:\nRound 2:\n")
+
+    def test_no_diff(self):
+        """Test that in place updates can be turned off"""
+        screen = FrameRenderer(self.stream, diff=False)
+        screen.draw(["Round 1:"], "battle")
+        screen.draw(["Round 2:"], "battle")
+        self.assertEqual(self.stream.getvalue(), "Round 1:\nRound 2:\n")
+
+
+if __name__ == '__main__':
+    unittest.main()
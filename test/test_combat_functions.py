@@ -4,6 +4,7 @@ from packages.characters.hero import Hero
 from packages.characters.monster import Monster
 from packages.environments.environment import Environment
 from packages.game_utils.combat_functions import duel
+from packages.game_utils.events import Died, DuelEnded, Hit
 from packages.environments.consumable_loot import HeavyHand, PierceShot
 
 
@@ -54,4 +55,22 @@ class TestDuel(TestCase):
         self.assertFalse(duel(self.hero, self.monster, self.spooky, debug=True))
         self.assertEqual(self.monster.health, 3)
 
+    def test_events(self):
+        """Test that a duel emits its events to an enabled sink"""
+        class _Collect:
+            enabled = True
 
+            def __init__(self):
+                self.events = []
+
+            def emit(self, event):
+                self.events.append(event)
+
+        sink = _Collect()
+        self.hero._combat_rolls = [6, 6, 3]
+        self.monster._combat_rolls = [3]
+        self.monster.takes_hit(2)
+        duel(self.hero, self.monster, self.spooky, sink, debug=True)
+
+        self.assertEqual(sink.events[:2], [Hit("Samurai Jack", "Imp", 1), Died("Imp")])
+        self.assertEqual(sink.events[-1], DuelEnded("Samurai Jack", "Imp"))
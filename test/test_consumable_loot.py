@@ -25,6 +25,18 @@ class TestConsumableLoot(unittest.TestCase):
         self.assertEqual(self.hero.die_faces, 12)
         potion.remove_affect(self.hero)
         self.assertEqual(self.hero.die_faces, 6)
+        self.assertIsInstance(self.hero.die_faces, int)
+
+    def test_buffs_expire(self):
+        """Test that consumed buffs all expire when the buffs are cleared"""
+        for potion in (AttackPotion(), LuckySeven(), HeavyHand(), PierceShot(), LuckySeven()):
+            self.hero.consume_loot(potion)
+        self.assertEqual((self.hero.dice_count, self.hero.die_faces, self.hero.damage), (4, 24, 2))
+        self.assertTrue(self.hero.pierce_shot)
+
+        self.hero.clear_buffs()
+        self.assertEqual((self.hero.dice_count, self.hero.die_faces, self.hero.damage), (3, 6, 1))
+        self.assertFalse(self.hero.pierce_shot)
 
     def test_health_potion(self):
         """Test that health potions increment health correctly"""
@@ -0,0 +1,74 @@
+import subprocess
+import sys
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest.mock import Mock
+
+from packages.game_utils.data_bundle import DataBundle
+from packages.game_utils.game_controller import _get_environments
+from packages.game_utils.monster_controller import MONSTER_REGISTRY
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+class TestDataBundle(unittest.TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.folder = Path(self.directory.name)
+        self.source = self.folder / "data"
+        self.source.write_text("a,b")
+        self.path = self.folder / "bundle"
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_parsed_once(self):
+        """Test that a file is only parsed again by a new process once it changes"""
+        parser = Mock(side_effect=lambda text: tuple(text.split(",")))
+        self.assertEqual(DataBundle(self.path).load(self.source, parser), ("a", "b"))
+        self.assertEqual(DataBundle(self.path).load(self.source, parser), ("a", "b"))
+        self.assertEqual(parser.call_count, 1)
+
+        self.source.write_text("a,b,c")
+        self.assertEqual(DataBundle(self.path).load(self.source, parser), ("a", "b", "c"))
+        self.assertEqual(parser.call_count, 2)
+
+    def test_corrupted_bundle(self):
+        """Test that a bundle that can't be read is rebuilt"""
+        self.path.write_bytes(b"not a bundle")
+        self.assertEqual(DataBundle(self.path).load(self.source, str), "a,b")
+        self.assertEqual(DataBundle(self.path).load(self.source, lambda text: None), "a,b")
+
+    def test_unwritable_bundle(self):
+        """Test that the data is still loaded when the bundle can't be written"""
+        bundle = DataBundle(self.folder / "missing" / "bundle")
+        self.assertEqual(bundle.load(self.source, str), "a,b")
+
+    def test_missing_source(self):
+        """Test that a missing data file is reported"""
+        with self.assertRaises(FileNotFoundError):
+            DataBundle(self.path).load(self.folder / "missing", str)
+
+    def test_startup_imports(self):
+        """Test that starting a game from the bundle does not import the modules only needed by options"""
+        # make sure the bundle of the game is up to date
+        _get_environments()
+        MONSTER_REGISTRY.monsters
+
+        script = "import sys, dungeon_dudes\n" \
+                 "from packages.game_utils.game_controller import DungeonDudes\n" \
+                 "from packages.game_utils.monster_controller import EnvironmentRecord, MonsterController\n" \
+                 "DungeonDudes('Jack', start=False)\n" \
+                 "MonsterController(EnvironmentRecord(1, None))\n" \
+                 "print(' '.join(sys.modules))\n"
+        modules = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True,
+                                 check=True).stdout.split()
+        for module in ("argparse", "json", "csv", "pickle", "fractions", "cProfile", "concurrent.futures",
+                       "packages.game_utils.replay", "packages.game_utils.snapshot", "packages.game_utils.survival",
+                       "packages.game_utils.probability", "packages.game_utils.combat_functions"):
+            self.assertNotIn(module, modules)
+
+
+if __name__ == '__main__':
+    unittest.main()
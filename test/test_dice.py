@@ -0,0 +1,90 @@
+import unittest
+
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.game_utils import dice
+from packages.game_utils.combat_functions import batch_attack_successful
+
+
+@unittest.skipIf(dice.np is None, "numpy is not installed")
+class TestBatchDice(unittest.TestCase):
+    def setUp(self) -> None:
+        self.dice = dice.BatchDice(seed=7)
+
+    def test_roll_shape(self):
+        """Test that rolls come back as a sorted matrix within the die faces"""
+        rolls = self.dice.roll(1000, 3, 6)
+        self.assertEqual(rolls.shape, (1000, 3))
+        self.assertTrue((rolls >= 1).all() and (rolls <= 6).all())
+        self.assertTrue((rolls[:, :-1] >= rolls[:, 1:]).all())
+
+        with self.assertRaises(ValueError):
+            self.dice.roll(10, 3, 0)
+
+    def test_seeded(self):
+        """Test that the same seed reproduces the same rolls"""
+        self.assertTrue((dice.BatchDice(3).roll(50, 3) == dice.BatchDice(3).roll(50, 3)).all())
+
+    def test_roll_for(self):
+        """Test that character buffs are respected"""
+        hero = Hero("Samurai Jack")
+        hero.pierce_shot = True
+        self.assertTrue((self.dice.roll_for(hero, 10) == 6).all())
+        self.assertEqual(self.dice.roll_for(Monster("Imp", 1, 2), 10).shape, (10, 2))
+
+    def test_batch_attack_successful(self):
+        """Test that the vectorized check matches the pairwise rules"""
+        attacker = dice.np.array([[6, 6, 3], [3, 2, 1], [5, 5, 5]])
+        defender = dice.np.array([[6, 5], [3, 3], [6, 6]])
+        self.assertEqual(batch_attack_successful(attacker, defender).tolist(), [True, False, False])
+
+    def test_resolve_duels(self):
+        """Test that chunked resolution counts every duel"""
+        hits = self.dice.resolve_duels(10_000, 3, 1, chunk_size=3_000)
+        self.assertTrue(0 < hits < 10_000)
+
+
+@unittest.skipIf(dice.np is None, "numpy is not installed")
+class TestPCG64Random(unittest.TestCase):
+    def setUp(self) -> None:
+        self.rng = dice.PCG64Random(seed=5, buffer_size=16)
+
+    def test_ranges(self):
+        """Test that every draw stays within its bounds"""
+        for _ in range(0, 100):
+            self.assertTrue(0 <= self.rng.random() < 1)
+            self.assertTrue(1 <= self.rng.randint(1, 6) <= 6)
+            self.assertIn(self.rng.choice("abc"), "abc")
+            self.assertLess(self.rng.getrandbits(12), 2 ** 12)
+
+    def test_state(self):
+        """Test that restoring a state replays the same draws"""
+        self.rng.random()
+        state = self.rng.getstate()
+        draws = [self.rng.randint(1, 20) for _ in range(0, 40)]
+        self.rng.setstate(state)
+        self.assertEqual(draws, [self.rng.randint(1, 20) for _ in range(0, 40)])
+
+    def test_state_between_blocks(self):
+        """Test that a state taken after drawing bits past the buffer restores both the buffer and the bits"""
+        self.rng.random()
+        self.rng.getrandbits(64)
+        state = self.rng.getstate()
+        draws = [self.rng.random() for _ in range(0, 40)] + [self.rng.getrandbits(64)]
+
+        other = dice.PCG64Random(seed=1, buffer_size=16)
+        other.setstate(state)
+        self.assertEqual(draws, [other.random() for _ in range(0, 40)] + [other.getrandbits(64)])
+
+    def test_game_generator(self):
+        """Test that a game can be played with the generator"""
+        from packages.game_utils.policies import GreedyPolicy
+        from packages.game_utils.simulation import HeadlessDungeonDudes
+
+        first = HeadlessDungeonDudes(GreedyPolicy(), rng=dice.PCG64Random(9)).play()
+        second = HeadlessDungeonDudes(GreedyPolicy(), rng=dice.PCG64Random(9)).play()
+        self.assertEqual(first, second)
+
+
+if __name__ == '__main__':
+    unittest.main()
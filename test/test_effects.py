@@ -0,0 +1,28 @@
+import unittest
+from unittest import TestCase
+
+from packages.characters.effects import CombatStats, Effect, apply_effects
+
+BASE = CombatStats(3, 6, 1, False)
+
+
+class TestEffects(TestCase):
+    def test_no_effect(self):
+        """Test that base stats are kept without effects"""
+        self.assertEqual(apply_effects(BASE, ()), BASE)
+
+    def test_stacking(self):
+        """Test that dice and damage add up and die faces multiply"""
+        effects = [Effect("A", dice_count=1), Effect("B", die_faces=2), Effect("C", damage=1),
+                   Effect("D", die_faces=2, pierce_shot=True)]
+        self.assertEqual(apply_effects(BASE, effects), CombatStats(4, 24, 2, True))
+        self.assertEqual(apply_effects(BASE, reversed(effects)), CombatStats(4, 24, 2, True))
+        self.assertEqual(Effect("A", dice_count=1).apply(BASE), CombatStats(4, 6, 1, False))
+
+    def test_min_dice(self):
+        """Test that penalties never take the last die"""
+        self.assertEqual(apply_effects(BASE, [Effect("Penalty", dice_count=-2)] * 2).dice_count, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,72 @@
+import unittest
+from io import StringIO
+from json import loads
+from unittest import TestCase
+
+from packages.game_utils.events import NULL_SINK, Died, DuelEnded, DuelRolled, Hit, JsonlSink, LootDropped, Miss, \
+    RoomEntered, TeeSink, TerminalRenderer
+
+
+class TestTerminalRenderer(TestCase):
+    def setUp(self) -> None:
+        self.stream = StringIO()
+        self.renderer = TerminalRenderer(stream=self.stream)
+
+    def test_buffered(self):
+        """Test that nothing is written until the flush"""
+        self.renderer.emit(Hit("Hero", "Imp", 1))
+        self.renderer.emit(Died("Imp"))
+        self.renderer.emit(LootDropped("Imp", 2))
+        self.assertEqual(self.stream.getvalue(), "")
+
+        self.renderer.flush()
+        self.assertEqual(self.stream.getvalue(), " [HIT] (Hero) -> hits -> (Imp) for 1!\n[!] Imp dies with that hit!\n"
+                                                 "[*] Imp dropped loot!\n")
+        self.renderer.flush()
+        self.assertEqual(self.stream.getvalue().count("HIT"), 1)
+
+    def test_rolls(self):
+        """Test that rolls are only rendered when asked for and rooms are left to the panels"""
+        rolled = DuelRolled("Hero", "Imp", (6, 2, 1), (3,))
+        self.renderer.emit(rolled)
+        self.renderer.emit(RoomEntered("Cave", 1, 1, "HERO"))
+        self.renderer.flush()
+        self.assertEqual(self.stream.getvalue(), "")
+
+        self.renderer.show_rolls = True
+        self.renderer.emit(rolled)
+        self.renderer.emit(Miss("Hero", "Imp"))
+        self.renderer.emit(DuelEnded("Hero", "Imp"))
+        self.renderer.flush()
+        self.assertEqual(self.stream.getvalue(), "Hero rolled: [6, 2, 1]\nImp rolled: [3]\n"
+                                                 "[MISS] (Hero) -> misses -> (Imp)!\n\n\n")
+
+
+class TestSinks(TestCase):
+    def test_jsonl(self):
+        """Test that every event is logged as a JSON line"""
+        stream = StringIO()
+        sink = JsonlSink(stream)
+        sink.emit(DuelRolled("Hero", "Imp", (6, 2, 1), (3,)))
+        sink.emit(Hit("Hero", "Imp", 2))
+        sink.flush()
+
+        records = [loads(line) for line in stream.getvalue().splitlines()]
+        self.assertEqual(records[0], {"event": "DuelRolled", "attacker": "Hero", "defender": "Imp",
+                                      "attacker_rolls": [6, 2, 1], "defender_rolls": [3]})
+        self.assertEqual(records[1]["damage"], 2)
+
+    def test_tee(self):
+        """Test that disabled sinks are skipped by a tee"""
+        stream = StringIO()
+        self.assertFalse(TeeSink(NULL_SINK).enabled)
+
+        sink = TeeSink(NULL_SINK, JsonlSink(stream))
+        self.assertTrue(sink.enabled)
+        sink.emit(Died("Imp"))
+        sink.flush()
+        self.assertEqual(loads(stream.getvalue()), {"event": "Died", "name": "Imp"})
+
+
+if __name__ == '__main__':
+    unittest.main()
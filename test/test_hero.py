@@ -1,6 +1,9 @@
 import unittest
 
 from packages.characters.hero import Hero
+from packages.characters.effects import CombatStats, Effect
+from packages.environments.consumable_loot import HeavyHand
+from packages.environments.loot import Loot
 
 
 class TestHero(unittest.TestCase):
@@ -32,5 +35,51 @@ class TestHero(unittest.TestCase):
         self.hero.damage += 1
         self.assertEqual(self.hero.damage, 2)
 
+    def test_set_loot(self):
+        """Test that loot is stacked by name and kept in quantity order"""
+        self.hero.set_loot(Loot("Bones", "Brittle bones, eeek!", qty=2))
+        self.hero.add_loot_many([HeavyHand(), Loot("Bones", "Brittle bones, eeek!", qty=3), HeavyHand()])
+        self.assertEqual(self.hero.loot_count, 2)
+        self.assertEqual([(loot.name, loot.quantity) for loot in self.hero.loot], [("Bones", 5), ("HeavyHand", 2)])
+
+    def test_consume_loot(self):
+        """Test that a stack leaves the bag once it is used up"""
+        self.hero.set_loot(HeavyHand())
+        self.hero.consume_loot(self.hero.loot[0])
+        self.assertEqual(self.hero.damage, 2)
+        self.assertFalse(self.hero.has_loot)
+        self.assertEqual(self.hero.consumables, [])
+
+    def test_bag_partitions(self):
+        """Test that the bag splits junk from consumables"""
+        bones = Loot("Bones", "Brittle bones, eeek!", qty=2)
+        hand = HeavyHand()
+        self.hero.add_loot_many([hand, bones])
+        self.assertEqual(self.hero.junk, [bones])
+        self.assertEqual(self.hero.consumables, [hand])
+
+    def test_buffs(self):
+        """Test that buffs stack on the base stats and expire together"""
+        penalty = Effect("Penalty", dice_count=-2)
+        self.hero.add_buff(penalty)
+        self.hero.add_buff(penalty)
+        self.assertEqual(self.hero.dice_count, 1)
+
+        self.hero.remove_buff(penalty)
+        self.hero.add_buff(Effect("Luck", die_faces=2))
+        self.assertEqual(self.hero.stats, CombatStats(1, 12, 1, False))
+
+        self.hero.clear_buffs()
+        self.assertEqual(self.hero.stats, CombatStats(3, 6, 1, False))
+        self.assertEqual(self.hero.buffs, ())
+
+        with self.assertRaises(ValueError):
+            self.hero.remove_buff(penalty)
+
+    def test_slots(self):
+        """Test that instances don't carry a per instance dict"""
+        self.assertFalse(hasattr(self.hero, "__dict__"))
+
+
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,72 @@
+from unittest import TestCase
+
+from packages.environments.consumable_loot import AttackPotion
+from packages.environments.inventory import Inventory
+from packages.environments.loot import Loot
+from packages.environments.loot_types import LootStack, loot_type
+
+
+class TestInventory(TestCase):
+    def setUp(self) -> None:
+        self.bag = Inventory()
+        self.bones = Loot("Bones", "Brittle bones, eeek!", qty=2)
+        self.hoof = Loot("Hoof", "The fuck...", qty=5)
+
+    def test_add_merges_by_name(self):
+        """Test that loot of the same name is stacked"""
+        self.bag.add(self.bones)
+        self.bag.add(Loot("Bones", "Brittle bones, eeek!", qty=4))
+        self.assertEqual(len(self.bag), 1)
+        self.assertEqual(self.bag.get("Bones").quantity, 6)
+        self.assertIn("Bones", self.bag)
+        self.assertIsNone(self.bag.get("Hoof"))
+
+    def test_quantity_order(self):
+        """Test that the bag is read largest quantity first"""
+        self.bag.add_many([self.bones, self.hoof, AttackPotion()])
+        self.assertEqual([loot.name for loot in self.bag], ["Hoof", "Bones", "Attack Potion"])
+
+        self.bag.add(Loot("Bones", "Brittle bones, eeek!", qty=10))
+        self.assertEqual([loot.name for loot in self.bag.items], ["Bones", "Hoof", "Attack Potion"])
+
+    def test_remove(self):
+        """Test that a stack can be removed"""
+        self.bag.add_many([self.bones, self.hoof])
+        self.bag.remove(self.bones)
+        self.assertEqual(self.bag.items, [self.hoof])
+
+        with self.assertRaises(KeyError):
+            self.bag.remove(self.bones)
+
+    def test_partitions(self):
+        """Test that junk and consumables are kept apart"""
+        potion = AttackPotion()
+        self.bag.add_many([self.bones, potion, self.hoof])
+        self.assertEqual(self.bag.junk, [self.hoof, self.bones])
+        self.assertEqual(self.bag.consumable, [potion])
+
+    def test_touch_drops_empty_stack(self):
+        """Test that a stack that ran out leaves the bag and its partition"""
+        potion = AttackPotion()
+        self.bag.add_many([self.bones, potion])
+        potion.decrement_qty()
+        self.bag.touch(potion)
+        self.assertNotIn(potion.name, self.bag)
+        self.assertEqual(self.bag.consumable, [])
+        self.assertEqual(self.bag.items, [self.bones])
+
+    def test_empty_stack_not_added(self):
+        """Test that adding an empty stack leaves the bag untouched"""
+        self.bag.add(Loot("Bones", "Brittle bones, eeek!", qty=0))
+        self.assertEqual(len(self.bag), 0)
+        self.assertEqual(self.bag.junk, [])
+
+    def test_add_loot_stack(self):
+        """Test that a LootStack only becomes a Loot object for a new kind of loot"""
+        self.bag.add(self.bones)
+        self.bag.add(LootStack(loot_type("Bones").type_id, 3))
+        self.assertIs(self.bag.get("Bones"), self.bones)
+        self.assertEqual(self.bones.quantity, 5)
+
+        self.bag.add(LootStack(loot_type(AttackPotion.NAME).type_id, 1))
+        self.assertIsInstance(self.bag.get(AttackPotion.NAME), AttackPotion)
@@ -35,5 +35,6 @@ class TestLoot(TestCase):
         self.loot.decrement_qty()
         self.assertFalse(self.loot.exists)
 
-
-
+    def test_slots(self):
+        """Test that instances don't carry a per instance dict"""
+        self.assertFalse(hasattr(self.loot, "__dict__"))
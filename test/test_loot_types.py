@@ -0,0 +1,43 @@
+import unittest
+from unittest import TestCase
+
+from packages.environments.consumable_loot import AttackPotion, ConsumableLoot
+from packages.environments.loot import Loot
+from packages.environments.loot_types import CONSUMABLE_DROPS, CONSUMABLE_TYPE_IDS, JUNK_TYPE_IDS, LOOT_TYPES, \
+    LootStack, loot_type
+from packages.game_utils.utils import get_junk_loot
+
+
+class TestLootTypes(TestCase):
+    def test_registry(self):
+        """Test that every junk and consumable loot is registered once"""
+        self.assertEqual(len(JUNK_TYPE_IDS), len(get_junk_loot()))
+        self.assertEqual(len(LOOT_TYPES), len(JUNK_TYPE_IDS) + len(CONSUMABLE_TYPE_IDS))
+        self.assertEqual([loot_type.type_id for loot_type in LOOT_TYPES], list(range(0, len(LOOT_TYPES))))
+        self.assertEqual(loot_type("Bones").desc, "Brittle bones, eeek!")
+
+        with self.assertRaises(KeyError):
+            loot_type("Excalibur")
+
+    def test_stack(self):
+        """Test that a stack reads its name from the registry and materializes to Loot"""
+        stack = LootStack(loot_type("Hoof").type_id, 7)
+        self.assertEqual(stack.name, "Hoof")
+        self.assertEqual(stack.description, "The fuck...")
+
+        loot = stack.materialize()
+        self.assertIs(type(loot), Loot)
+        self.assertEqual((loot.name, loot.quantity), ("Hoof", 7))
+
+    def test_consumable_stack(self):
+        """Test that consumable stacks materialize to their ConsumableLoot class"""
+        stack = LootStack(loot_type(AttackPotion.NAME).type_id, 3)
+        loot = stack.materialize()
+        self.assertIsInstance(loot, AttackPotion)
+        self.assertIsInstance(loot, ConsumableLoot)
+        self.assertEqual(loot.quantity, 3)
+        self.assertTrue(all(drop.quantity == 1 for drop in CONSUMABLE_DROPS))
+
+
+if __name__ == '__main__':
+    unittest.main()
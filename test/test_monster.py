@@ -1,4 +1,5 @@
 import unittest
+from random import Random
 
 from packages.characters.monster import Monster
 
@@ -29,6 +30,33 @@ class TestMonster(unittest.TestCase):
         self.imp.takes_hit()
         self.assertTrue(self.imp.is_dead)
 
+    def test_slots(self):
+        """Test that instances don't carry a per instance dict"""
+        self.assertFalse(hasattr(self.imp, "__dict__"))
+
+    def test_lazy_loot(self):
+        """Test that loot is only rolled on first access and always rolls the same for the same seed"""
+        first = Monster("Ogre", 2, 3, rng=Random(7))
+        second = Monster("Ogre", 2, 3, rng=Random(7))
+        self.assertIsNotNone(first._loot_seed)
+
+        self.assertEqual(first.loot, second.loot)
+        self.assertIsNone(first._loot_seed)
+        self.assertIs(first.loot, first.loot)
+        self.assertEqual(first.loot_count, len(first.loot))
+        for loot in first.loot:
+            if loot.loot_type.consumable:
+                continue
+            self.assertGreaterEqual(loot.quantity, Monster.MIN_JUNK_QTY)
+            self.assertLessEqual(loot.quantity, Monster.MAX_JUNK_QTY)
+
+    def test_set_loot_keeps_rolled_loot(self):
+        """Test that adding loot by hand does not skip the rolled loot"""
+        first = Monster("Ogre", 2, 3, rng=Random(7))
+        second = Monster("Ogre", 2, 3, rng=Random(7))
+        first.set_loot(second.loot[0])
+        self.assertEqual(first.loot_count, second.loot_count + 1)
+
 
 if __name__ == '__main__':
     unittest.main()
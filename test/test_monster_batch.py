@@ -0,0 +1,76 @@
+from random import Random
+from unittest import TestCase
+
+from packages.characters.effects import Effect
+from packages.characters.hero import Hero
+from packages.environments.environment import InitiativeEnum
+from packages.game_utils.monster_batch import MonsterBatch
+from packages.game_utils.monster_controller import EnvironmentRecord, MonsterController, MonsterRecords
+
+
+class TestMonsterBatch(TestCase):
+    def setUp(self) -> None:
+        kinds = (MonsterRecords("Imp", 1, 1, "squeak"), MonsterRecords("Ogre", 3, 3, "roar"))
+        self.batch = MonsterBatch(kinds, [1, 0, 0, 1], Random(2))
+
+    def test_spawn(self):
+        """Test that a batch spawns by the rules of the MonsterController"""
+        record = EnvironmentRecord(9, ("Troll", "Ogre", "Golem", "Hag"))
+        batch = MonsterBatch.spawn(record, Random(5))
+        monsters = [batch.record(index) for index in batch.alive()]
+        strength = [monster.health + monster.dice_count for monster in monsters]
+
+        self.assertEqual(batch.monster_count, 5)
+        self.assertTrue({monster.name for monster in monsters} <= set(record.habitable))
+        self.assertEqual(strength, sorted(strength, reverse=True))
+
+    def test_hit_and_clean_up(self):
+        """Test that hits mark the dead and clean up compacts the arrays in order"""
+        self.assertFalse(self.batch.hit(0, 2))
+        self.assertTrue(self.batch.hit(1))
+        self.assertEqual(self.batch.monster_count, 3)
+        self.assertEqual(len(self.batch), 4)
+
+        with self.assertRaises(ValueError):
+            self.batch.hit(1)
+
+        self.batch.clean_up()
+        self.assertEqual(len(self.batch), 3)
+        self.assertEqual(list(self.batch.health), [1, 1, 3])
+        self.assertEqual(self.batch.record(0).name, "Ogre")
+
+    def test_apply_hits(self):
+        """Test that a mask hits every selected monster at once"""
+        self.assertEqual(self.batch.apply_hits([True, True, False, True]), 1)
+        self.assertEqual(list(self.batch.health), [2, 0, 1, 2])
+        self.assertEqual(list(self.batch.dead), [0, 1, 0, 0])
+        self.assertEqual(list(self.batch.alive()), [0, 2, 3])
+
+    def test_from_controller(self):
+        """Test that the living monsters of a controller are packed"""
+        controller = MonsterController(EnvironmentRecord(5, None), Random(1))
+        controller.monsters[0].is_dead = True
+        batch = MonsterBatch.from_controller(controller)
+        self.assertEqual(batch.monster_count, 2)
+        self.assertEqual(batch.record(0).name, controller.monsters[1].name)
+
+    def test_resolve_round(self):
+        """Test that a round is fought until every monster dies"""
+        hero = Hero("Samurai Jack", Random(3))
+        hero.health = 1000
+        rounds = 0
+        while self.batch.monster_count > 0:
+            self.batch.resolve_round(hero, InitiativeEnum.HERO)
+            rounds += 1
+
+        self.assertEqual(len(self.batch), 0)
+        self.assertLess(hero.health, 1000)
+        self.assertGreater(rounds, 1)
+
+    def test_round_clears_buffs(self):
+        """Test that buffs only last the round, like in the game"""
+        hero = Hero("Samurai Jack", Random(3))
+        hero.health = 1000
+        hero.add_buff(Effect("Penalty", dice_count=-2))
+        self.batch.resolve_round(hero, InitiativeEnum.HERO)
+        self.assertEqual(hero.buffs, ())
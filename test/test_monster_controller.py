@@ -1,6 +1,11 @@
+import os
+from pathlib import Path
+from tempfile import TemporaryDirectory
 from unittest import TestCase
+from unittest.mock import patch
 
-from packages.game_utils.monster_controller import MonsterController, EnvironmentRecord
+from packages.game_utils.monster_controller import MonsterController, EnvironmentRecord, MonsterRegistry, \
+    MONSTER_REGISTRY
 from packages.environments.environment import Environment
 
 
@@ -31,5 +36,47 @@ class TestMonsterController(TestCase):
         self.assertEqual(len(monster_controller.monsters), 1)
 
 
+class TestMonsterRegistry(TestCase):
+    def setUp(self) -> None:
+        self.directory = TemporaryDirectory()
+        self.path = Path(self.directory.name) / "monsters"
+        self.path.write_text("Name,StartHealth,DiceCount,MonsterNoise\nImp,1,2,squeak\nOgre,3,3,roar\nbad line\n")
+        self.registry = MonsterRegistry(self.path)
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+
+    def test_lookup(self):
+        """Test that records are parsed once and indexed by lowercase name and habitat"""
+        with patch("builtins.print"):
+            self.assertEqual(len(self.registry.monsters), 2)
+        self.assertEqual(self.registry.get("IMP")[0].dice_count, 2)
+        self.assertEqual(self.registry.get("Wraith"), [])
+        self.assertEqual([monster.name for monster in self.registry.habitable(["ogre"])], ["Ogre"])
+        self.assertIs(self.registry.habitable(["ogre"]), self.registry.habitable(["OGRE"]))
+        self.assertEqual(len(self.registry.habitable(["Wraith"])), 2)
+        self.assertEqual(len(self.registry.habitable(None)), 2)
+
+    def test_no_io_when_cached(self):
+        """Test that spawning rooms does not read the file again"""
+        with patch("builtins.print"):
+            self.registry.monsters
+        with patch.object(MonsterRegistry, "_load") as load:
+            for _ in range(0, 10):
+                self.registry.habitable(["Imp"])
+            load.assert_not_called()
 
+    def test_mtime_invalidation(self):
+        """Test that a modified file is loaded again"""
+        with patch("builtins.print"):
+            self.assertEqual(len(self.registry.monsters), 2)
+        self.path.write_text("Troll,1,1,thud\n")
+        os.utime(self.path, ns=(0, 0))
+        self.registry._checked = None
+        self.assertEqual([monster.name for monster in self.registry.monsters], ["Troll"])
 
+    def test_default_registry(self):
+        """Test that the game data is loaded with numeric stats"""
+        monster = MONSTER_REGISTRY.get("troll")[0]
+        self.assertIsInstance(monster.health, int)
+        self.assertIsInstance(monster.dice_count, int)
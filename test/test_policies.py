@@ -0,0 +1,75 @@
+import unittest
+from random import Random
+from unittest.mock import patch
+
+from packages.environments.consumable_loot import AttackPotion, HealthPotion
+from packages.environments.environment import Environment
+from packages.game_utils.policies import ExpectedValuePolicy, GreedyPolicy, HumanPolicy, PromptEnum, RandomPolicy, \
+    ThresholdPolicy
+from packages.game_utils.simulation import HeadlessDungeonDudes, run_games
+
+
+class TestPolicies(unittest.TestCase):
+    def setUp(self):
+        self.game = HeadlessDungeonDudes(GreedyPolicy(), seed=4)
+        self.game.level = 6
+        self.game.environment = Environment("Cave", "", None, 6, self.game.rng)
+
+    def test_human_policy(self):
+        """Test that the human policy asks the keyboard"""
+        with patch("builtins.input", return_value="2"):
+            self.assertEqual(HumanPolicy().decide(self.game, PromptEnum.START, [1, 2, -1]), 2)
+
+    def test_random_policy(self):
+        """Test that the random policy never quits and follows the generator of the game"""
+        policy = RandomPolicy()
+        decisions = [policy.decide(self.game, PromptEnum.AFTER_ROOM, [1, 2, 3, -1]) for _ in range(0, 200)]
+        self.assertEqual(set(decisions), {1, 2, 3})
+        self.assertEqual(policy.decide(self.game, PromptEnum.BAG, [-1]), -1)
+
+        self.game.rng = Random(1)
+        rng = Random(1)
+        self.assertEqual([policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]) for _ in range(0, 20)],
+                         [rng.choice([1, 2, 3]) for _ in range(0, 20)])
+
+    def test_threshold_policy(self):
+        """Test that the threshold policy runs away once hurt"""
+        policy = ThresholdPolicy(health=4)
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 1)
+        self.game.hero.health = 4
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 3)
+        self.assertEqual(policy.decide(self.game, PromptEnum.AFTER_ROOM, [1, 2, 3, -1]), 3)
+
+    def test_threshold_never_fights(self):
+        """Test that a threshold the hero starts at or below is refused, the hero would run away forever"""
+        with self.assertRaises(ValueError):
+            ThresholdPolicy(health=10)
+
+    def test_expected_value_fights(self):
+        """Test that the expected value policy fights when it has nothing better to do"""
+        policy = ExpectedValuePolicy()
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 1)
+        self.assertEqual(policy.decide(self.game, PromptEnum.BAG, [-1]), -1)
+
+        self.game.environment = None
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 1)
+
+    def test_expected_value_consumables(self):
+        """Test that the expected value policy drinks the most useful consumable once in danger"""
+        policy = ExpectedValuePolicy()
+        self.game.hero.add_loot_many([AttackPotion(), HealthPotion()])
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 1)
+
+        self.game.hero.health = 2
+        self.assertEqual(policy.decide(self.game, PromptEnum.BATTLE, [1, 2, 3]), 2)
+        self.assertEqual(policy.decide(self.game, PromptEnum.BAG, [0, 1, -1]), 1)
+
+    def test_expected_value_beats_greedy(self):
+        """Test that the expected value policy wins more of the same games than the greedy one"""
+        greedy = sum(result.won for result in run_games(40, GreedyPolicy(), max_level=5, rng=Random(2)))
+        expected = sum(result.won for result in run_games(40, ExpectedValuePolicy(), max_level=5, rng=Random(2)))
+        self.assertGreater(expected, greedy)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,61 @@
+import unittest
+from itertools import product
+
+from packages.characters.hero import Hero
+from packages.characters.monster import Monster
+from packages.environments.consumable_loot import LuckySeven, PierceShot
+from packages.game_utils.probability import duel_probability, hit_probability, probability_table
+
+
+def _brute_force(attacker_dice, attacker_faces, defender_dice, defender_faces):
+    """Enumerate every roll to get the reference odds"""
+    hits = total = 0
+    for attacker in product(range(1, attacker_faces + 1), repeat=attacker_dice):
+        attacker = sorted(attacker, reverse=True)
+        for defender in product(range(1, defender_faces + 1), repeat=defender_dice):
+            defender = sorted(defender, reverse=True)
+            total += 1
+            hits += any(attack > defend for attack, defend in zip(attacker, defender))
+    return hits / total
+
+
+class TestProbability(unittest.TestCase):
+    def setUp(self) -> None:
+        self.hero = Hero("Samurai Jack")
+        self.monster = Monster("Imp", 1, 2)
+
+    def test_matches_brute_force(self):
+        """Test the exact odds against full enumeration"""
+        for matchup in [(3, 6, 1, 6), (3, 6, 3, 6), (1, 6, 3, 6), (4, 12, 2, 6), (2, 6, 3, 12)]:
+            self.assertAlmostEqual(duel_probability(*matchup), _brute_force(*matchup))
+
+    def test_pierce_shot(self):
+        """Test that pierce shot only fails against a wall of max rolls and can't be hit"""
+        self.assertAlmostEqual(duel_probability(3, 6, 2, 6, attacker_pierce=True), 1 - (1 / 36))
+        self.assertEqual(duel_probability(3, 6, 3, 6, defender_pierce=True), 0.0)
+
+    def test_invalid(self):
+        """Test that impossible dice are rejected"""
+        with self.assertRaises(ValueError):
+            duel_probability(0, 6, 1, 6)
+
+    def test_hit_probability(self):
+        """Test that the buffs of the hero change the odds"""
+        base = hit_probability(self.hero, self.monster)
+        self.assertAlmostEqual(base, duel_probability(3, 6, 2, 6))
+
+        LuckySeven().consume(self.hero)
+        self.assertGreater(hit_probability(self.hero, self.monster), base)
+
+        PierceShot().consume(self.hero)
+        self.assertEqual(hit_probability(self.monster, self.hero), 0.0)
+
+    def test_probability_table(self):
+        """Test that both directions of every matchup are precomputed"""
+        table = probability_table(max_dice=3, faces=(12,))
+        self.assertEqual(len(table), 18)
+        self.assertEqual(table[(3, 12, 1, 6)], duel_probability(3, 12, 1, 6))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+import os
+import pstats
+import tempfile
+import unittest
+from io import StringIO
+
+from packages.environments.environment import Environment
+from packages.game_utils import combat_functions
+from packages.game_utils.policies import GreedyPolicy
+from packages.game_utils.profiling import PhaseTimers, Profiler
+from packages.game_utils.simulation import HeadlessDungeonDudes
+
+
+class TestProfiling(unittest.TestCase):
+    def test_phase_timers(self):
+        """Test that wrapped calls are counted and timed"""
+        timers = PhaseTimers()
+        double = timers.wrap("math", lambda value: value * 2)
+        self.assertEqual(double(2), 4)
+        self.assertEqual(double(3), 6)
+        self.assertEqual(timers.stats["math"].calls, 2)
+        self.assertGreaterEqual(timers.stats["math"].seconds, 0)
+        self.assertIn("math", timers.summary())
+
+    def test_profile_game(self):
+        """Test that a profiled game counts every phase and leaves the game untouched afterwards"""
+        init, duel = Environment.__init__, combat_functions.duel
+        stream = StringIO()
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "game.prof")
+            with Profiler(path, stream) as profiler:
+                self.assertIsNot(Environment.__init__, init)
+                HeadlessDungeonDudes(GreedyPolicy(), max_level=5, seed=3).play()
+
+            self.assertGreater(pstats.Stats(path).total_calls, 0)
+
+        stats = profiler.timers.stats
+        self.assertGreater(stats["environment"].calls, 0)
+        self.assertGreater(stats["duel"].calls, 0)
+        self.assertGreater(stats["loot_transfer"].calls, 0)
+        self.assertIn("duel", stream.getvalue())
+        self.assertIs(Environment.__init__, init)
+        self.assertIs(combat_functions.duel, duel)
+        self.assertFalse(profiler.running)
+
+    def test_same_game(self):
+        """Test that profiling does not change the outcome of a game"""
+        expected = HeadlessDungeonDudes(GreedyPolicy(), max_level=10, seed=8).play()
+        with Profiler(stream=StringIO(), cprofile=False):
+            result = HeadlessDungeonDudes(GreedyPolicy(), max_level=10, seed=8).play()
+        self.assertEqual(result, expected)
+
+    def test_start_twice(self):
+        """Test that a running profiler can't be started again"""
+        profiler = Profiler(cprofile=False)
+        profiler.start()
+        try:
+            with self.assertRaises(RuntimeError):
+                profiler.start()
+        finally:
+            profiler.stop()
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,63 @@
+import unittest
+from io import StringIO
+from json import dumps, loads
+from random import Random
+from unittest import TestCase
+
+from packages.game_utils.policies import GreedyPolicy
+from packages.game_utils.replay import REPLAY_VERSION, ReplayWriter, decode, read_records, verify
+from packages.game_utils.simulation import HeadlessDungeonDudes
+
+
+class TestReplay(TestCase):
+    def setUp(self) -> None:
+        self.log = StringIO()
+        writer = ReplayWriter(self.log)
+        for seed in range(0, 5):
+            HeadlessDungeonDudes(GreedyPolicy(), max_level=4, seed=seed, recorder=writer).play()
+        self.lines = self.log.getvalue().splitlines()
+
+    def test_record(self):
+        """Test that every game is logged once with its seed and settings"""
+        self.assertEqual(len(self.lines), 5)
+        records = list(read_records(StringIO(self.log.getvalue())))
+        self.assertEqual([record.seed for record in records], list(range(0, 5)))
+        self.assertEqual(records[0].settings, {"max_level": 4, "level": 1, "environments": None})
+        self.assertEqual(records[0].decisions[0], 1)
+
+    def test_verify(self):
+        """Test that recorded games replay to the same final state"""
+        results = list(verify(StringIO(self.log.getvalue())))
+        self.assertEqual(len(results), 5)
+        self.assertTrue(all(result.error is None for result in results))
+
+    def test_mismatch(self):
+        """Test that a replay not matching its log is reported"""
+        data = loads(self.lines[0])
+        data["final"]["level"] += 1
+        truncated = loads(self.lines[1])
+        truncated["decisions"] = truncated["decisions"][:1]
+        extra = loads(self.lines[2])
+        extra["decisions"].append(1)
+
+        log = StringIO("\n".join(dumps(line) for line in (data, truncated, extra)))
+        errors = [result.error for result in verify(log)]
+        self.assertIn("instead of", errors[0])
+        self.assertIn("Ran out of decisions", errors[1])
+        self.assertIn("every decision", errors[2])
+
+    def test_version(self):
+        """Test that logs of another version are refused"""
+        data = loads(self.lines[0])
+        data["version"] = REPLAY_VERSION + 1
+        with self.assertRaises(ValueError):
+            decode(dumps(data))
+
+    def test_seedless_game(self):
+        """Test that a game without a seed can't be recorded"""
+        with self.assertRaises(ValueError):
+            HeadlessDungeonDudes(GreedyPolicy(), max_level=1, rng=Random(1), recorder=ReplayWriter(StringIO())).play()
+
+
+if __name__ == '__main__':
+    unittest.main()
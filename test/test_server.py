@@ -0,0 +1,182 @@
+import asyncio
+import gc
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from packages.game_utils.policies import GreedyPolicy, PromptEnum
+from packages.game_utils.server import GameServer, ServerScreen, Session, SessionGame, SessionStore, \
+    SqliteSessionStore
+from packages.game_utils.utils import PROMPT
+
+ENCODED_PROMPT = PROMPT.encode("utf-8")
+
+
+def _line(session: Session, policy: GreedyPolicy) -> str:
+    """Line the policy would type at the prompt of a live session"""
+    decision = policy.decide(session.game, session.prompt.kind, session.prompt.choices)
+    return "q" if decision == -1 else str(decision)
+
+
+class TestSession(unittest.TestCase):
+    def test_play_until_the_end(self):
+        """Test that a session driven line by line plays a whole game and ends without exiting"""
+        session = Session(SessionGame("Jack", ServerScreen(), seed=3))
+        policy = GreedyPolicy()
+        text = session.start()
+        self.assertTrue(text.endswith(PROMPT))
+        self.assertIs(session.prompt.kind, PromptEnum.START)
+
+        for _ in range(0, 10000):
+            if session.over:
+                break
+            text = session.answer(_line(session, policy))
+
+        self.assertTrue(session.over)
+        self.assertIsNone(session.prompt)
+        self.assertIn("Thanks for playing!", text)
+        self.assertEqual(session.answer("1"), "")
+
+    def test_invalid_input(self):
+        """Test that an invalid line is refused without moving the game"""
+        session = Session(SessionGame("Jack", ServerScreen(), seed=3))
+        session.start()
+        self.assertIn("Invalid input", session.answer("7"))
+        self.assertIs(session.prompt.kind, PromptEnum.START)
+
+    def _compacted_game(self, store: SessionStore):
+        """Play a game compacting it before every line, next to the same game never compacted"""
+        live = Session(SessionGame("Jack", ServerScreen(), seed=5))
+        compacted = Session(SessionGame("Jack", ServerScreen(), seed=5), store, key=3)
+        policy = GreedyPolicy()
+        self.assertEqual(compacted.start(), live.start())
+
+        for _ in range(0, 10000):
+            if live.over:
+                break
+            line = _line(live, policy)
+            compacted.compact()
+            self.assertTrue(compacted.compacted)
+            self.assertEqual(len(store), 1)
+            self.assertEqual(compacted.answer(line), live.answer(line))
+
+        self.assertTrue(live.over)
+        self.assertTrue(compacted.over)
+        self.assertEqual(len(store), 0)
+
+    def test_compact(self):
+        """Test that a compacted session plays on exactly like the game it was, across snapshots"""
+        with patch("packages.game_utils.server.REPLAY_LIMIT", 4):
+            self._compacted_game(SessionStore())
+
+    def test_sqlite_store(self):
+        """Test that compacted sessions can be kept in SQLite"""
+        store = SqliteSessionStore()
+        try:
+            self._compacted_game(store)
+        finally:
+            store.close()
+
+    def test_idle_memory(self):
+        """Test that a compacted session only holds a few hundred bytes"""
+        count = 200
+        gc.collect()
+        tracemalloc.start()
+        try:
+            store = SessionStore()
+            sessions = [Session(SessionGame(f"Hero{index}", ServerScreen(), seed=index), store, index)
+                        for index in range(0, count)]
+            for session in sessions:
+                session.start()
+                session.answer("1")
+            gc.collect()
+            live = tracemalloc.get_traced_memory()[0] / count
+
+            for session in sessions:
+                session.compact()
+            gc.collect()
+            idle = tracemalloc.get_traced_memory()[0] / count
+        finally:
+            tracemalloc.stop()
+
+        self.assertLess(idle, 500)
+        self.assertGreater(live, 10 * idle)
+        self.assertEqual(len(store), count)
+
+
+class TestGameServer(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        self.game_server = GameServer(seed=1)
+        self.server = await self.game_server.start()
+        self.port = self.server.sockets[0].getsockname()[1]
+
+    async def asyncTearDown(self) -> None:
+        self.server.close()
+        await self.server.wait_closed()
+
+    async def _connect(self, username: str):
+        reader, writer = await asyncio.open_connection("127.0.0.1", self.port)
+        await reader.readuntil(ENCODED_PROMPT)
+        writer.write(f"{username}\n".encode("utf-8"))
+        await writer.drain()
+        return reader, writer
+
+    async def _disconnected(self):
+        """Wait for the server to notice that every client left"""
+        for _ in range(0, 500):
+            if self.game_server.sessions == 0:
+                break
+            await asyncio.sleep(.01)
+        self.assertEqual(self.game_server.sessions, 0)
+
+    async def test_loopback_game(self):
+        """Test that a client plays over a socket and is disconnected once it quits"""
+        reader, writer = await self._connect("Jack")
+        menu = await reader.readuntil(ENCODED_PROMPT)
+        self.assertIn(b"Jack", menu)
+        self.assertEqual(self.game_server.sessions, 1)
+
+        writer.write(b"q\n")
+        await writer.drain()
+        ending = await asyncio.wait_for(reader.read(), 5)
+        self.assertIn(b"Thanks for playing!", ending)
+        writer.close()
+        await self._disconnected()
+
+    async def test_idle_sessions(self):
+        """Test that many players can wait at a prompt at once, and still play afterwards"""
+        clients = [await self._connect(f"Hero{index}") for index in range(0, 500)]
+        for reader, _ in clients:
+            await reader.readuntil(ENCODED_PROMPT)
+        self.assertEqual(self.game_server.sessions, 500)
+
+        reader, writer = clients[-1]
+        writer.write(b"1\n")
+        await writer.drain()
+        self.assertIn(ENCODED_PROMPT, await reader.readuntil(ENCODED_PROMPT))
+
+        for _, writer in clients:
+            writer.close()
+        await self._disconnected()
+
+    async def test_idle_compaction(self):
+        """Test that an idle player is compacted and plays on with the next line"""
+        self.game_server.idle_after = .05
+        reader, writer = await self._connect("Jack")
+        await reader.readuntil(ENCODED_PROMPT)
+        for _ in range(0, 100):
+            if len(self.game_server.store) == 1:
+                break
+            await asyncio.sleep(.01)
+        self.assertEqual(len(self.game_server.store), 1)
+
+        writer.write(b"1\n")
+        await writer.drain()
+        self.assertIn(ENCODED_PROMPT, await reader.readuntil(ENCODED_PROMPT))
+        writer.close()
+        await self._disconnected()
+        self.assertEqual(len(self.game_server.store), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
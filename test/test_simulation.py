@@ -0,0 +1,104 @@
+import unittest
+from io import StringIO
+from unittest.mock import patch
+
+from packages.game_utils.policies import GreedyPolicy, PromptEnum, RandomPolicy
+from packages.game_utils.simulation import HeadlessDungeonDudes, GameResult, SimulationStats, compare_policies, \
+    run_games, simulate, sweep
+
+
+class QuitPolicy(GreedyPolicy):
+    def decide(self, game, prompt, choices):
+        return -1
+
+
+class TestSimulation(unittest.TestCase):
+    def test_headless_game(self):
+        """Test that a game plays until the hero dies without printing anything"""
+        with patch("sys.stdout", new_callable=StringIO) as stdout:
+            result = HeadlessDungeonDudes(GreedyPolicy()).play()
+
+        self.assertEqual(stdout.getvalue(), "")
+        self.assertIsInstance(result, GameResult)
+        self.assertFalse(result.won)
+        self.assertLess(result.health, 1)
+
+    def test_max_level(self):
+        """Test that clearing the last level wins the game"""
+        game = HeadlessDungeonDudes(GreedyPolicy(), max_level=1)
+        game.hero.health = 1000
+        result = game.play()
+        self.assertTrue(result.won)
+        self.assertEqual(result.level, 2)
+
+    def test_policy_quit(self):
+        """Test that the policy can end the game from the start screen"""
+        result = HeadlessDungeonDudes(QuitPolicy()).play()
+        self.assertEqual(result.level, 1)
+        self.assertEqual(result.health, 10)
+
+    def test_seed_reproduces_game(self):
+        """Test that a seed fully reproduces a game"""
+        first = HeadlessDungeonDudes(GreedyPolicy(), max_level=30, seed=11).play()
+        second = HeadlessDungeonDudes(GreedyPolicy(), max_level=30, seed=11).play()
+        self.assertEqual(first, second)
+
+    def test_run_games(self):
+        """Test that a batch returns a result per game"""
+        self.assertEqual(len(list(run_games(5, max_level=3))), 5)
+
+    def test_environment_filter(self):
+        """Test that games can be restricted to some environments"""
+        game = HeadlessDungeonDudes(GreedyPolicy(), level=4, environments=["Cave"])
+        self.assertEqual([env.name for env in game.environment_template], ["Cave"])
+        self.assertEqual(game.level, 4)
+
+        with self.assertRaises(ValueError):
+            HeadlessDungeonDudes(GreedyPolicy(), environments=["Moon"])
+
+    def test_stats(self):
+        """Test that results are counted and merged"""
+        stats = SimulationStats()
+        stats.add_result(GameResult(True, 3, 5, 2, 10))
+        stats.add_result(GameResult(False, 2, 0, 1, 4))
+        other = SimulationStats()
+        other.add_result(GameResult(False, 2, -1, 0, 0))
+        other.add_result(GameResult(False, 1, 10, 0, 0))
+        stats.merge(other)
+
+        self.assertEqual(stats.games, 4)
+        self.assertEqual(stats.wins, 1)
+        self.assertEqual(stats.quits, 1)
+        self.assertEqual(stats.deaths_by_level[2], 2)
+        self.assertEqual(stats.loot_gained, 14)
+
+    def test_simulate_reproducible(self):
+        """Test that the same seed gives the same stats whatever the number of workers"""
+        first = simulate(60, workers=1, seed=3, max_level=5, shard_size=20)
+        second = simulate(60, workers=2, seed=3, max_level=5, shard_size=20)
+        self.assertEqual(first.games, 60)
+        self.assertEqual(vars(first), vars(second))
+
+    def test_sweep(self):
+        """Test that every environment and level gets its own stats"""
+        results = sweep([1, 2], 4, environments=["Cave", "Lake"], workers=1)
+        self.assertEqual(set(results), {("Cave", 1), ("Cave", 2), ("Lake", 1), ("Lake", 2)})
+        self.assertEqual(results[("Lake", 2)].games, 4)
+
+    def test_compare_policies(self):
+        """Test that every policy plays the same number of games"""
+        results = compare_policies({"greedy": GreedyPolicy(), "random": RandomPolicy()}, 10, workers=1, max_level=3)
+        self.assertEqual(list(results), ["greedy", "random"])
+        self.assertEqual(results["random"].games, 10)
+
+    def test_greedy_policy(self):
+        """Test the greedy choices"""
+        policy = GreedyPolicy()
+        self.assertEqual(policy.decide(None, PromptEnum.BATTLE, [1, 2, 3]), 1)
+        self.assertEqual(policy.decide(None, PromptEnum.AFTER_ROOM, [1, 2, 3, -1]), 3)
+        self.assertEqual(policy.decide(None, PromptEnum.AFTER_ROOM, [1, 2, -1]), 1)
+        self.assertEqual(policy.decide(None, PromptEnum.BAG, [0, -1]), -1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,103 @@
+import pickle
+import unittest
+from pathlib import Path
+from tempfile import TemporaryDirectory
+from unittest import TestCase
+
+from packages.characters.effects import Effect
+from packages.environments.consumable_loot import AttackPotion, LuckySeven
+from packages.environments.loot import Loot
+from packages.game_utils import dice
+from packages.game_utils.policies import GreedyPolicy
+from packages.game_utils.simulation import HeadlessDungeonDudes
+from packages.game_utils.snapshot import MAGIC, SnapshotError, load, restore, save, snapshot
+
+
+class _Checkpointed(HeadlessDungeonDudes):
+    """Keeps a snapshot after every room"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.snapshots = []
+
+    def _checkpoint(self) -> None:
+        self.snapshots.append(snapshot(self))
+
+
+class TestSnapshot(TestCase):
+    def setUp(self) -> None:
+        self.game = HeadlessDungeonDudes(GreedyPolicy(), max_level=10, seed=5)
+        hero = self.game.hero
+        hero.takes_hit(3)
+        hero.damage = 2
+        hero.add_loot_many([Loot("Bones", "Brittle bones, eeek!", qty=4), Loot("Gem", "Shiny", qty=2),
+                            LuckySeven()])
+        hero.consume_loot(LuckySeven())
+        hero.add_buff(Effect("Penalty", dice_count=-2))
+        self.game.level = 4
+
+    def test_round_trip(self):
+        """Test that the hero, its bag, its buffs and the level are restored"""
+        data = snapshot(self.game)
+        self.assertTrue(data.startswith(MAGIC))
+
+        other = HeadlessDungeonDudes(GreedyPolicy(), seed=1)
+        restore(data, other)
+        hero = other.hero
+        self.assertEqual(other.level, 4)
+        self.assertIsNone(other.seed)
+        self.assertEqual(hero.health, 7)
+        self.assertEqual(hero.stats, self.game.hero.stats)
+        self.assertEqual(hero.base_stats, self.game.hero.base_stats)
+        self.assertEqual([(loot.name, loot.quantity) for loot in hero.loot],
+                         [(loot.name, loot.quantity) for loot in self.game.hero.loot])
+        self.assertIsInstance(hero.consumables[0], LuckySeven)
+        self.assertEqual(other.rng.random(), self.game.rng.random())
+
+    def test_fork(self):
+        """Test that a game forked from a snapshot plays out like the original"""
+        game = _Checkpointed(GreedyPolicy(), max_level=12, seed=11)
+        result = game.play()
+        self.assertGreater(len(game.snapshots), 2)
+
+        fork = HeadlessDungeonDudes.from_snapshot(game.snapshots[2], GreedyPolicy())
+        self.assertEqual(fork.max_level, 12)
+        self.assertEqual(fork.play()[:4], result[:4])
+
+    @unittest.skipIf(dice.np is None, "numpy is not installed")
+    def test_fork_pcg64(self):
+        """Test that a game played with PCG64Random forks without being told the generator, from a small snapshot"""
+        game = _Checkpointed(GreedyPolicy(), max_level=12, rng=dice.PCG64Random(11))
+        result = game.play()
+        self.assertGreater(len(game.snapshots), 2)
+        self.assertLess(len(game.snapshots[2]), 1024)
+
+        fork = HeadlessDungeonDudes.from_snapshot(game.snapshots[2], GreedyPolicy())
+        self.assertIsInstance(fork.rng, dice.PCG64Random)
+        self.assertEqual(fork.play()[:4], result[:4])
+
+    def test_invalid(self):
+        """Test that foreign or corrupted data is refused"""
+        data = snapshot(self.game)
+        with self.assertRaises(SnapshotError):
+            restore(b"nope" + data[4:], self.game)
+        with self.assertRaises(SnapshotError):
+            restore(MAGIC + bytes((99,)) + data[5:], self.game)
+        with self.assertRaises(SnapshotError):
+            restore(data[:20], self.game)
+
+        evil = MAGIC + bytes((1,)) + pickle.dumps(AttackPotion())
+        with self.assertRaises(SnapshotError):
+            restore(evil, self.game)
+
+    def test_save_load(self):
+        """Test that snapshots are written to and read from disk"""
+        with TemporaryDirectory() as folder:
+            path = Path(folder) / "game.sav"
+            save(self.game, path)
+            self.assertEqual(load(path), snapshot(self.game))
+            self.assertEqual([item.name for item in Path(folder).iterdir()], ["game.sav"])
+
+
+if __name__ == '__main__':
+    unittest.main()
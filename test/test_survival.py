@@ -0,0 +1,45 @@
+import unittest
+
+from packages.characters.monster import Monster
+from packages.environments.environment import Environment, InitiativeEnum
+from packages.game_utils.probability import duel_probability
+from packages.game_utils.survival import DEFAULT_HERO, environment_survival_probability, room_survival_probability
+
+
+class TestSurvival(unittest.TestCase):
+    def setUp(self) -> None:
+        self.cave = Environment("Cave", "Scary", ["Imp"], 1)
+        self.cave.monster_ctrl.monsters[:] = [Monster("Imp", 1, 1)]
+
+    def test_single_monster(self):
+        """Test a one hit duel against its closed form"""
+        hero = DEFAULT_HERO._replace(health=1)
+        hit = duel_probability(3, 6, 1, 6)
+        hit_taken = duel_probability(1, 6, 3, 6)
+
+        self.cave._initiative = InitiativeEnum.HERO
+        self.assertAlmostEqual(environment_survival_probability(self.cave, hero),
+                               hit / (hit + (1 - hit) * hit_taken))
+
+        self.cave._initiative = InitiativeEnum.MONSTER
+        self.assertAlmostEqual(environment_survival_probability(self.cave, hero),
+                               (1 - hit_taken) * hit / (hit + (1 - hit) * hit_taken))
+
+    def test_levels(self):
+        """Test that higher levels are harder to survive"""
+        odds = [room_survival_probability(level, ["Ogre", "Golem"]) for level in (1, 10, 40, 100)]
+        self.assertEqual(odds, sorted(odds, reverse=True))
+        self.assertTrue(0 < odds[-1] < odds[0] <= 1)
+
+    def test_pierce_shot(self):
+        """Test that a hero who can't be hit always survives"""
+        hero = DEFAULT_HERO._replace(pierce_shot=True)
+        self.assertAlmostEqual(room_survival_probability(20, None, hero), 1.0)
+
+    def test_dead_hero(self):
+        """Test that a dead hero does not survive"""
+        self.assertEqual(environment_survival_probability(self.cave, DEFAULT_HERO._replace(health=0)), 0.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
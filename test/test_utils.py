@@ -1,4 +1,6 @@
 import unittest
+from random import Random
+
 from packages.game_utils import utils
 from packages.game_utils.utils import get_user_input
 
@@ -12,6 +14,14 @@ class TestUtils(unittest.TestCase):
 
         self.assertIsInstance(utils.roll_dice(), int)
 
+    def test_utils_roll_dice_rng(self):
+        """Test that the same generator seed rolls the same dice"""
+        first_rng, second_rng = Random(4), Random(4)
+        first = [utils.roll_dice(20, first_rng) for _ in range(0, 5)]
+        second = [utils.roll_dice(20, second_rng) for _ in range(0, 5)]
+        self.assertEqual(first, second)
+        self.assertGreater(len(set(first)), 1)
+
 
 if __name__ == '__main__':
     unittest.main(verbosity=2)